@@ -28,6 +28,14 @@ class Config:
     HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
     BROWSER = os.getenv("BROWSER", "chrome")
     
+    # Downloads por teste: "failed" mantém só os de testes que falharam, "all" ou "none"
+    DOWNLOADS_KEEP = os.getenv("DOWNLOADS_KEEP", "failed")
+    DOWNLOADS_RETENTION = int(os.getenv("DOWNLOADS_RETENTION", "10"))
+
+    # Verifica se o Bin pertence à bandeira nas exportações (só em produção: o
+    # sandbox usa cartões de teste com Bin de outra bandeira)
+    CHECK_CARD_BRAND = os.getenv("CHECK_CARD_BRAND", "false").lower() == "true"
+
     @classmethod
     def validate(cls):
         """Valida se configurações obrigatórias estão presentes"""
@@ -8,6 +8,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from portal_automation.utils import config
+from portal_automation.utils.config import Config
 from tests.page_objects.login_page import LoginPage
 from pathlib import Path
 from datetime import datetime
@@ -16,6 +17,12 @@ from tests.page_objects.login_page import LoginPage
 from pathlib import Path
 from datetime import datetime
 import pytest_html #TODO: instalar "poetry add pytest-html --group dev"
+from tests.utils.download_dirs import (
+    close_test_download_dir,
+    create_test_download_dir,
+    set_download_dir,
+    worker_download_root,
+)
 import os
 import logging
 
@@ -26,9 +33,9 @@ logger = logging.getLogger(__name__)
 def driver():
     """Setup do driver com configurações otimizadas"""
     
-    # Configura diretório de download
-    download_dir = os.path.join(os.path.dirname(__file__), "downloads")
-    os.makedirs(download_dir, exist_ok=True)
+    # Configura diretório de download (um por worker do pytest-xdist; a fixture
+    # download_dir troca para um subdiretório por teste)
+    download_dir = worker_download_root()
     
     options = Options()
     options.add_argument("--start-maximized")
@@ -59,12 +66,25 @@ def driver():
     
     driver_instance.quit()
     
-@pytest.fixture(scope="session")
-def download_dir():
-    """Retorna o diretório de download configurado"""
-    download_path = os.path.join(os.path.dirname(__file__), "downloads")
-    os.makedirs(download_path, exist_ok=True)
-    return download_path
+@pytest.fixture(scope="function")
+def download_dir(request, driver):
+    """
+    Diretório de download exclusivo do teste.
+
+    O Chrome passa a baixar nele (CDP Page.setDownloadBehavior) e volta para a
+    raiz do worker no fim do teste. O diretório é removido se o teste passar
+    (Config.DOWNLOADS_KEEP) e cada worker guarda no máximo
+    Config.DOWNLOADS_RETENTION diretórios.
+    """
+    worker_root = worker_download_root()
+    download_path = create_test_download_dir(worker_root, request.node.nodeid)
+    set_download_dir(driver, download_path)
+
+    yield download_path
+
+    report = getattr(request.node, "rep_call", None)
+    failed = report is None or report.failed
+    close_test_download_dir(driver, worker_root, download_path, failed, Config)
 
 @pytest.fixture(scope="function")
 
@@ -84,6 +104,8 @@ def pytest_runtest_makereport(item, call):
     """Hook para capturar screenshots em falhas"""
     outcome = yield
     report = outcome.get_result()
+    # Resultado de cada fase (rep_setup, rep_call, rep_teardown) para as fixtures
+    setattr(item, f"rep_{report.when}", report)
     
     if report.when == "call" and report.failed:
         driver = item.funcargs.get('driver') or item.funcargs.get('authenticated_driver')
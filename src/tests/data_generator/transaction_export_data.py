@@ -0,0 +1,387 @@
+"""
+Gerador de exportações de transações sintéticas para testes de volume.
+
+Gera arquivos no mesmo formato da exportação da tela de transações
+(TRANSAÇÕES_<início>_<fim>.csv): header de 45 colunas, separador ';' e
+encoding ISO-8859-1. As distribuições de valores seguem a exportação de
+exemplo (tests/downloads/TRANSAÇÕES_2025-11-20_2025-11-27.csv):
+- lojas com os mesmos nomes, códigos e estabelecimentos pai do exemplo;
+- vendas online no cartão, vendas presenciais (Pinpad/SmartPos/Pos) e
+  boletos exportados em várias linhas com o mesmo ID da cobranca;
+- valores concentrados em 200,00, bandeiras, BINs e cartões mascarados
+  (ex: 520132******3740) e parcelas como no exemplo;
+- datas da cobrança em ordem decrescente dentro do período, como na tela.
+
+O gerador é determinístico para um mesmo seed: o mesmo seed, quantidade de
+linhas e período geram sempre o mesmo arquivo, byte a byte. As linhas são
+gravadas em blocos (buffer_rows linhas por escrita) para gerar arquivos de
+milhões de linhas rapidamente.
+
+Uso básico:
+    TransactionExportGenerator(seed=42).write("TRANSAÇÕES_2025-11-20_2025-11-27.csv", rows=1_000_000)
+
+Pela linha de comando:
+    python -m tests.data_generator.transaction_export_data --rows 1000000 --seed 42 --output-dir /tmp
+"""
+import argparse
+import bisect
+import calendar
+from datetime import date
+from itertools import accumulate
+import logging
+import os
+import random
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from tests.utils.csv_schema import TRANSACTION_EXPORT_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+HEADERS = TRANSACTION_EXPORT_SCHEMA.names
+
+DEFAULT_START = date(2025, 11, 20)
+DEFAULT_END = date(2025, 11, 27)
+DEFAULT_BUFFER_ROWS = 10_000
+
+# Tipos de linha (peso ~ linhas do exemplo: 393 online, 12 presenciais, 5 de boleto)
+ONLINE = "online"
+IN_PERSON = "in_person"
+BOLETO = "boleto"
+KIND_WEIGHTS = {ONLINE: 393, IN_PERSON: 12, BOLETO: 5}
+
+# O exemplo só tem cobranças Pendente; os demais status entram com peso pequeno
+# para que agrupamentos e filtros por status tenham mais de um grupo
+STATUS_WEIGHTS = {"Pendente": 94, "Paga": 3, "Cancelada": 1, "Estornada": 1, "Negada": 1}
+
+# Lojas: (nome, código, ID do estabelecimento, estabelecimento pai, estabelecimento comercial,
+#         adquirente, número de série, peso)
+ONLINE_MERCHANTS = [
+    ("SUB TRANSFER", "44123941000198", "a120b06e-8c11-4d9a-87f3-8ddc35931e1b", "Aditum", "", "Simulador", "", 374),
+    ("Teste Ecommerce - Maquineta", "13966572000171", "d865ffba-5bbc-4ab6-849c-3a6b2280e649",
+     "Software House - Apresentações", "321, 123", "Simulador", "", 19),
+]
+IN_PERSON_MERCHANTS = [
+    ("SISTECH INFORMATICA COMERCIO E SERVICOS LTDA", "69715357000152", "da1e1c94-2faa-4d77-9fe0-311c1fe6c1bb",
+     "EMBED SERVICOS E TECNOLOGIA", "123123", "Simulador", "7500032411003625", 3),
+    ("teste LTDA", "02449992003180", "29370a71-85e6-47ce-8c8a-6430ccd66923", "REDE HOMOLOG L3 DUKPT",
+     "010102014244519", "Rede", "7200642206000621", 3),
+    ("Oliver e Nelson Corretores Associados Ltda", "12881670000143", "bf765985-a97e-4378-8028-e47cc798f2d6",
+     "Aditum", "000, 000, 000, 000", "Simulador", "1493572497", 3),
+    ("SIMULADOR TEF", "37664843030", "7b757429-9caa-4dc7-bba4-6db491615234", "Aditum", "ENTREPAY", "Simulador",
+     "PC03P2CE10387", 2),
+    ("QT Con", "40533560000126", "91c923ac-2cfe-4f33-bbc2-57bbcf76c416", "Aditum", "1234, 321, 321, 1233",
+     "Simulador", "6N638743", 1),
+]
+BOLETO_MERCHANTS = [
+    ("New One Ltda", "62348384000195", "c27bf1a0-7835-451c-b8f1-9401fc95dfdf", "KENLO", "", "Indefinido", "", 1),
+]
+
+ONLINE_CAPTURE_WEIGHTS = {"Gateway": 116, "ThirdPartyEcommerce": 111, "PaymentLink": 85, "Checkout": 81}
+IN_PERSON_CAPTURE_WEIGHTS = {"Pinpad": 6, "SmartPos": 5, "Pos": 1}
+ENTRY_MODE_WEIGHTS = {"Contactless": 7, "Chip": 5}
+
+# Cartões: (bandeira, BIN, 4 últimos dígitos, peso)
+CARDS = [
+    ("MasterCard", "520132", "3740", 130),
+    ("Visa", "411111", "1111", 112),
+    ("Elo", "542685", "6750", 99),
+    ("Elo", "520132", "3740", 26),
+    ("Visa", "444433", "1111", 15),
+    ("Visa", "520132", "3740", 4),
+    ("MasterCard", "516292", "0175", 3),
+    ("MasterCard", "515590", "0001", 3),
+    ("Elo", "506778", "1872", 3),
+    ("MasterCard", "527451", "0374", 2),
+    ("Visa", "476173", "0011", 2),
+    ("Visa", "407267", "9922", 1),
+    ("Visa", "515590", "0001", 1),
+    ("Amex", "374245", "1009", 1),
+    ("MasterCard", "230650", "1506", 1),
+    ("Amex", "374245", "1007", 1),
+    ("Visa", "417400", "9804", 1),
+]
+
+# Valores (em centavos) do exemplo; TAIL_AMOUNT_SHARE das linhas recebe um valor aleatório
+AMOUNT_WEIGHTS = {
+    20000: 371, 4740: 7, 180411: 5, 10000: 3, 60000: 3, 200: 2, 1000: 2, 4790: 2, 9080: 2, 100: 1, 3000: 1,
+    25000: 1, 11000: 1, 4800: 1, 45000: 1, 30000: 1, 800: 1, 355500: 1, 45800: 1, 6000: 1, 3390: 1, 10570: 1,
+}
+TAIL_AMOUNT_SHARE = 0.05
+TAIL_AMOUNT_RANGE = (100, 500_000)
+
+# Parcelas das vendas online no cartão (1 = À vista)
+INSTALLMENT_WEIGHTS = {"5": 209, "1": 159, "4": 24, "3": 1}
+
+# Parte das vendas online com ID do SmartCheckout
+SMART_CHECKOUT_SHARE = 0.4
+# Parte das vendas online sem nome do portador
+EMPTY_HOLDER_SHARE = 0.03
+# Quantidade máxima de linhas de um boleto (uma por vendedor com comissão)
+MAX_BOLETO_ROWS = 5
+
+FIRST_NAMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Hugo", "Isabela", "João", "Larissa",
+    "Lucas", "Maria", "Pedro", "Rafael", "Suzana", "Tiago", "Vitória", "Delia", "Gladys", "Bradford", "Dawn",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Costa", "Pereira", "Almeida", "Martins", "Gomes", "Alves",
+    "Cristina", "Boyer", "Mayer", "Senger", "Watsica", "Koelpin",
+]
+IN_PERSON_CUSTOMER = ("Sem cliente cadastrado", "N/A")
+SELLERS = [
+    ("3966ecbd-40b1-4044-abcc-7e13e13c7980", "KENLO", "0,000%"),
+    ("c27bf1a0-7835-451c-b8f1-9401fc95dfdf", "New One Ltda", "Valor Fixo"),
+    ("fb99ff69-1ced-4ff7-9aa0-06a9934437c1", "Marcos Moraes", "Valor Fixo"),
+]
+
+EMPTY_CAPTURE_DATE = "01/01/0001 00:00:00"
+_TRAILING_COLUMNS = ["", "", "", "N/A", "", ""]  # Informacoes Adicionais ... Ordens de Transferencia
+
+
+def _format_cents(cents: int) -> str:
+    """Formata centavos como na exportação, sem separador de milhar (ex: 180411 -> "1804,11")."""
+    return f"{cents // 100},{cents % 100:02d}"
+
+
+class _WeightedChoice:
+    """Sorteio ponderado com os pesos acumulados calculados uma única vez."""
+
+    def __init__(self, values: Sequence, weights: Sequence[float]):
+        self.values = list(values)
+        self.cum_weights = list(accumulate(weights))
+        self.total = self.cum_weights[-1]
+
+    def __call__(self, rng: random.Random):
+        return self.values[bisect.bisect(self.cum_weights, rng.random() * self.total)]
+
+    @classmethod
+    def from_dict(cls, weights: Dict) -> "_WeightedChoice":
+        return cls(weights.keys(), weights.values())
+
+    @classmethod
+    def from_tuples(cls, items: Sequence[tuple]) -> "_WeightedChoice":
+        """Tuplas cujo último item é o peso."""
+        return cls([item[:-1] for item in items], [item[-1] for item in items])
+
+
+class TransactionExportGenerator:
+    """
+    Gera linhas e arquivos de exportação de transações sintéticas.
+
+    Atributos:
+        seed: Semente do gerador (None = aleatório)
+        start: Primeiro dia do período
+        end: Último dia do período (inclusivo)
+        customers: Quantidade de clientes distintos nas vendas online
+    """
+
+    def __init__(self, seed: Optional[int] = None, start: date = DEFAULT_START, end: date = DEFAULT_END,
+                 customers: int = 60, statuses: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            seed: Semente do gerador (mesmo seed = mesmo arquivo)
+            start: Primeiro dia do período
+            end: Último dia do período (inclusivo)
+            customers: Quantidade de clientes distintos nas vendas online
+            statuses: Pesos de cada status da cobrança (padrão: STATUS_WEIGHTS)
+
+        Raises:
+            ValueError: Se o período for inválido ou customers < 1
+        """
+        if end < start:
+            raise ValueError(f"Período inválido: {start} a {end}")
+        if customers < 1:
+            raise ValueError(f"customers deve ser maior que zero: {customers}")
+        self.seed = seed
+        self.start = start
+        self.end = end
+        self.customers = customers
+        self._statuses = _WeightedChoice.from_dict(statuses or STATUS_WEIGHTS)
+        self._kinds = _WeightedChoice.from_dict(KIND_WEIGHTS)
+        self._online_merchants = _WeightedChoice.from_tuples(ONLINE_MERCHANTS)
+        self._in_person_merchants = _WeightedChoice.from_tuples(IN_PERSON_MERCHANTS)
+        self._boleto_merchants = _WeightedChoice.from_tuples(BOLETO_MERCHANTS)
+        self._online_captures = _WeightedChoice.from_dict(ONLINE_CAPTURE_WEIGHTS)
+        self._in_person_captures = _WeightedChoice.from_dict(IN_PERSON_CAPTURE_WEIGHTS)
+        self._entry_modes = _WeightedChoice.from_dict(ENTRY_MODE_WEIGHTS)
+        self._cards = _WeightedChoice.from_tuples(CARDS)
+        self._amounts = _WeightedChoice.from_dict(AMOUNT_WEIGHTS)
+        self._installments = _WeightedChoice.from_dict(INSTALLMENT_WEIGHTS)
+
+    @property
+    def file_name(self) -> str:
+        """Nome do arquivo como a tela exporta (ex: TRANSAÇÕES_2025-11-20_2025-11-27.csv)."""
+        return f"TRANSAÇÕES_{self.start.isoformat()}_{self.end.isoformat()}.csv"
+
+    def _customer_pool(self, rng: random.Random) -> List[Tuple[str, str]]:
+        """Clientes das vendas online: (nome, documento com 11 dígitos)."""
+        return [
+            (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"{rng.randrange(10 ** 11):011d}")
+            for _ in range(self.customers)
+        ]
+
+    def iter_rows(self, count: int) -> Iterator[List[str]]:
+        """
+        Gera as linhas da exportação (sem o header), em ordem decrescente de data.
+
+        As linhas de um boleto têm o mesmo ID da cobranca e a mesma data; o
+        último boleto é cortado se passar de count linhas.
+
+        Args:
+            count: Quantidade de linhas
+
+        Yields:
+            Lista com os 45 valores de cada linha
+        """
+        rng = random.Random(self.seed)
+        random_value = rng.random
+        getrandbits = rng.getrandbits
+        randrange = rng.randrange
+        customers = self._customer_pool(rng)
+
+        first = calendar.timegm(self.start.timetuple())
+        span = calendar.timegm(self.end.timetuple()) + 86400 - first
+        step = span / max(count, 1)
+
+        def uuid() -> str:
+            value = f"{getrandbits(128):032x}"
+            return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+        def amount() -> str:
+            if random_value() < TAIL_AMOUNT_SHARE:
+                return _format_cents(randrange(*TAIL_AMOUNT_RANGE))
+            return _format_cents(self._amounts(rng))
+
+        # Datas em ordem decrescente mudam de segundo a cada poucas linhas em arquivos grandes
+        last_second, last_text = None, ""
+        nsu = 0
+        row_number = 0
+        while row_number < count:
+            second = first + span - 1 - int((row_number + random_value()) * step)
+            if second != last_second:
+                last_second, last_text = second, time.strftime("%d/%m/%Y %H:%M:%S", time.gmtime(second))
+            tid = f"{second * 1000 + randrange(1000)}"
+            status = self._statuses(rng)
+            kind = self._kinds(rng)
+
+            if kind == BOLETO:
+                name, code, merchant_id, parent, commercial, acquirer, serial = self._boleto_merchants(rng)
+                customer = customers[randrange(len(customers))]
+                charge_id, store_id, value = uuid(), f"{randrange(10 ** 8):08d}", amount()
+                barcode = f"{getrandbits(148):045d}"[:44]
+                due_date = time.strftime("%d/%m/%Y 00:00:00", time.gmtime(second + 86400 * randrange(1, 730)))
+                for _ in range(min(randrange(1, MAX_BOLETO_ROWS + 1), count - row_number)):
+                    seller_id, seller, agreement = SELLERS[randrange(len(SELLERS))]
+                    commission = "0,00" if agreement == "0,000%" else _format_cents(randrange(100, 150_000))
+                    yield [
+                        last_text, "", status, charge_id, store_id, name, code, merchant_id, customer[0],
+                        customer[1], tid, "", "Transação pendente pagamento", "Gateway", "Boleto", value, value,
+                        "0", serial, "", "", "", "", "", acquirer, "Captura Própria", commercial, parent, "-",
+                        seller_id, seller, agreement, commission, "", "À vista", "", "", barcode, due_date,
+                    ] + _TRAILING_COLUMNS
+                    row_number += 1
+                continue
+
+            nsu += 1
+            brand, card_bin, last_digits = self._cards(rng)
+            value = amount()
+            if kind == IN_PERSON:
+                name, code, merchant_id, parent, commercial, acquirer, serial = self._in_person_merchants(rng)
+                customer_name, document = IN_PERSON_CUSTOMER
+                capture, entry_mode, holder = self._in_person_captures(rng), self._entry_modes(rng), ""
+                store_id = f"{randrange(10 ** 29, 10 ** 30)}"
+                capture_date, installments, plan, freight, smart_checkout = "", "0", "À vista", "", ""
+            else:
+                name, code, merchant_id, parent, commercial, acquirer, serial = self._online_merchants(rng)
+                customer_name, document = customers[randrange(len(customers))]
+                capture, entry_mode = self._online_captures(rng), ""
+                holder = "" if random_value() < EMPTY_HOLDER_SHARE else customer_name.upper()
+                store_id = uuid()
+                installments = self._installments(rng)
+                capture_date, freight = EMPTY_CAPTURE_DATE, "0,00"
+                plan = "À vista" if installments == "1" else "Parcelado"
+                smart_checkout = uuid() if random_value() < SMART_CHECKOUT_SHARE else ""
+
+            yield [
+                last_text, capture_date, status, uuid(), store_id, name, code, merchant_id, customer_name, document,
+                tid, f"{nsu % 10 ** 9:09d}", "Pré Autorizada", capture, "Crédito", value, value, installments,
+                serial, holder, brand, f"{card_bin}******{last_digits}", card_bin, entry_mode, acquirer,
+                "Captura Própria", commercial, parent, "-", "N/A", "", "N/A", "0,00", freight, plan,
+                f"{randrange(10 ** 6):06d}", smart_checkout, "", "",
+            ] + _TRAILING_COLUMNS
+            row_number += 1
+
+    def write(self, file_path: str, rows: int, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> str:
+        """
+        Grava uma exportação com o header e a quantidade de linhas informada.
+
+        Os valores gerados não contêm ';', aspas nem quebras de linha, então as
+        linhas são montadas com join (sem csv.writer) e gravadas em blocos de
+        buffer_rows linhas. O tamanho do bloco não altera o conteúdo do arquivo.
+
+        Args:
+            file_path: Caminho do arquivo (diretórios são criados se necessário)
+            rows: Quantidade de linhas de dados
+            buffer_rows: Linhas acumuladas em memória por escrita
+
+        Returns:
+            Caminho do arquivo gravado
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        started = time.perf_counter()
+        join = ";".join
+        with open(file_path, "w", encoding="iso-8859-1", newline="", buffering=1 << 20) as file:
+            file.write(join(HEADERS) + "\n")
+            buffer = []
+            for values in self.iter_rows(rows):
+                buffer.append(join(values))
+                if len(buffer) >= buffer_rows:
+                    buffer.append("")
+                    file.write("\n".join(buffer))
+                    buffer = []
+            if buffer:
+                buffer.append("")
+                file.write("\n".join(buffer))
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Exportação sintética gravada: {file_path} ({rows} linhas em {elapsed:.1f}s, "
+                    f"{rows / elapsed if elapsed else 0:.0f} linhas/s)")
+        return file_path
+
+
+def generate_export(file_path: str, rows: int, seed: Optional[int] = None, **options) -> str:
+    """
+    Atalho para TransactionExportGenerator(seed, **options).write(file_path, rows).
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    return TransactionExportGenerator(seed=seed, **options).write(file_path, rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Gera uma exportação sintética pela linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera uma exportação de transações sintética.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Quantidade de linhas de dados")
+    parser.add_argument("--seed", type=int, default=None, help="Semente (mesmo seed = mesmo arquivo)")
+    parser.add_argument("--start", type=date.fromisoformat, default=DEFAULT_START, help="Primeiro dia (AAAA-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=DEFAULT_END, help="Último dia (AAAA-MM-DD)")
+    parser.add_argument("--customers", type=int, default=60, help="Clientes distintos nas vendas online")
+    parser.add_argument("--output-dir", default=".", help="Diretório do arquivo")
+    parser.add_argument("--output", default=None, help="Caminho do arquivo (padrão: nome da exportação da tela)")
+    parser.add_argument("--buffer-rows", type=int, default=DEFAULT_BUFFER_ROWS, help="Linhas por escrita")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    generator = TransactionExportGenerator(seed=args.seed, start=args.start, end=args.end, customers=args.customers)
+    file_path = args.output or os.path.join(args.output_dir, generator.file_name)
+    generator.write(file_path, args.rows, buffer_rows=args.buffer_rows)
+    print(file_path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -17,6 +17,7 @@ class TransactionsLocators:
     # --- Colunas da Tabela (ajustar índices conforme necessário) ---
     COLUMN_STATUS = (By.CSS_SELECTOR, "td[data-title='Status']")  # Ajustar índice
     COLUMN_AMOUNT = (By.CSS_SELECTOR, "td:nth-child(5)")  # Ajustar índice
+    ROW_CELLS = (By.CSS_SELECTOR, "td[data-title]")  # Células identificadas pelo título da coluna
     
     # --- Filtros ---
     STATUS_FILTER = (By.NAME, "status")  # Ajustar se necessário
@@ -2,10 +2,11 @@
 Page Object para a página de Transações do Portal Aditum.
 """
 from io import RawIOBase
+import os
 from tests.page_objects.base_page import BasePage
 from tests.locators.transactions_locators import TransactionsLocators
 from tests.locators.dashboard_locators import DashboardLocators
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import logging
 import time
@@ -18,6 +19,8 @@ class TransactionsPage(BasePage):
     def __init__(self, driver):
         super().__init__(driver)
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._download_watcher = None  # DownloadWatcher iniciado por click_export_report
+        self._export_clicked_at = None
 
     def navigate(self):
         """
@@ -54,14 +57,55 @@ class TransactionsPage(BasePage):
     def get_all_transaction_statuses(self) -> list:
         """
         Retorna uma lista com os status de todas as transações visíveis na tabela.
+
+        A tabela inteira é lida com uma única chamada ao WebDriver (ver get_table_records).
         """
-        rows = self.find_elements(TransactionsLocators.TABLE_ROWS)
-        statuses = []
-        for row in rows:
-            # Assumindo que o status está na 4ª coluna (índice 3)
-            status_element = row.find_element(*TransactionsLocators.COLUMN_STATUS)
-            statuses.append(status_element.text)
-        return statuses
+        return [record.get("Status", "") for record in self.get_table_records()]
+
+    def get_table_records(self) -> list:
+        """
+        Retorna as transações visíveis na tabela como dicionários.
+
+        Cada registro usa o título da coluna (atributo data-title da célula)
+        como chave, ex: {"Status": "Pendente", "Valor": "R$ 200,00", ...}.
+        Usado na conciliação com a exportação (tests/utils/reconciliation.py).
+
+        Todas as células são lidas por um script no navegador com uma única
+        chamada execute_script (tests/utils/ui_table.py), em vez de duas
+        chamadas ao WebDriver por célula.
+        """
+        from tests.utils.ui_table import read_table
+
+        selectors = (
+            TransactionsLocators.TRANSACTIONS_TABLE[1],
+            TransactionsLocators.TABLE_ROWS[1],
+            TransactionsLocators.ROW_CELLS[1],
+        )
+        records = read_table(self.driver, *selectors)
+        if records is None:
+            # Tabela ainda não renderizada: aguarda e lê novamente
+            self.wait_for_page_load()
+            records = read_table(self.driver, *selectors) or []
+        self.logger.info(f"Registros lidos da tabela: {len(records)}")
+        return records
+
+    def get_typed_table_records(self, column_types: dict = None) -> list:
+        """
+        Retorna as transações visíveis na tabela com os valores convertidos.
+
+        Valores em reais viram centavos, datas viram timestamps e números
+        viram inteiros, de acordo com o tipo de cada coluna
+        (padrão: UI_COLUMN_TYPES de tests/utils/ui_table.py).
+
+        Args:
+            column_types: {data-title: tipo} com os tipos de tests/utils/csv_schema.py
+
+        Returns:
+            list: Registros como {"Status": "Pendente", "Valor": 20000, ...}
+        """
+        from tests.utils.ui_table import type_records
+
+        return type_records(self.get_table_records(), column_types)
 
     def search_transaction(self, search_term: str):
         """
@@ -79,21 +123,209 @@ class TransactionsPage(BasePage):
         rows = self.find_elements(TransactionsLocators.TABLE_ROWS, timeout=5)
         return len(rows)
 
-    def go_to_next_page(self):
+    def _read_page(self) -> tuple:
         """
-        Clica no botão para ir para a próxima página.
+        Lê o texto da paginação e os registros da tabela com uma única chamada ao WebDriver.
+
+        Returns:
+            tuple: ((página atual, total de páginas), registros ou None se a tabela não existir).
+                   Sem paginação na tela, considera (1, 1); com o texto da paginação
+                   vazio ou fora do formato (ex: durante a troca de página), None.
+        """
+        from tests.utils.ui_table import parse_page_info, read_page
+
+        info, records = read_page(
+            self.driver,
+            TransactionsLocators.TRANSACTIONS_TABLE[1],
+            TransactionsLocators.TABLE_ROWS[1],
+            TransactionsLocators.ROW_CELLS[1],
+            TransactionsLocators.PAGINATION_INFO[1],
+        )
+        if info is None:
+            return (1, 1), records
+        try:
+            return parse_page_info(info), records
+        except ValueError:
+            return None, records
+
+    def _wait_for_page(self, timeout: int = None) -> tuple:
+        """
+        Aguarda a paginação e a tabela estarem legíveis.
+
+        Returns:
+            tuple: ((página atual, total de páginas), registros)
         """
-        self.click(TransactionsLocators.NEXT_PAGE_BUTTON)
-        self.logger.info("Navegou para a próxima página.")
-        time.sleep(2) # Aguarda a página carregar
+        def page_ready(driver):
+            page_info, records = self._read_page()
+            return (page_info, records) if page_info is not None and records is not None else False
 
-    def go_to_previous_page(self):
+        wait = WebDriverWait(self.driver, timeout or self.config.DEFAULT_TIMEOUT, poll_frequency=0.1)
+        return wait.until(page_ready)
+
+    def get_page_info(self) -> tuple:
+        """
+        Retorna a página atual e o total de páginas (ex: "Página 1 / 47" -> (1, 47)).
+        """
+        return self._wait_for_page()[0]
+
+    def _change_page(self, locator: tuple, step: int, timeout: int = None) -> list:
         """
-        Clica no botão para ir para a página anterior.
+        Clica no botão de paginação e aguarda a nova página ser exibida.
+
+        Returns:
+            list: Registros da nova página
+        """
+        (current, _), _ = self._wait_for_page(timeout)
+        return self._click_and_wait_page(lambda: self.click(locator), current + step, timeout)
+
+    def _click_and_wait_page(self, click, expected: int, timeout: int = None) -> list:
         """
-        self.click(TransactionsLocators.PREVIOUS_PAGE_BUTTON)
-        self.logger.info("Navegou para a página anterior.")
-        time.sleep(2) # Aguarda a página carregar
+        Executa o clique de paginação e aguarda a página esperada ser exibida.
+
+        Em vez de um tempo fixo, faz polling (uma chamada por verificação) até
+        a paginação mostrar a página esperada com a tabela presente. Enquanto o
+        número da página não muda, as linhas lidas ainda são as da página
+        anterior; a nova página é aceita mesmo vazia ou com as mesmas linhas.
+        Texto de paginação momentaneamente vazio ou fora do formato só faz a
+        espera tentar de novo.
+
+        Args:
+            click: Função que executa o clique
+            expected: Página esperada após o clique
+
+        Returns:
+            list: Registros da nova página
+        """
+        click()
+
+        def page_loaded(driver):
+            page_info, records = self._read_page()
+            if page_info is None or page_info[0] != expected or records is None:
+                return False
+            return (records,)  # Em tupla: uma página vazia também encerra a espera
+
+        wait = WebDriverWait(self.driver, timeout or self.config.DEFAULT_TIMEOUT, poll_frequency=0.1)
+        records, = wait.until(page_loaded)
+        self.logger.info(f"Navegou para a página {expected}.")
+        return records
+
+    def go_to_next_page(self) -> list:
+        """
+        Clica no botão para ir para a próxima página e aguarda a página carregar.
+
+        Returns:
+            list: Registros da nova página (como em get_table_records)
+        """
+        return self._change_page(TransactionsLocators.NEXT_PAGE_BUTTON, 1)
+
+    def go_to_previous_page(self) -> list:
+        """
+        Clica no botão para ir para a página anterior e aguarda a página carregar.
+
+        Returns:
+            list: Registros da nova página (como em get_table_records)
+        """
+        return self._change_page(TransactionsLocators.PREVIOUS_PAGE_BUTTON, -1)
+
+    def go_to_page(self, page_number: int, timeout: int = None) -> list:
+        """
+        Vai direto para a página pelos números de página da paginação.
+
+        Clica no número da página se ele estiver visível; senão no número
+        visível mais próximo dela (a paginação mostra só alguns números), até
+        chegar. Sem números que aproximem, usa os botões de próxima/anterior.
+
+        Args:
+            page_number: Página desejada (limitada a 1..total de páginas)
+
+        Returns:
+            list: Registros da página
+        """
+        from tests.utils.ui_table import pick_page_link
+
+        (current, total), records = self._wait_for_page(timeout)
+        page_number = max(1, min(page_number, total))
+        while current != page_number:
+            links = {}
+            for element in self.driver.find_elements(*TransactionsLocators.PAGE_NUMBER):
+                text = element.text.strip()
+                if text.isdigit():
+                    links[int(text)] = element
+            target = pick_page_link(links, current, page_number)
+            if target is None:
+                step = 1 if page_number > current else -1
+                locator = TransactionsLocators.NEXT_PAGE_BUTTON if step > 0 else TransactionsLocators.PREVIOUS_PAGE_BUTTON
+                records = self._change_page(locator, step, timeout)
+                current += step
+            else:
+                records = self._click_and_wait_page(links[target].click, target, timeout)
+                current = target
+        return records
+
+    def iter_all_records(self, start_page: int = 1, end_page: int = None, typed: bool = False):
+        """
+        Percorre as páginas da listagem e devolve os registros conforme cada página é lida.
+
+        Cada página custa a chamada de clique e o polling de _change_page, que
+        já traz os registros da nova página. Vai direto para start_page pelos
+        números de página (go_to_page) antes de começar.
+
+        Args:
+            start_page: Primeira página (padrão: 1)
+            end_page: Última página, inclusive (padrão: última página da paginação)
+            typed: Converte os valores como em get_typed_table_records
+
+        Returns:
+            Gerador com os registros, na ordem das páginas
+        """
+        from tests.utils.ui_table import type_records
+
+        (current, total), records = self._wait_for_page()
+        end_page = total if end_page is None else min(end_page, total)
+        if current != start_page:
+            records = self.go_to_page(start_page)
+            current = max(1, min(start_page, total))
+
+        while True:
+            self.logger.info(f"Página {current} / {total}: {len(records or [])} registros")
+            yield from (type_records(records or []) if typed else records or [])
+            if current >= end_page:
+                break
+            records = self.go_to_next_page()
+            current += 1
+
+    def iter_all_records_parallel(self, open_session, workers: int = 2, typed: bool = False):
+        """
+        Percorre todas as páginas dividindo-as entre várias sessões do navegador.
+
+        As páginas são divididas em faixas contíguas, uma por sessão
+        (tests/utils/ui_table.py crawl_parallel). Cada sessão é aberta por
+        open_session, vai direto para a primeira página da sua faixa
+        (go_to_page) e é encerrada (driver.quit) ao final. Os registros saem na
+        ordem das páginas, em stream, conforme cada página é lida.
+
+        Args:
+            open_session: Função que recebe a primeira página da faixa, abre uma nova
+                          sessão já logada na listagem com os mesmos filtros (se
+                          possível já nessa página) e devolve um TransactionsPage
+            workers: Quantidade de sessões em paralelo
+            typed: Converte os valores como em get_typed_table_records
+
+        Returns:
+            Gerador com os registros de todas as páginas
+        """
+        from tests.utils.ui_table import crawl_parallel
+
+        _, total = self.get_page_info()
+
+        def crawl_range(start_page, end_page):
+            page = open_session(start_page)
+            try:
+                yield from page.iter_all_records(start_page, end_page, typed)
+            finally:
+                page.driver.quit()
+
+        return crawl_parallel(crawl_range, total, workers)
 
     def view_transaction_details(self, row_index: int = 0):
         """
@@ -118,25 +350,63 @@ class TransactionsPage(BasePage):
         self.logger.info("Modal de detalhes da transação fechado.")
         self.wait.until(EC.invisibility_of_element_located(TransactionsLocators.DETAILS_MODAL))
         
-    def click_export_report(self):
+    def click_export_report(self, download_dir: str = None):
         """
         Clica no botão de exportar relatório.
         
-        Aguarda 2 segundos após o clique para dar tempo do download iniciar.
+        Com download_dir, tira o retrato do diretório de download antes do
+        clique (tests/utils/download_watcher.py): wait_for_download devolve
+        apenas o arquivo que aparecer depois dele. Sem download_dir, aguarda
+        2 segundos após o clique para dar tempo do download iniciar.
+
+        Args:
+            download_dir: Diretório de download a observar (recomendado)
         """
+        from tests.utils.download_watcher import DownloadWatcher
+
+        self._close_download_watcher()
+        if download_dir:
+            self._download_watcher = DownloadWatcher(download_dir).start()
+        self._export_clicked_at = time.time()
+
         # Clica no botão usando o locator com texto
         self.click(TransactionsLocators.EXPORT_BUTTON_TEXT)
         self.logger.info("Clicou no botão exportar relatório")
         
-        # Aguarda o download iniciar
-        time.sleep(2)
+        if not download_dir:
+            # Aguarda o download iniciar
+            time.sleep(2)
+
+    def _close_download_watcher(self):
+        if self._download_watcher is not None:
+            self._download_watcher.close()
+            self._download_watcher = None
+
+    def _take_download_watcher(self, download_dir: str):
+        """
+        Devolve o watcher iniciado no clique para o diretório, ou um novo.
+
+        O novo watcher considera também os arquivos modificados desde o último
+        clique em exportar (o download pode ter terminado antes da espera).
+        """
+        from tests.utils.download_watcher import DownloadWatcher
+
+        watcher = self._download_watcher
+        self._download_watcher = None
+        if watcher is not None and os.path.abspath(watcher.download_dir) == os.path.abspath(download_dir):
+            return watcher
+        if watcher is not None:
+            watcher.close()
+        return DownloadWatcher(download_dir, since=self._export_clicked_at).start()
     
     def wait_for_download(self, download_dir: str, timeout: int = 30) -> str:
         """
         Aguarda o download do arquivo CSV ser concluído.
         
-        Fica verificando o diretório de download até aparecer um arquivo .csv
-        que não esteja com extensão temporária (.crdownload).
+        Espera por eventos do sistema de arquivos (inotify no Linux, polling
+        rápido nos demais) um arquivo que não estava no diretório no momento
+        do clique em exportar e cujo tamanho ficou estável. Arquivos antigos
+        do diretório nunca são devolvidos.
         
         Args:
             download_dir: Diretório onde o arquivo será baixado
@@ -148,28 +418,87 @@ class TransactionsPage(BasePage):
         Raises:
             TimeoutError: Se o download não for concluído no tempo limite
         """
-        import os
-        import time
-        
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            # Lista todos os arquivos .csv que NÃO são temporários
-            files = [
-                f for f in os.listdir(download_dir)
-                if f.endswith('.csv') and not f.endswith('.crdownload')
-            ]
-            
-            if files:
-                # Pega o arquivo mais recente (caso tenha vários)
-                files.sort(
-                    key=lambda x: os.path.getmtime(os.path.join(download_dir, x)),
-                    reverse=True
-                )
-                file_path = os.path.join(download_dir, files[0])
-                self.logger.info(f"Download Concluído: {file_path}")
-                return file_path
-        
-            time.sleep(1)
-            
-        raise TimeoutError(f"Download não foi condluído em {timeout} segundos.")
\ No newline at end of file
+        watcher = self._take_download_watcher(download_dir)
+        try:
+            file_path = watcher.wait(timeout)
+        finally:
+            watcher.close()
+        self.logger.info(f"Download Concluído: {file_path}")
+        return file_path
+
+    def wait_for_download_validated(self, download_dir: str, rules: list, timeout: int = 30) -> tuple:
+        """
+        Aguarda o download do CSV validando o arquivo enquanto ele é baixado.
+
+        Acompanha o arquivo temporário (.crdownload) e executa as regras de
+        validação sobre as linhas conforme chegam. Quando o download termina o
+        resultado já está pronto, e um header inválido encerra a espera logo
+        nos primeiros bytes.
+
+        Args:
+            download_dir: Diretório onde o arquivo será baixado
+            rules: Regras de tests/utils/csv_rules.py
+            timeout: Tempo máximo de espera em segundos (padrão: 30)
+
+        Returns:
+            tuple: (caminho do arquivo baixado, lista de RuleResult na ordem das regras)
+
+        Raises:
+            TimeoutError: Se o download não for concluído no tempo limite
+        """
+        from tests.utils.csv_incremental import IncrementalCSVValidator, tail_download
+
+        # Arquivos que já estavam no diretório antes do clique em exportar são ignorados
+        ignore = ()
+        if self._download_watcher is not None:
+            ignore = set(self._download_watcher.snapshot)
+            self._close_download_watcher()
+
+        validator = IncrementalCSVValidator(rules)
+        file_path = tail_download(download_dir, validator, timeout=timeout, ignore=ignore)
+        self.logger.info(f"Download validado: {file_path}")
+        return file_path, validator.results
+
+    def export_client(self, pool_size: int = 8):
+        """
+        Cria um cliente HTTP do endpoint de exportação com a sessão logada do navegador.
+
+        Os cookies da sessão do WebDriver são copiados para um requests.Session
+        (tests/utils/http_export.py), então a exportação pode ser baixada sem
+        clique e sem o gerenciador de downloads do Chrome, inclusive para vários
+        períodos em paralelo (download_many).
+
+        Args:
+            pool_size: Conexões mantidas abertas (downloads em paralelo)
+
+        Returns:
+            ExportClient apontando para Config.TARGET_URL
+        """
+        from tests.utils.http_export import ExportClient, session_from_driver
+
+        return ExportClient(session_from_driver(self.driver, pool_size=pool_size), self.config.TARGET_URL)
+
+    def export_report_http(self, start_date, end_date, download_dir: str = None, rules: list = (), **params):
+        """
+        Baixa a exportação do período pelo endpoint, validando o CSV durante o download.
+
+        Args:
+            start_date: Início do período (date)
+            end_date: Fim do período (date, inclusive)
+            download_dir: Diretório onde gravar o arquivo (None: só valida)
+            rules: Regras de tests/utils/csv_rules.py
+            **params: Filtros extras do endpoint (ex: status)
+
+        Returns:
+            ExportDownload com o caminho do arquivo e a lista de RuleResult
+
+        Raises:
+            requests.HTTPError: Se o endpoint responder com erro (ex: sessão expirada)
+        """
+        client = self.export_client(pool_size=1)
+        try:
+            download = client.download(start_date, end_date, download_dir, rules, params)
+        finally:
+            client.session.close()
+        self.logger.info(f"Exportação baixada por HTTP: {download.file_path}")
+        return download
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Testes unitários do benchmark da validação (tests/utils/csv_benchmark.py).
+"""
+from dataclasses import replace
+import json
+import pytest
+from tests.utils.csv_benchmark import (
+    BENCHMARKS,
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    main,
+    run_benchmarks,
+    save_results,
+)
+from tests.utils.csv_validator import CSVValidator
+
+
+def result(**changes):
+    values = dict(method="get_summary", mode="memory", rows=10000, seconds=0.1, rows_per_second=100000.0,
+                  peak_rss_kb=50000, peak_alloc_bytes=1_000_000, allocated_blocks=0)
+    values.update(changes)
+    return BenchmarkResult(**values)
+
+
+class TestRunBenchmarks:
+    """Execução dos casos e gravação dos resultados."""
+
+    def test_measures_every_method_in_each_mode(self, tmp_path):
+        results = run_benchmarks(sizes=[300], modes=CSVValidator.MODES, repeat=1, directory=str(tmp_path),
+                                 isolated=False)
+
+        assert [(r.method, r.mode) for r in results] == [
+            (method, mode) for mode in CSVValidator.MODES for method in BENCHMARKS
+        ]
+        for r in results:
+            assert r.rows == 300
+            assert r.seconds > 0 and r.rows_per_second > 0
+            assert r.peak_alloc_bytes >= 0
+
+    def test_isolated_case_reports_peak_rss(self, tmp_path):
+        [r] = run_benchmarks(sizes=[200], methods=["read_csv"], repeat=1, directory=str(tmp_path))
+
+        assert r.peak_rss_kb > 0
+        assert r.peak_alloc_bytes > 0
+
+    def test_unknown_method_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            run_benchmarks(sizes=[10], methods=["nao_existe"], directory=str(tmp_path))
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = save_results([result(), result(method="read_csv")], str(tmp_path / "bench.json"))
+
+        assert load_results(path) == [result(), result(method="read_csv")]
+        assert "python" in json.loads(open(path, encoding="utf-8").read())
+
+
+class TestCompareResults:
+    """Detecção de regressões em relação à referência."""
+
+    def test_within_tolerance(self):
+        assert compare_results([result(rows_per_second=90000.0, peak_rss_kb=55000)], [result()]) == []
+
+    @pytest.mark.parametrize("changes, expected", [
+        ({"rows_per_second": 50000.0}, "linhas/s"),
+        ({"peak_rss_kb": 90000}, "RSS"),
+        ({"peak_alloc_bytes": 2_000_000}, "pico alocado"),
+    ])
+    def test_flags_slower_or_heavier_case(self, changes, expected):
+        regressions = compare_results([result(**changes)], [result()])
+
+        assert len(regressions) == 1
+        assert expected in regressions[0]
+
+    def test_ignores_timing_of_very_fast_cases_and_unmatched_cases(self):
+        fast = result(method="validate_headers", seconds=0.00001, rows_per_second=1e9)
+
+        assert compare_results([replace(fast, rows_per_second=1e8), result(rows=1)], [fast, result()]) == []
+
+    def test_command_line_fails_on_regression(self, tmp_path):
+        baseline = save_results([result(method="read_csv", rows=200, seconds=1.0, rows_per_second=1e12)],
+                                str(tmp_path / "baseline.json"))
+        output = str(tmp_path / "current.json")
+
+        code = main(["--sizes", "200", "--methods", "read_csv", "--repeat", "1", "--data-dir", str(tmp_path),
+                     "--output", output, "--baseline", baseline])
+
+        assert code == 1
+        assert len(load_results(output)) == 1
@@ -0,0 +1,65 @@
+"""
+Testes unitários do cache em disco das exportações (tests/utils/csv_cache.py).
+"""
+import os
+import shutil
+from tests.utils.csv_cache import ParseCache
+from tests.utils.csv_columnar import ColumnarTable
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+class TestParseCache:
+    """O cache deve devolver a mesma tabela e ser invalidado quando o arquivo muda."""
+
+    def copy_sample(self, tmp_path, name="export.csv"):
+        path = tmp_path / name
+        shutil.copy(SAMPLE_CSV, path)
+        return str(path)
+
+    def test_second_open_loads_from_cache(self, tmp_path):
+        path = self.copy_sample(tmp_path)
+        cache = ParseCache(str(tmp_path / "cache"))
+
+        first = CSVValidator(path, mode=CSVValidator.MODE_COLUMNAR, cache=cache)
+        first.load_table()
+        cached = cache.load(path)
+
+        assert cached is not None
+        assert list(cached.iter_rows()) == list(first.table.iter_rows())
+
+        second = CSVValidator(path, mode=CSVValidator.MODE_COLUMNAR, cache=cache)
+        assert second.get_summary() == first.get_summary()
+
+    def test_entry_is_invalidated_when_file_changes(self, tmp_path):
+        path = self.copy_sample(tmp_path)
+        cache = ParseCache(str(tmp_path / "cache"))
+        cache.store(path, ColumnarTable.from_csv(path))
+
+        with open(path, "a", encoding="iso-8859-1") as file:
+            file.write("\n")
+        os.utime(path, ns=(0, 0))
+
+        assert cache.load(path) is None
+        assert list((tmp_path / "cache").glob("*.bin")) == []
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"))
+        paths = [self.copy_sample(tmp_path, f"export_{i}.csv") for i in range(3)]
+        for index, path in enumerate(paths):
+            cache.store(path, ColumnarTable.from_csv(path))
+            entry = cache._entry_path(path)
+            os.utime(entry, (index, index))
+
+        # Usa a primeira entrada, que passa a ser a mais recente
+        assert cache.load(paths[0]) is not None
+        entry_size = cache._entry_path(paths[0]).stat().st_size
+        cache.max_bytes = entry_size * 2
+        cache._evict()
+
+        assert cache._entry_path(paths[0]).exists()
+        assert not cache._entry_path(paths[1]).exists()
+        assert cache._entry_path(paths[2]).exists()
@@ -0,0 +1,124 @@
+"""
+Testes unitários da consistência dos campos de cartão (tests/utils/csv_cards.py e CSVValidator.validate_cards).
+"""
+import os
+import pytest
+from tests.utils.csv_cards import (
+    BIN,
+    BRAND,
+    INCOMPLETE,
+    MASK,
+    CardConsistencyRule,
+    brands_for_bin,
+    card_issues,
+)
+from tests.utils.csv_parallel import validate_rules_parallel
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+HEADER = "Bandeira;Numero do cartao;Bin;Status da cobranca\n"
+
+
+def write_export(tmp_path, lines):
+    path = tmp_path / "cartoes.csv"
+    path.write_text(HEADER + "".join(line + "\n" for line in lines), encoding="iso-8859-1")
+    return str(path)
+
+
+class TestCardIssues:
+    """Verificação de uma combinação de Bandeira, número e Bin."""
+
+    @pytest.mark.parametrize("brand, number, bin_value", [
+        ("MasterCard", "516292******0175", "516292"),
+        ("MasterCard", "230650******1506", "230650"),
+        ("Visa", "411111******1111", "411111"),
+        ("Amex", "374245*****1009", "374245"),
+        ("Elo", "506778******1872", "506778"),
+        ("Elo", "43893512****1234", "43893512"),
+        ("Bandeira nova", "999999******0000", "999999"),
+    ])
+    def test_consistent_cards(self, brand, number, bin_value):
+        assert card_issues(brand, number, bin_value, check_brand=True) == ()
+
+    @pytest.mark.parametrize("number, bin_value, expected", [
+        ("5162920000000175", "516292", (MASK,)),        # Número completo
+        ("5162921234**0175", "516292", (MASK,)),        # Dígitos do meio visíveis
+        ("516292******175", "516292", (MASK,)),         # Só 3 dígitos no final
+        ("516292**0175", "516292", (MASK,)),            # Menos de 13 caracteres
+        ("516292******0175", "516293", (BIN,)),
+        ("516292******0175", "5162", (BIN,)),
+    ])
+    def test_masking_and_bin(self, number, bin_value, expected):
+        assert card_issues("MasterCard", number, bin_value) == expected
+
+    def test_brand_and_incomplete(self):
+        assert card_issues("Visa", "520132******3740", "520132", check_brand=True) == (BRAND,)
+        assert card_issues("Visa", "520132******3740", "520132") == ()  # Padrão tolera o sandbox
+        assert card_issues("Visa", "438935******3740", "438935", check_brand=True) == (BRAND,)  # Faixa Elo dentro do 4
+        assert card_issues("Visa", "", "") == (INCOMPLETE,)
+        assert card_issues("", None, "") is None
+
+    def test_brands_for_bin_prefers_longest_range(self):
+        assert brands_for_bin("411111") == ["Visa"]
+        assert brands_for_bin("650031") == ["Elo"]
+        assert brands_for_bin("650100") == ["Discover"]
+        assert brands_for_bin("999999") == []
+
+
+class TestValidateCards:
+    """CSVValidator.validate_cards e CardConsistencyRule sobre a exportação."""
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_sample_export_passes_by_default(self, mode):
+        result = CSVValidator(SAMPLE_CSV, mode=mode).validate_cards()
+
+        assert result.passed, result.message
+        assert result.checked_rows == 405
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_sample_export_with_brand_check(self, mode):
+        result = CSVValidator(SAMPLE_CSV, mode=mode).validate_cards(check_brand=True)
+
+        # Cartões de teste do sandbox com Bin de outra bandeira (ex: Elo com 520132)
+        assert not result.passed
+        assert result.checked_rows == 405
+        assert result.failed_rows == 130
+        assert result.details == {"failures_by_check": {BRAND: 130}}
+        assert result.samples[0] == (8, {
+            "Bandeira": "Visa", "Numero do cartao": "515590******0001", "Bin": "515590", "falhas": [BRAND],
+        })
+
+    def test_rule_engine_and_parallel_match_bulk_check(self):
+        bulk = CSVValidator(SAMPLE_CSV).validate_cards(check_brand=True)
+
+        assert CSVValidator(SAMPLE_CSV).validate_rules([CardConsistencyRule(check_brand=True)])[0] == bulk
+        assert validate_rules_parallel(SAMPLE_CSV, [CardConsistencyRule(check_brand=True)], workers=2)[0] == bulk
+
+    def test_reports_each_check(self, tmp_path):
+        path = write_export(tmp_path, [
+            "Visa;411111******1111;411111;Paga",
+            ";;;Pendente",
+            "Visa;4111111111111111;411111;Paga",
+            "MasterCard;516292******0175;516293;Paga",
+            "Elo;;;Paga",
+            "Visa;411111******1111;411111;Paga",
+        ])
+
+        result = CSVValidator(path, mode=CSVValidator.MODE_COLUMNAR).validate_cards()
+
+        assert result.checked_rows == 5
+        assert [row_number for row_number, _ in result.samples] == [3, 4, 5]
+        assert result.details["failures_by_check"] == {MASK: 1, BIN: 1, INCOMPLETE: 1}
+
+    def test_missing_or_not_loaded_columns(self, tmp_path):
+        path = tmp_path / "sem_bin.csv"
+        path.write_text("Bandeira;Numero do cartao\nVisa;411111******1111\n", encoding="iso-8859-1")
+
+        result = CSVValidator(str(path)).validate_cards()
+
+        assert not result.passed and "Bin" in result.message
+        with pytest.raises(ValueError, match="não foi carregada"):
+            CSVValidator(SAMPLE_CSV, columns=["Bandeira"]).validate_cards()
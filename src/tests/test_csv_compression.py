@@ -0,0 +1,86 @@
+"""
+Testes unitários da leitura de exportações compactadas (tests/utils/csv_compression.py).
+"""
+import gzip
+import os
+import shutil
+import zipfile
+import pytest
+from tests.utils.csv_compression import is_compressed, open_text
+from tests.utils.csv_diff import diff_exports
+from tests.utils.csv_parallel import validate_rules_parallel
+from tests.utils.csv_rules import HeadersRule, StatusEnumRule
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_NAME = "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "downloads", SAMPLE_NAME)
+
+
+@pytest.fixture(params=[".csv.gz", ".zip"])
+def archive(request, tmp_path):
+    """Exportação de exemplo compactada em .csv.gz ou .zip."""
+    if request.param == ".csv.gz":
+        path = tmp_path / f"{SAMPLE_NAME}.gz"
+        with open(SAMPLE_CSV, "rb") as source, gzip.open(path, "wb") as target:
+            shutil.copyfileobj(source, target)
+    else:
+        path = tmp_path / SAMPLE_NAME.replace(".csv", ".zip")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+            target.write(SAMPLE_CSV, f"exportacoes/{SAMPLE_NAME}")
+    return str(path)
+
+
+class TestOpenText:
+    """Abertura dos arquivos como texto."""
+
+    def test_reads_same_text_as_plain_file(self, archive):
+        with open(SAMPLE_CSV, encoding="iso-8859-1") as plain, open_text(archive) as compressed:
+            assert compressed.read() == plain.read()
+
+    def test_is_compressed(self):
+        assert is_compressed("a.csv.gz") and is_compressed("A.ZIP")
+        assert not is_compressed(SAMPLE_CSV)
+
+    def test_zip_with_several_csv_files_raises(self, tmp_path):
+        path = tmp_path / "exportacoes.zip"
+        with zipfile.ZipFile(path, "w") as target:
+            target.writestr("a.csv", "x\n")
+            target.writestr("b.csv", "y\n")
+
+        with pytest.raises(ValueError, match="único CSV"):
+            open_text(str(path))
+
+
+class TestCompressedValidation:
+    """CSVValidator e demais leitores sobre arquivos compactados."""
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_same_results_as_plain_file(self, archive, mode):
+        compressed = CSVValidator(archive, mode=mode)
+        plain = CSVValidator(SAMPLE_CSV, mode=mode)
+
+        summary = compressed.get_summary()
+        assert {k: v for k, v in summary.items() if k != "file_size_bytes"} == \
+            {k: v for k, v in plain.get_summary().items() if k != "file_size_bytes"}
+        assert compressed.validate_headers()
+        assert compressed.validate_date_range()
+        assert compressed.validate_schema().passed
+
+    def test_projection_and_row_lookup(self, archive):
+        validator = CSVValidator(archive, mode=CSVValidator.MODE_STREAMING, columns=["TID"])
+
+        assert validator.get_row_count() == 410
+        assert validator.get_rows([410, 1]) == CSVValidator(SAMPLE_CSV).get_rows([410, 1])
+        with pytest.raises(IndexError):
+            validator.get_rows([411])
+
+    def test_parallel_rules_fall_back_to_single_pass(self, archive):
+        rules = [HeadersRule(), StatusEnumRule()]
+
+        results = CSVValidator(archive).validate_rules(rules, workers=4)
+
+        assert results == validate_rules_parallel(SAMPLE_CSV, [HeadersRule(), StatusEnumRule()], workers=2)
+        assert all(result.passed for result in results)
+
+    def test_diff_between_plain_and_compressed_export(self, archive):
+        assert diff_exports(SAMPLE_CSV, archive).identical
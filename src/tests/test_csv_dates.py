@@ -0,0 +1,114 @@
+"""
+Testes unitários da validação de datas em lote (tests/utils/csv_dates.py).
+"""
+from datetime import datetime
+import os
+import pytest
+from tests.utils.csv_columnar import ColumnarTable
+from tests.utils.csv_dates import (
+    MISSING_TIMESTAMP,
+    check_date_range,
+    is_valid_date,
+    parse_file_date_range,
+    parse_timestamp,
+    to_timestamps,
+    validate_dates,
+)
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def strptime_is_valid(value):
+    """Implementação de referência (a mesma usada antes da validação em lote)."""
+    for date_format in ('%d/%m/%Y %H:%M:%S', '%d/%m/%Y'):
+        try:
+            datetime.strptime(value, date_format)
+            return True
+        except ValueError:
+            pass
+    return False
+
+
+class TestDateParsing:
+    """A expressão compilada deve aceitar exatamente o que o strptime aceita."""
+
+    @pytest.mark.parametrize("value", [
+        "27/11/2025 09:14:43",
+        "27/11/2025",
+        "01/01/0001 00:00:00",
+        "29/02/2024",
+        "29/02/2025",
+        "31/04/2025",
+        "1/2/2025 3:4:5",
+        " 1/02/2025",
+        "27/11/2025  09:14:43",
+        "27/11/2025 24:00:00",
+        "27/11/2025 23:59:60",
+        "00/11/2025",
+        "27/13/2025",
+        "27/11/0000",
+        "2025-11-27",
+        "27/11/2025 09:14",
+        "27/11/2025 ",
+    ])
+    def test_matches_strptime(self, value):
+        assert is_valid_date(value) == strptime_is_valid(value)
+
+    def test_timestamp_matches_datetime(self):
+        expected = datetime(2025, 11, 27, 9, 14, 43) - datetime(1970, 1, 1)
+
+        assert parse_timestamp("27/11/2025 09:14:43") == int(expected.total_seconds())
+        assert parse_timestamp("01/01/1970") == 0
+        assert parse_timestamp("invalida") is None
+
+
+class TestDateColumns:
+    """Validação e conversão da coluna inteira."""
+
+    def test_reports_first_invalid_positions(self):
+        values = ["27/11/2025", "", "31/02/2025", "x", "28/02/2025", "32/01/2025"]
+
+        result = validate_dates(values, limit=2)
+
+        assert result.checked == 5
+        assert result.invalid_count == 3
+        assert result.samples == [(3, "31/02/2025"), (4, "x")]
+
+    def test_column_view_gives_same_result_as_list(self, tmp_path):
+        path = tmp_path / "datas.csv"
+        values = ["27/11/2025", "x", "27/11/2025", "", "x", "31/02/2025"]
+        path.write_text("Data\n" + "\n".join(f'"{v}"' for v in values) + "\n", encoding="iso-8859-1")
+        view = ColumnarTable.from_csv(str(path)).column("Data")
+
+        assert validate_dates(view) == validate_dates(values)
+        assert to_timestamps(view) == to_timestamps(values)
+
+    def test_timestamps_mark_missing_values(self):
+        timestamps = to_timestamps(["01/01/1970 00:00:10", "", "x"])
+
+        assert list(timestamps) == [10, MISSING_TIMESTAMP, MISSING_TIMESTAMP]
+
+    def test_file_name_range(self):
+        start, end = parse_file_date_range(SAMPLE_CSV)
+
+        assert start == parse_timestamp("20/11/2025 00:00:00")
+        assert end == parse_timestamp("27/11/2025 23:59:59")
+        assert parse_file_date_range("relatorio.csv") is None
+
+    def test_range_check(self):
+        start, end = parse_file_date_range(SAMPLE_CSV)
+        result = check_date_range(["20/11/2025", "27/11/2025 23:59:59", "28/11/2025"], start, end)
+
+        assert result.samples == [(3, "28/11/2025")]
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_sample_export_is_inside_file_range(self, mode):
+        validator = CSVValidator(SAMPLE_CSV, mode=mode)
+
+        assert validator.validate_date_format("Data da cobranca")
+        assert validator.validate_date_range("Data da cobranca")
+        assert not validator.validate_date_range("Data da Captura/Pagamento")
+        assert len(validator.get_timestamps("Data da cobranca")) == 410
@@ -0,0 +1,139 @@
+"""
+Testes unitários da comparação entre exportações (tests/utils/csv_diff.py).
+"""
+import csv
+import os
+import random
+import pytest
+from tests.utils.csv_diff import ADDED, CHANGED, REMOVED, UNCHANGED, SortedExport, diff_exports, iter_diff, main
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def read_sample():
+    with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+        reader = csv.reader(file, delimiter=";")
+        return next(reader), list(reader)
+
+
+def write_export(path, headers, rows):
+    with open(path, "w", encoding="iso-8859-1", newline="") as file:
+        writer = csv.writer(file, delimiter=";", lineterminator="\n")
+        writer.writerow(headers)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def exports(tmp_path):
+    """Exportação de exemplo e uma versão 'depois do deploy' embaralhada, com 3 removidas, 2 novas e 2 alteradas."""
+    headers, rows = read_sample()
+    status, value = headers.index("Status da cobranca"), headers.index("Valor da transação")
+    new_rows = [list(row) for row in rows[3:]]
+    new_rows[10][status] = "Paga"
+    new_rows[20][status] = "Cancelada"
+    new_rows[20][value] = "0,00"
+    new_rows.append(["x"] * 3 + ["00000000-0000-0000-0000-000000000001"] + ["x"] * 41)
+    new_rows.append(["x"] * 3 + ["ffffffff-0000-0000-0000-000000000002"] + ["x"] * 41)
+    random.Random(7).shuffle(new_rows)
+    return write_export(tmp_path / "antes.csv", headers, rows), write_export(tmp_path / "depois.csv", headers, new_rows)
+
+
+class TestDiffExports:
+    """Comparação pelo ID da cobrança."""
+
+    def test_reports_added_removed_and_changed(self, exports):
+        diff = diff_exports(*exports)
+
+        assert (diff.old_rows, diff.new_rows) == (410, 409)
+        assert (diff.added_count, diff.removed_count, diff.changed_count) == (2, 3, 2)
+        assert diff.unchanged_count == 405
+        assert diff.changed_fields == {"Status da cobranca": 2, "Valor da transação": 1}
+        changed = [entry for entry in diff.samples if entry.kind == CHANGED]
+        assert {entry.changes["Status da cobranca"][1] for entry in changed} == {"Paga", "Cancelada"}
+        added = [entry for entry in diff.samples if entry.kind == ADDED]
+        assert [(entry.key, entry.old_row) for entry in added] == [
+            ("00000000-0000-0000-0000-000000000001", None),
+            ("ffffffff-0000-0000-0000-000000000002", None),
+        ]
+
+    @pytest.mark.parametrize("max_rows", [1, 7, 100])
+    def test_external_sort_matches_in_memory(self, exports, tmp_path, max_rows):
+        in_memory = diff_exports(*exports, limit=1000)
+
+        external = diff_exports(*exports, max_rows=max_rows, limit=1000, temp_dir=str(tmp_path))
+
+        assert external == in_memory
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".run")]
+
+    def test_sorted_export_keeps_file_order_for_repeated_keys(self, tmp_path):
+        with SortedExport(SAMPLE_CSV, max_rows=3, temp_dir=str(tmp_path)) as export:
+            rows = list(export)
+
+        keys = [key for key, _, _ in rows]
+        assert keys == sorted(keys)
+        repeated = [number for key, number, _ in rows if key.startswith("0ebdc8d4")]
+        assert repeated == [15, 16, 17, 18, 19]
+
+    def test_sorted_export_requires_with_block(self):
+        export = SortedExport(SAMPLE_CSV)
+
+        with pytest.raises(RuntimeError, match="with"):
+            list(export)
+        with export:
+            assert len(list(export)) == 410
+        with pytest.raises(RuntimeError):
+            iter(export)
+
+    def test_failed_sort_removes_runs(self, tmp_path):
+        path = tmp_path / "quebrado.csv"
+        rows = b"".join(b"id-%05d;valor\n" % index for index in range(2000))
+        path.write_bytes(b"ID da cobranca;Valor\n" + rows + b"\xff;invalido\n")
+        runs_dir = tmp_path / "runs"
+        runs_dir.mkdir()
+        export = SortedExport(str(path), encoding='utf-8', max_rows=100, temp_dir=str(runs_dir))
+
+        with pytest.raises(UnicodeDecodeError):
+            with export:
+                pass
+        assert export.runs == []
+        assert os.listdir(runs_dir) == []
+
+    def test_identical_exports(self):
+        diff = diff_exports(SAMPLE_CSV, SAMPLE_CSV, max_rows=50)
+
+        assert diff.identical
+        assert diff.unchanged_count == 410
+
+    def test_ignored_and_new_columns(self, tmp_path):
+        old = write_export(tmp_path / "a.csv", ["ID da cobranca", "Status", "Gerado em"], [["1", "Pendente", "10:00"]])
+        new = write_export(tmp_path / "b.csv", ["ID da cobranca", "Status", "Gerado em", "Nova"],
+                           [["1", "Pendente", "11:00", "x"]])
+
+        diff = diff_exports(old, new, ignore_columns=["Gerado em"])
+
+        assert diff.unchanged_count == 1
+        assert diff.columns_added == ["Nova"]
+        assert not diff.identical
+
+    def test_repeated_keys_are_paired_in_order(self, tmp_path):
+        headers = ["ID da cobranca", "Valor"]
+        old = write_export(tmp_path / "a.csv", headers, [["1", "a"], ["1", "b"], ["2", "c"]])
+        new = write_export(tmp_path / "b.csv", headers, [["1", "a"], ["2", "c"]])
+
+        with SortedExport(old) as old_export, SortedExport(new) as new_export:
+            kinds = [(entry.kind, entry.key, entry.old_row) for entry in iter_diff(old_export, new_export)]
+
+        assert kinds == [(UNCHANGED, "1", 1), (REMOVED, "1", 2), (UNCHANGED, "2", 3)]
+
+    def test_missing_key_column_raises(self, tmp_path):
+        path = write_export(tmp_path / "a.csv", ["Outra"], [["1"]])
+
+        with pytest.raises(ValueError):
+            diff_exports(path, SAMPLE_CSV)
+
+    def test_command_line(self, exports, capsys):
+        assert main([*exports, "--max-rows", "50"]) == 1
+        assert "2 adicionadas, 3 removidas, 2 alteradas" in capsys.readouterr().out
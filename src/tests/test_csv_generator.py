@@ -0,0 +1,107 @@
+"""
+Testes unitários do gerador de exportações sintéticas (tests/data_generator/transaction_export_data.py).
+"""
+from collections import Counter
+import csv
+from datetime import date
+import os
+import re
+import pytest
+from tests.data_generator.transaction_export_data import (
+    HEADERS,
+    TransactionExportGenerator,
+    generate_export,
+    main,
+)
+from tests.utils.csv_dates import parse_timestamp
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def read_rows(path):
+    with open(path, encoding="iso-8859-1", newline="") as file:
+        return list(csv.DictReader(file, delimiter=";"))
+
+
+class TestTransactionExportGenerator:
+    """Formato, distribuições e reprodutibilidade das exportações geradas."""
+
+    @pytest.fixture
+    def export(self, tmp_path):
+        generator = TransactionExportGenerator(seed=7)
+        return generator.write(str(tmp_path / generator.file_name), rows=3000)
+
+    def test_same_format_as_sample_export(self, export):
+        with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+            sample_header = file.readline()
+        with open(export, encoding="iso-8859-1") as file:
+            header = file.readline()
+
+        assert header == sample_header
+        assert HEADERS == sample_header.rstrip("\n").split(";")
+        assert len(read_rows(export)) == 3000
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_generated_export_passes_validation(self, export, mode):
+        validator = CSVValidator(export, mode=mode)
+
+        assert validator.validate_schema().passed
+        assert validator.validate_headers()
+        assert validator.validate_status_values()
+        assert validator.validate_date_range()
+
+    def test_distributions_follow_sample(self, export):
+        rows = read_rows(export)
+        stores = Counter(row["Nome da loja"] for row in rows)
+        brands = Counter(row["Bandeira"] for row in rows)
+
+        assert stores.most_common(1)[0][0] == "SUB TRANSFER"
+        assert set(brands) <= {"MasterCard", "Visa", "Elo", "Amex", ""}
+        assert Counter(row["Valor total da cobrança"] for row in rows).most_common(1)[0][0] == "200,00"
+        for row in rows:
+            if row["Tipo de venda"] == "Crédito":
+                assert re.fullmatch(r"\d{6}\*{6}\d{4}", row["Numero do cartao"])
+                assert row["Numero do cartao"].startswith(row["Bin"])
+            else:
+                assert row["Bandeira"] == row["Numero do cartao"] == ""
+
+    def test_dates_are_descending_within_period(self, export):
+        timestamps = [parse_timestamp(row["Data da cobranca"]) for row in read_rows(export)]
+
+        assert timestamps == sorted(timestamps, reverse=True)
+
+    def test_boleto_rows_share_charge_id(self, export):
+        boletos = Counter(row["ID da cobranca"] for row in read_rows(export) if row["Tipo de venda"] == "Boleto")
+
+        assert boletos and max(boletos.values()) > 1
+
+    def test_same_seed_reproduces_file(self, tmp_path):
+        first = generate_export(str(tmp_path / "a.csv"), rows=500, seed=3)
+        second = TransactionExportGenerator(seed=3).write(str(tmp_path / "b.csv"), rows=500, buffer_rows=7)
+        other = generate_export(str(tmp_path / "c.csv"), rows=500, seed=4)
+
+        with open(first, "rb") as a, open(second, "rb") as b, open(other, "rb") as c:
+            content = a.read()
+            assert content == b.read()
+            assert content != c.read()
+
+    def test_custom_period(self, tmp_path):
+        generator = TransactionExportGenerator(seed=1, start=date(2025, 1, 1), end=date(2025, 1, 1))
+        path = generator.write(str(tmp_path / generator.file_name), rows=100)
+
+        assert os.path.basename(path) == "TRANSAÇÕES_2025-01-01_2025-01-01.csv"
+        assert CSVValidator(path).validate_date_range()
+
+    def test_invalid_period_raises(self):
+        with pytest.raises(ValueError):
+            TransactionExportGenerator(start=date(2025, 1, 2), end=date(2025, 1, 1))
+
+    def test_command_line(self, tmp_path, capsys):
+        assert main(["--rows", "50", "--seed", "1", "--output-dir", str(tmp_path)]) == 0
+
+        path = capsys.readouterr().out.strip()
+        assert os.path.basename(path) == "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+        assert len(read_rows(path)) == 50
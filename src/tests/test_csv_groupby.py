@@ -0,0 +1,143 @@
+"""
+Testes unitários dos agrupamentos em uma única passada (tests/utils/csv_groupby.py).
+"""
+from collections import Counter, defaultdict
+import csv
+import os
+import pytest
+from tests.utils.csv_columnar import ColumnarTable
+from tests.utils.csv_groupby import (
+    PARSE_CACHE_SIZE,
+    Count,
+    GroupAccumulator,
+    GroupBy,
+    Max,
+    Min,
+    Sum,
+    count_combinations,
+    group_counts,
+)
+from tests.utils.csv_money import parse_cents
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+VALUE = "Valor total da cobrança"
+
+
+def read_sample_rows():
+    with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+        return list(csv.DictReader(file, delimiter=";"))
+
+
+class TestGroupCounts:
+    """Agrupamento a partir das contagens de combinações."""
+
+    def test_aggregates_per_group(self):
+        columns = ["Bandeira", "Valor"]
+        counts = {("Visa", "2,00"): 3, ("Visa", "5,00"): 1, ("Elo", "1,00"): 2, ("Elo", ""): 1}
+        breakdown = GroupBy("Bandeira", [Count(), Sum("Valor"), Min("Valor"), Max("Valor")])
+
+        groups = group_counts(columns, counts, breakdown)
+
+        assert groups["Visa"] == {"count": 4, "sum[Valor]": 1100, "min[Valor]": 200, "max[Valor]": 500}
+        assert groups["Elo"] == {"count": 3, "sum[Valor]": 200, "min[Valor]": 100, "max[Valor]": 100}
+
+    def test_multiple_keys_use_tuples(self):
+        columns = ["A", "B", "C"]
+        counts = {("a", "x", "1"): 1, ("a", "x", "2"): 2, ("b", "y", "1"): 1}
+
+        groups = group_counts(columns, counts, GroupBy(["A", "B"]))
+
+        assert groups == {("a", "x"): {"count": 3}, ("b", "y"): {"count": 1}}
+
+    def test_column_codes_give_same_counts_as_rows(self, tmp_path):
+        path = tmp_path / "dados.csv"
+        rows = [("Visa", "Gateway"), ("Elo", "Pos"), ("Visa", "Gateway"), ("Visa", "Pos")]
+        path.write_text("B;M\n" + "\n".join(";".join(row) for row in rows) + "\n", encoding="iso-8859-1")
+        table = ColumnarTable.from_csv(str(path))
+
+        assert count_combinations([table.column("B"), table.column("M")]) == Counter(rows)
+
+    def test_accumulator_keeps_one_state_per_group(self):
+        # Valores todos distintos: o estado continua com um item por grupo
+        rows = [{"Bandeira": "Visa" if n % 2 else "Elo", "Valor": f"{n},{n % 100:02d}"} for n in range(10000)]
+        breakdown = GroupBy("Bandeira", [Count(), Sum("Valor"), Max("Valor")])
+        accumulator = GroupAccumulator(breakdown)
+
+        for row in rows:
+            accumulator.add(row)
+
+        assert len(accumulator.states) == 2
+        assert len(breakdown.aggregates[1]._parsed) == PARSE_CACHE_SIZE
+        columns = ["Bandeira", "Valor"]
+        counts = Counter((row["Bandeira"], row["Valor"]) for row in rows)
+        assert accumulator.result() == group_counts(columns, counts, breakdown)
+        assert accumulator.result()["Visa"]["max[Valor]"] == 999999
+
+    def test_requires_key_column(self):
+        with pytest.raises(ValueError):
+            GroupBy([])
+
+
+class TestValidatorGroupBy:
+    """group_by / group_by_many na exportação de exemplo, em todos os modos."""
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_breakdowns_match_row_by_row(self, mode):
+        rows = read_sample_rows()
+        expected_count = Counter((row["Meio de captura"], row["Tipo de venda"]) for row in rows)
+        expected_sum = defaultdict(int)
+        for row in rows:
+            expected_sum[row["Nome da loja"]] += parse_cents(row[VALUE])
+
+        results = CSVValidator(SAMPLE_CSV, mode=mode).group_by_many({
+            "loja": GroupBy("Nome da loja", [Count(), Sum(VALUE)]),
+            "bandeira": GroupBy("Bandeira"),
+            "captura_tipo": GroupBy(["Meio de captura", "Tipo de venda"]),
+        })
+
+        assert {key: group["count"] for key, group in results["captura_tipo"].items()} == expected_count
+        assert {key: group[f"sum[{VALUE}]"] for key, group in results["loja"].items()} == expected_sum
+        assert results["bandeira"]["Visa"]["count"] == 136
+        assert sum(group["count"] for group in results["bandeira"].values()) == 410
+
+    def test_group_by_single_breakdown(self):
+        groups = CSVValidator(SAMPLE_CSV).group_by("Status da cobranca")
+
+        assert groups == {"Pendente": {"count": 410}}
+
+    def test_streaming_reads_file_once(self, monkeypatch):
+        validator = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_STREAMING)
+        reads = []
+        original = validator.iter_rows
+
+        def counting_iter_rows():
+            reads.append(1)
+            return original()
+
+        monkeypatch.setattr(validator, "iter_rows", counting_iter_rows)
+        validator.group_by_many({
+            "loja": GroupBy("Nome da loja"),
+            "bandeira": GroupBy("Bandeira", [Sum(VALUE)]),
+            "tipo": GroupBy("Tipo de venda"),
+        })
+
+        assert len(reads) == 1
+
+    def test_streaming_does_not_count_combinations_of_all_columns(self, monkeypatch):
+        validator = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_STREAMING)
+        monkeypatch.setattr(validator, "_count_combinations", lambda columns: pytest.fail("contou combinações"))
+
+        results = validator.group_by_many({
+            "loja": GroupBy("Nome da loja", [Sum(VALUE)]),
+            "bandeira": GroupBy("Bandeira", [Max(VALUE)]),
+        })
+
+        assert {name: len(groups) for name, groups in results.items()} == {"loja": 8, "bandeira": 5}
+
+    def test_missing_column_raises(self):
+        with pytest.raises(ValueError):
+            CSVValidator(SAMPLE_CSV).group_by("Inexistente")
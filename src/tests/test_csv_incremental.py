@@ -0,0 +1,98 @@
+"""
+Testes unitários da validação incremental durante o download (tests/utils/csv_incremental.py).
+"""
+import os
+import threading
+import time
+import pytest
+from tests.utils.csv_incremental import IncrementalCSVValidator, tail_download
+from tests.utils.csv_rules import DateFormatRule, HasRowsRule, HeadersRule, StatusEnumRule, ValueCountsRule
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def make_rules():
+    return [HeadersRule(), HasRowsRule(), StatusEnumRule(), DateFormatRule("Data da cobranca"), ValueCountsRule()]
+
+
+def read_sample() -> bytes:
+    with open(SAMPLE_CSV, 'rb') as file:
+        return file.read()
+
+
+class TestIncrementalValidator:
+    """Validação de um arquivo recebido em pedaços."""
+
+    def test_chunked_feed_matches_serial_validation(self):
+        data = read_sample()
+        validator = IncrementalCSVValidator(make_rules())
+
+        # Pedaços pequenos e irregulares cortam linhas e caracteres acentuados no meio
+        for start in range(0, len(data), 997):
+            validator.feed(data[start:start + 997])
+        results = validator.finish()
+
+        assert results == CSVValidator(SAMPLE_CSV).validate_rules(make_rules())
+        assert validator.row_count == 410
+
+    def test_last_line_without_newline(self):
+        validator = IncrementalCSVValidator([HasRowsRule()])
+
+        validator.feed(b"Status\nPendente\nPago")
+
+        assert validator.finish()[0].checked_rows == 2
+
+    def test_bad_header_fails_on_first_chunk(self):
+        validator = IncrementalCSVValidator(make_rules())
+
+        validator.feed(b"Coluna;Outra\nx;y\n")
+
+        assert validator.header_failed
+        assert not validator.finish()[0].passed
+
+
+class TestTailDownload:
+    """Acompanhamento do arquivo temporário do Chrome."""
+
+    def test_follows_crdownload_until_rename(self, tmp_path):
+        data = read_sample()
+        temp = tmp_path / "export.csv.crdownload"
+        temp.write_bytes(b"")
+
+        def simulate_download():
+            with open(temp, 'ab') as file:
+                for start in range(0, len(data), 16 * 1024):
+                    file.write(data[start:start + 16 * 1024])
+                    file.flush()
+                    time.sleep(0.01)
+            os.replace(temp, tmp_path / "export.csv")
+
+        downloader = threading.Thread(target=simulate_download)
+        downloader.start()
+        validator = IncrementalCSVValidator(make_rules())
+        try:
+            path = tail_download(str(tmp_path), validator, timeout=10, poll_interval=0.01)
+        finally:
+            downloader.join()
+
+        assert path == str(tmp_path / "export.csv")
+        assert validator.results == CSVValidator(SAMPLE_CSV).validate_rules(make_rules())
+
+    def test_fail_fast_on_bad_header(self, tmp_path):
+        (tmp_path / "export.csv.crdownload").write_bytes(b"Coluna;Outra\nx;y\n")
+        validator = IncrementalCSVValidator([HeadersRule()])
+
+        path = tail_download(str(tmp_path), validator, timeout=5, poll_interval=0.01)
+
+        assert path.endswith(".crdownload")
+        assert not validator.results[0].passed
+
+    def test_ignores_existing_files(self, tmp_path):
+        (tmp_path / "antigo.csv").write_text("Status\nPago\n")
+        validator = IncrementalCSVValidator([HasRowsRule()])
+
+        with pytest.raises(TimeoutError):
+            tail_download(str(tmp_path), validator, timeout=0.1, poll_interval=0.01, ignore=["antigo.csv"])
@@ -0,0 +1,122 @@
+"""
+Testes unitários dos índices hash por identificador (tests/utils/csv_index.py).
+"""
+import csv
+import os
+import pytest
+from tests.utils.csv_index import HashIndex
+from tests.utils.csv_parallel import validate_rules_parallel
+from tests.utils.csv_rules import UniqueColumnRule
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def read_sample_rows():
+    with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+        return list(csv.DictReader(file, delimiter=";"))
+
+
+def expected_duplicates(rows, column):
+    positions = {}
+    for row_number, row in enumerate(rows, start=1):
+        if row[column]:
+            positions.setdefault(row[column], []).append(row_number)
+    return {value: numbers for value, numbers in positions.items() if len(numbers) > 1}
+
+
+class TestHashIndex:
+    """Índice {valor: linhas} de uma coluna."""
+
+    def test_find_and_duplicates(self):
+        index = HashIndex("ID")
+        index.add_column(["a", "b", "", "a", None, "c", "a"])
+
+        assert index.find("b") == [2]
+        assert index.find("a") == [1, 4, 7]
+        assert index.find("x") == []
+        assert index.duplicates() == {"a": [1, 4, 7]}
+        assert (len(index), index.indexed_rows) == (3, 5)
+        assert "" not in index
+
+    def test_merge_shifts_row_numbers(self):
+        first, second = HashIndex("ID"), HashIndex("ID")
+        first.add_column(["a", "b"])
+        second.add_column(["b", "c", "c"])
+
+        first.merge(second, row_offset=2)
+
+        assert first.find("b") == [2, 3]
+        assert first.duplicates() == {"b": [2, 3], "c": [4, 5]}
+
+
+class TestValidatorIndexes:
+    """Buscas e duplicados do CSVValidator na exportação de exemplo."""
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_find_rows_by_each_id_column(self, mode):
+        rows = read_sample_rows()
+        validator = CSVValidator(SAMPLE_CSV, mode=mode, index_columns=CSVValidator.ID_COLUMNS)
+
+        for column in CSVValidator.ID_COLUMNS:
+            value = rows[41][column]
+            found = validator.find_rows(column, value)
+            assert rows[41] in found
+            assert all(row[column] == value for row in found)
+
+        assert validator.find_rows("TID", "inexistente") == []
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_duplicates_match_row_scan(self, mode):
+        rows = read_sample_rows()
+        validator = CSVValidator(SAMPLE_CSV, mode=mode, index_columns=CSVValidator.ID_COLUMNS)
+
+        for column in CSVValidator.ID_COLUMNS:
+            assert validator.get_duplicates(column) == expected_duplicates(rows, column)
+
+    def test_indexes_are_built_during_load(self):
+        validator = CSVValidator(SAMPLE_CSV, index_columns=["ID da cobranca", "TID"])
+
+        validator.read_csv()
+
+        assert set(validator.indexes) == {"ID da cobranca", "TID"}
+
+    def test_streaming_builds_all_indexes_in_one_pass(self, monkeypatch):
+        validator = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_STREAMING, index_columns=CSVValidator.ID_COLUMNS)
+        reads = []
+        original = validator.iter_rows
+        monkeypatch.setattr(validator, "iter_rows", lambda: reads.append(1) or original())
+
+        for column in CSVValidator.ID_COLUMNS:
+            validator.get_index(column)
+
+        assert len(reads) == 1
+
+    def test_missing_column_raises(self):
+        with pytest.raises(ValueError):
+            CSVValidator(SAMPLE_CSV).find_rows("Inexistente", "x")
+
+
+class TestUniqueColumnRule:
+    """Regra de unicidade em uma passada, serial e paralela."""
+
+    def test_reports_repeated_ids(self):
+        rows = read_sample_rows()
+        duplicates = expected_duplicates(rows, "ID da cobranca")
+
+        result = CSVValidator(SAMPLE_CSV).validate_rules([UniqueColumnRule("ID da cobranca")])[0]
+
+        assert not result.passed
+        assert result.failed_rows == sum(len(numbers) - 1 for numbers in duplicates.values())
+        assert result.details["duplicates"] == duplicates
+
+    def test_parallel_matches_serial(self):
+        serial = CSVValidator(SAMPLE_CSV).validate_rules([UniqueColumnRule("ID da cobranca"), UniqueColumnRule("TID")])
+
+        parallel = validate_rules_parallel(
+            SAMPLE_CSV, [UniqueColumnRule("ID da cobranca"), UniqueColumnRule("TID")], workers=2, chunks=7
+        )
+
+        assert parallel == serial
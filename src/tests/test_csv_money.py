@@ -0,0 +1,152 @@
+"""
+Testes unitários da conversão e agregação de valores em reais (tests/utils/csv_money.py).
+"""
+from collections import Counter
+import csv
+import os
+import pytest
+from tests.utils.csv_columnar import ColumnarTable
+from tests.utils.csv_money import (
+    CACHE_SIZE,
+    MAX_INVALID_VALUES,
+    MISSING_CENTS,
+    _parse_cached,
+    count_values,
+    format_cents,
+    money_stats,
+    money_stats_by,
+    parse_cents,
+    stream_money_stats,
+    stream_money_stats_by,
+    to_cents,
+)
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def read_sample_rows():
+    with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+        return list(csv.DictReader(file, delimiter=";"))
+
+
+class TestMoneyParsing:
+    """Conversão de um valor para centavos."""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("200,00", 20000),
+        ("2,00", 200),
+        ("0,00", 0),
+        ("1804,11", 180411),
+        ("1.234,56", 123456),
+        ("1.234.567,8", 123456780),
+        ("10", 1000),
+        ("-47,40", -4740),
+        ("R$ 47,40", 4740),
+        ("-R$ 1,00", -100),
+        ("R$ -1,00", -100),
+        (" 3,5 ", 350),
+    ])
+    def test_valid_values(self, value, expected):
+        assert parse_cents(value) == expected
+
+    @pytest.mark.parametrize("value", ["", None, "N/A", "1,234", "12.34", "1.23,00", "--1,00", "- R$ -1,00"])
+    def test_invalid_values(self, value):
+        assert parse_cents(value) is None
+
+    @pytest.mark.parametrize("cents", [0, 5, 200, 123456, 123456780, -4740])
+    def test_format_round_trip(self, cents):
+        assert parse_cents(format_cents(cents)) == cents
+
+
+class TestMoneyAggregation:
+    """Agregações a partir das contagens de valores distintos."""
+
+    def test_stats_ignore_blank_and_report_invalid(self):
+        stats = money_stats(count_values(["2,00", "", "1.000,00", "x", "2,00", "-1,50"]))
+
+        assert (stats.count, stats.total, stats.minimum, stats.maximum) == (4, 100250, -150, 100000)
+        assert stats.invalid_count == 1
+        assert stats.invalid_values == ["x"]
+        assert not stats.passed
+
+    def test_column_view_gives_same_result_as_list(self, tmp_path):
+        path = tmp_path / "valores.csv"
+        rows = [("Visa", "2,00"), ("Elo", "3,00"), ("Visa", "2,00"), ("Visa", ""), ("Elo", "x")]
+        path.write_text("B;V\n" + "\n".join(f"{b};{v}" for b, v in rows) + "\n", encoding="iso-8859-1")
+        table = ColumnarTable.from_csv(str(path))
+        values = [v for _, v in rows]
+
+        assert money_stats(count_values(table.column("V"))) == money_stats(count_values(values))
+        assert to_cents(table.column("V")) == to_cents(values)
+        assert list(to_cents(values)) == [200, 300, 200, MISSING_CENTS, MISSING_CENTS]
+
+    def test_group_by(self):
+        groups = money_stats_by(Counter([("Visa", "2,00"), ("Elo", "3,00"), ("Visa", "5,00")]))
+
+        assert groups["Visa"].total == 700
+        assert groups["Visa"].count == 2
+        assert groups["Elo"].maximum == 300
+
+    def test_stream_gives_same_result_as_counts(self):
+        values = ["2,00", "", "1.000,00", "x", "2,00", "-1,50", "x"]
+        pairs = [("Visa", "2,00"), ("Elo", "3,00"), ("Visa", "5,00"), ("Elo", "y")]
+
+        assert stream_money_stats(iter(values)) == money_stats(count_values(values))
+        assert stream_money_stats_by(iter(pairs)) == money_stats_by(Counter(pairs))
+
+    def test_memo_is_bounded(self):
+        parsed = {}
+        for index in range(CACHE_SIZE + 10):
+            assert _parse_cached(parsed, f"{index},00") == index * 100
+
+        assert len(parsed) <= CACHE_SIZE
+
+    def test_invalid_samples_are_distinct_and_bounded(self):
+        values = ["x", "x"] + [f"inválido {index}" for index in range(MAX_INVALID_VALUES * 2)]
+
+        stats = stream_money_stats(iter(values))
+
+        assert stats.invalid_count == len(values)
+        assert len(stats.invalid_values) == MAX_INVALID_VALUES
+        assert stats.invalid_values[:2] == ["x", "inválido 0"]
+
+
+class TestValidatorMoneyColumns:
+    """Agregações do CSVValidator na exportação de exemplo, em todos os modos."""
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_totals_match_row_by_row_sum(self, mode):
+        rows = read_sample_rows()
+        validator = CSVValidator(SAMPLE_CSV, mode=mode)
+
+        for column in CSVValidator.MONEY_COLUMNS:
+            expected = [parse_cents(row[column]) for row in rows if row[column]]
+            stats = validator.get_money_stats(column)
+
+            assert stats.passed
+            assert stats.total == sum(expected)
+            assert (stats.count, stats.minimum, stats.maximum) == (len(expected), min(expected), max(expected))
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_group_by_bandeira(self, mode):
+        rows = read_sample_rows()
+        groups = CSVValidator(SAMPLE_CSV, mode=mode).get_money_stats_by("Valor total da cobrança", "Bandeira")
+
+        assert set(groups) == {row["Bandeira"] for row in rows}
+        for bandeira, stats in groups.items():
+            expected = [parse_cents(row["Valor total da cobrança"]) for row in rows if row["Bandeira"] == bandeira]
+            assert stats.total == sum(expected)
+            assert stats.count == len(expected)
+
+    def test_cents_array(self):
+        cents = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_COLUMNAR).get_cents("Valor do frete")
+
+        assert len(cents) == 410
+        assert cents.count(MISSING_CENTS) == 17
+
+    def test_missing_group_column_raises(self):
+        with pytest.raises(ValueError):
+            CSVValidator(SAMPLE_CSV).get_money_stats_by("Valor total da cobrança", "Inexistente")
@@ -0,0 +1,116 @@
+"""
+Testes unitários da projeção de colunas (tests/utils/csv_projection.py e CSVValidator(columns=...)).
+"""
+import csv
+import os
+import tracemalloc
+import pytest
+from tests.utils.csv_cache import ParseCache
+from tests.utils.csv_columnar import ColumnarTable
+from tests.utils.csv_projection import project_rows
+from tests.utils.csv_rules import HeadersRule, StatusEnumRule
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+COLUMNS = ["Status da cobranca", "Data da cobranca", "Valor total da cobrança"]
+
+
+class TestProjectRows:
+    """Redução das linhas do csv.reader às colunas pedidas."""
+
+    def test_keeps_requested_columns_in_order(self):
+        names, rows = project_rows([["1", "a", "x"], [], ["2", "b"]], ["id", "nome", "obs"], ["obs", "id", "nada"])
+
+        assert names == ["obs", "id"]
+        assert list(rows) == [("x", "1"), (None, "2")]
+
+    def test_single_and_no_column(self):
+        assert list(project_rows([["1", "a"]], ["id", "nome"], ["nome"])[1]) == [("a",)]
+        assert list(project_rows([["1", "a"], [], ["2"]], ["id", "nome"], [])[1]) == [(), ()]
+
+
+class TestValidatorProjection:
+    """CSVValidator com columns nos três modos de leitura."""
+
+    def setup_method(self):
+        with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+            self.full_rows = list(csv.DictReader(file, delimiter=";"))
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_rows_keep_only_requested_columns(self, mode):
+        validator = CSVValidator(SAMPLE_CSV, mode=mode, columns=COLUMNS)
+
+        rows = list(validator._rows())
+
+        assert rows == [{name: row[name] for name in COLUMNS} for row in self.full_rows]
+        assert len(validator.headers) == 45
+        assert validator.validate_headers()
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_checks_on_loaded_columns_match_full_read(self, mode):
+        projected = CSVValidator(SAMPLE_CSV, mode=mode, columns=COLUMNS)
+        full = CSVValidator(SAMPLE_CSV, mode=mode)
+
+        assert projected.get_summary() == full.get_summary()
+        assert projected.validate_status_values("Pendente")
+        assert projected.validate_date_format("Data da cobranca")
+        assert projected.get_money_stats("Valor total da cobrança") == full.get_money_stats("Valor total da cobrança")
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_column_not_loaded_raises(self, mode):
+        validator = CSVValidator(SAMPLE_CSV, mode=mode, columns=COLUMNS)
+
+        with pytest.raises(ValueError, match="não foi carregada"):
+            validator.get_column_values("Bandeira")
+        with pytest.raises(ValueError, match="não encontrada"):
+            validator.get_column_values("Coluna inexistente")
+
+    def test_index_columns_are_loaded(self):
+        validator = CSVValidator(SAMPLE_CSV, columns=["Status da cobranca"], index_columns=["TID"])
+
+        assert validator.columns == ["Status da cobranca", "TID"]
+        assert validator.find_rows("TID", "0031557829")[0] == {"Status da cobranca": "Pendente", "TID": "0031557829"}
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_rules_and_schema_see_all_columns(self, mode):
+        validator = CSVValidator(SAMPLE_CSV, mode=mode, columns=["Status da cobranca"])
+
+        assert all(result.passed for result in validator.validate_rules([HeadersRule(), StatusEnumRule()]))
+        assert validator.validate_schema().passed
+
+    def test_projection_reduces_memory(self):
+        def peak(columns):
+            tracemalloc.start()
+            try:
+                CSVValidator(SAMPLE_CSV, columns=columns).read_csv()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        assert peak(COLUMNS) < peak(None) / 3
+
+
+class TestColumnarProjection:
+    """Tabela colunar e cache com projeção."""
+
+    def test_table_has_only_requested_columns(self):
+        table = ColumnarTable.from_csv(SAMPLE_CSV, columns=["Bandeira", "Status da cobranca"])
+
+        assert table.headers == ["Bandeira", "Status da cobranca"]
+        assert len(table) == 410
+        assert table.column("Status da cobranca").value_counts() == {"Pendente": 410}
+
+    def test_cache_keeps_one_entry_per_projection(self, tmp_path):
+        cache = ParseCache(str(tmp_path))
+        CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_COLUMNAR, cache=cache, columns=COLUMNS).load_table()
+        CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_COLUMNAR, cache=cache).load_table()
+
+        projected = cache.load(SAMPLE_CSV, columns=COLUMNS)
+        full = cache.load(SAMPLE_CSV)
+
+        assert projected.headers == COLUMNS
+        assert len(full.headers) == 45
+        assert cache.load(SAMPLE_CSV, columns=["Bandeira"]) is None
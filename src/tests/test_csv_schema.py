@@ -0,0 +1,135 @@
+"""
+Testes unitários do schema declarativo da exportação (tests/utils/csv_schema.py).
+"""
+import csv
+import os
+import pytest
+from tests.utils.csv_parallel import validate_rules_parallel
+from tests.utils.csv_schema import (
+    DATE,
+    MONEY,
+    TRANSACTION_EXPORT_SCHEMA,
+    ColumnSpec,
+    Schema,
+    SchemaRule,
+    compile_column,
+)
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def copy_sample_with_changes(path, changes):
+    """Copia a exportação de exemplo alterando células: {(linha, coluna): valor}."""
+    with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+        reader = csv.reader(file, delimiter=";")
+        headers = next(reader)
+        rows = list(reader)
+    for (row_number, column), value in changes.items():
+        rows[row_number - 1][headers.index(column)] = value
+    with open(path, "w", encoding="iso-8859-1", newline="") as file:
+        writer = csv.writer(file, delimiter=";", lineterminator="\n")
+        writer.writerow(headers)
+        writer.writerows(rows)
+    return str(path)
+
+
+class TestCompileColumn:
+    """Compilação das regras de uma coluna."""
+
+    @pytest.mark.parametrize("spec, value, expected", [
+        (ColumnSpec("V", MONEY, nullable=False), "200,00", True),
+        (ColumnSpec("V", MONEY, nullable=False), "200", False),
+        (ColumnSpec("V", MONEY, nullable=False), "", False),
+        (ColumnSpec("V", MONEY), "", True),
+        (ColumnSpec("D", DATE), "31/02/2025", False),
+        (ColumnSpec("D", DATE), "01/01/0001 00:00:00", True),
+        (ColumnSpec("E", enum=("A", "B")), "B", True),
+        (ColumnSpec("E", enum=("A", "B")), "C", False),
+        (ColumnSpec("P", pattern=r"\d{6}"), "12345", False),
+    ])
+    def test_checks(self, spec, value, expected):
+        assert compile_column(spec)(value) is expected
+
+    def test_free_nullable_text_is_not_checked(self):
+        assert compile_column(ColumnSpec("Livre")) is None
+
+    def test_schema_covers_all_export_columns(self):
+        with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+            headers = next(csv.reader(file, delimiter=";"))
+
+        assert TRANSACTION_EXPORT_SCHEMA.names == headers
+        assert len(headers) == 45
+
+
+class TestSchemaValidation:
+    """Validação do arquivo inteiro, nos três modos e em paralelo."""
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_sample_export_follows_schema(self, mode):
+        result = CSVValidator(SAMPLE_CSV, mode=mode).validate_schema()
+
+        assert result.passed, result.message
+        assert result.checked_rows == 410
+
+    def test_modes_report_the_same_failures(self, tmp_path):
+        path = copy_sample_with_changes(tmp_path / "export.csv", {
+            (3, "Status da cobranca"): "Desconhecido",
+            (3, "Valor da transação"): "2.00",
+            (7, "Data da cobranca"): "",
+            (200, "Bandeira"): "Visa Electron",
+        })
+
+        results = [CSVValidator(path, mode=mode).validate_schema() for mode in CSVValidator.MODES]
+
+        assert results[0] == results[1] == results[2]
+        assert results[0].samples == [
+            (3, {"Status da cobranca": "Desconhecido", "Valor da transação": "2.00"}),
+            (7, {"Data da cobranca": ""}),
+            (200, {"Bandeira": "Visa Electron"}),
+        ]
+        assert results[0].details["failures_by_column"]["Status da cobranca"] == 1
+
+    def test_modes_report_row_with_extra_field(self, tmp_path):
+        path = copy_sample_with_changes(tmp_path / "export.csv", {})
+        with open(path, encoding="iso-8859-1") as file:
+            lines = file.read().split("\n")
+        lines[4] += ";sobra"  # Linha de dados 4 com um valor além do header
+        with open(path, "w", encoding="iso-8859-1", newline="") as file:
+            file.write("\n".join(lines))
+
+        results = [CSVValidator(path, mode=mode).validate_schema() for mode in CSVValidator.MODES]
+
+        assert results[0] == results[1] == results[2]
+        assert results[0].failed_rows == 1
+        assert results[0].samples == [(4, {None: ["sobra"]})]
+
+    def test_parallel_matches_serial(self, tmp_path):
+        path = copy_sample_with_changes(tmp_path / "export.csv", {(5, "TID"): "abc", (300, "Bin"): "1"})
+
+        serial = CSVValidator(path).validate_rules([SchemaRule()])
+        parallel = validate_rules_parallel(path, [SchemaRule()], workers=2, chunks=5)
+
+        assert parallel == serial
+        assert serial[0].failed_rows == 2
+
+    def test_missing_and_extra_columns(self, tmp_path):
+        path = tmp_path / "export.csv"
+        path.write_text("Data da cobranca;Coluna nova\n27/11/2025;x\n", encoding="iso-8859-1")
+
+        result = CSVValidator(str(path)).validate_schema()
+
+        assert not result.passed
+        assert "ausentes" in result.message
+
+    def test_new_column_is_a_one_line_change(self, tmp_path):
+        path = tmp_path / "export.csv"
+        path.write_text("Data;Status\n27/11/2025;Novo\n", encoding="iso-8859-1")
+        schema = Schema((ColumnSpec("Data", DATE), ColumnSpec("Status", enum=("Pendente",))))
+
+        assert not CSVValidator(str(path)).validate_schema(schema).passed
+
+        extended = Schema((ColumnSpec("Data", DATE), ColumnSpec("Status", enum=("Pendente", "Novo"))))
+        assert CSVValidator(str(path)).validate_schema(extended).passed
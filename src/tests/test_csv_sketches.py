@@ -0,0 +1,157 @@
+"""
+Testes unitários dos sketches do resumo (tests/utils/csv_sketches.py e get_summary(include_sketches=True)).
+"""
+import bisect
+import csv
+import os
+import random
+import pytest
+from tests.data_generator.transaction_export_data import generate_export
+from tests.utils.csv_dates import parse_timestamp
+from tests.utils.csv_money import parse_cents
+from tests.utils.csv_sketches import HyperLogLog, KLLSketch
+from tests.utils.csv_validator import CSVValidator
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def read_rows(path):
+    with open(path, encoding="iso-8859-1", newline="") as file:
+        return list(csv.DictReader(file, delimiter=";"))
+
+
+def rank_error(sorted_values, value, fraction):
+    """Distância entre a fração pedida e o intervalo de posições ocupado pelo valor."""
+    low = bisect.bisect_left(sorted_values, value) / len(sorted_values)
+    high = bisect.bisect_right(sorted_values, value) / len(sorted_values)
+    return max(low - fraction, fraction - high, 0)
+
+
+def exact_distinct(rows, column):
+    return len({row[column] for row in rows} - {"", "N/A"})
+
+
+class TestKLLSketch:
+    """Quantis aproximados com memória limitada."""
+
+    def test_quantiles_within_rank_error(self):
+        values = list(range(100_000))
+        random.Random(1).shuffle(values)
+        sketch = KLLSketch(k=200)
+        for value in values:
+            sketch.add(value)
+
+        fractions = (0.01, 0.5, 0.95, 0.99)
+        for fraction, estimate in zip(fractions, sketch.quantiles(fractions)):
+            assert abs(estimate / 100_000 - fraction) < 0.02
+        assert sketch.count == 100_000
+        assert len(sketch) < 1000
+
+    def test_weighted_add_and_merge(self):
+        weighted = KLLSketch(k=50)
+        weighted.add(10, 900)
+        weighted.add(20, 100)
+        assert weighted.quantiles([0.5, 0.95]) == [10, 20]
+        assert weighted.count == 1000
+
+        other = KLLSketch(k=50)
+        other.add(30, 3000)
+        weighted.merge(other)
+        assert weighted.quantiles([0.1, 0.5]) == [10, 30]
+
+    def test_empty_and_invalid(self):
+        assert KLLSketch().quantiles([0.5]) == [None]
+        with pytest.raises(ValueError):
+            KLLSketch(k=4)
+
+
+class TestHyperLogLog:
+    """Contagem aproximada de valores distintos."""
+
+    def test_small_counts_are_exact(self):
+        sketch = HyperLogLog()
+        for value in ["a", "b", "c", "a", "b"] * 10:
+            sketch.add(value)
+        assert sketch.count() == 3
+        assert HyperLogLog().count() == 0
+
+    @pytest.mark.parametrize("precision, tolerance", [(10, 0.1), (14, 0.03)])
+    def test_large_counts_within_error(self, precision, tolerance):
+        sketch = HyperLogLog(precision)
+        for number in range(200_000):
+            sketch.add(f"cliente-{number % 50_000}")
+
+        assert abs(sketch.count() / 50_000 - 1) < tolerance
+
+    def test_merge_counts_union(self):
+        first, second = HyperLogLog(12), HyperLogLog(12)
+        for number in range(3000):
+            first.add(str(number))
+            second.add(str(number + 2000))
+
+        first.merge(second)
+
+        assert abs(first.count() / 5000 - 1) < 0.05
+        with pytest.raises(ValueError):
+            first.merge(HyperLogLog(10))
+        with pytest.raises(ValueError):
+            HyperLogLog(3)
+
+
+class TestSummarySketches:
+    """get_summary(include_sketches=True) nos três modos de leitura."""
+
+    def check_against_exact(self, sketches, rows, tolerance):
+        values = sorted(parse_cents(row["Valor da transação"]) for row in rows)
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            assert rank_error(values, sketches["value_quantiles"][name], fraction) <= tolerance
+
+        exact = {
+            "merchants": exact_distinct(rows, "ID do estabelecimento"),
+            "customers": exact_distinct(rows, "Documento do cliente"),
+            "cards": exact_distinct(rows, "Numero do cartao"),
+        }
+        for name, count in exact.items():
+            assert abs(sketches["distinct"][name] - count) <= max(1, count * tolerance)
+
+        timestamps = [parse_timestamp(row["Data da cobranca"]) for row in rows]
+        assert sketches["first_timestamp"] == min(timestamps)
+        assert sketches["last_timestamp"] == max(timestamps)
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_sample_export(self, mode):
+        summary = CSVValidator(SAMPLE_CSV, mode=mode).get_summary(include_sketches=True)
+
+        sketches = summary["sketches"]
+        assert summary["total_rows"] == 410
+        assert summary["status_distribution"] == {"Pendente": 410}
+        assert sketches["value_column"] == "Valor da transação"
+        assert sketches["invalid_values"] == 0
+        assert sketches["first_date"] == "21/11/2025 12:25:38"
+        assert sketches["last_date"] == "27/11/2025 09:14:43"
+        self.check_against_exact(sketches, read_rows(SAMPLE_CSV), tolerance=0.01)
+
+    @pytest.mark.parametrize("mode", [CSVValidator.MODE_STREAMING, CSVValidator.MODE_COLUMNAR])
+    def test_generated_export(self, tmp_path, mode):
+        path = generate_export(str(tmp_path / "export.csv"), 30_000, seed=19, customers=3000)
+
+        summary = CSVValidator(path, mode=mode).get_summary(include_sketches=True, quantile_k=100, hll_precision=12)
+
+        assert summary["total_rows"] == 30_000
+        self.check_against_exact(summary["sketches"], read_rows(path), tolerance=0.05)
+
+    def test_summary_without_sketches_is_unchanged(self):
+        assert "sketches" not in CSVValidator(SAMPLE_CSV).get_summary()
+
+    def test_projection_uses_loaded_columns_only(self):
+        validator = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_STREAMING, columns=["Numero do cartao"])
+
+        summary = validator.get_summary(include_sketches=True)
+
+        assert summary["total_rows"] == 410
+        assert "status_distribution" not in summary
+        assert summary["sketches"]["value_column"] is None
+        assert summary["sketches"]["value_quantiles"] == {"p50": None, "p95": None, "p99": None}
+        assert list(summary["sketches"]["distinct"]) == ["cards"]
@@ -0,0 +1,283 @@
+"""
+Testes unitários do CSVValidator (não dependem do navegador).
+"""
+import os
+import pytest
+from tests.utils.csv_validator import CSVValidator
+from tests.utils.csv_columnar import ColumnarTable, ColumnView
+from tests.utils.csv_rules import (
+    DateFormatRule,
+    ExpectedStatusRule,
+    HasRowsRule,
+    HeadersRule,
+    NotEmptyColumnsRule,
+    StatusEnumRule,
+    ValueCountsRule,
+)
+from tests.utils.csv_mmap import MappedCSVReader
+from tests.utils.csv_parallel import read_header, split_byte_ranges, validate_rules_parallel
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+HEADER = ";".join(CSVValidator.EXPECTED_COLUMNS)
+
+
+def write_csv(path, rows, header=HEADER):
+    """Escreve um CSV no formato da exportação (';' e ISO-8859-1)."""
+    lines = [header] + [";".join(row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="iso-8859-1")
+    return str(path)
+
+
+def make_row(status="Pendente", date="27/11/2025 09:14:43"):
+    """Gera uma linha com todas as colunas esperadas preenchidas."""
+    values = {column: "x" for column in CSVValidator.EXPECTED_COLUMNS}
+    values["Status da cobranca"] = status
+    values["Data da cobranca"] = date
+    return [values[column] for column in CSVValidator.EXPECTED_COLUMNS]
+
+
+class TestCSVValidatorStreaming:
+    """O modo streaming deve produzir os mesmos resultados do modo em memória."""
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_sample_export_is_valid(self, mode):
+        validator = CSVValidator(SAMPLE_CSV, mode=mode)
+
+        assert validator.validate_headers()
+        assert validator.validate_not_empty()
+        assert validator.validate_status_values()
+        assert validator.validate_status_values(expected_status="Pendente")
+        assert validator.validate_date_format("Data da cobranca")
+        assert validator.get_row_count() == 410
+
+    @pytest.mark.parametrize("mode", [CSVValidator.MODE_STREAMING, CSVValidator.MODE_COLUMNAR])
+    def test_summary_matches_memory_mode(self, mode):
+        memory = CSVValidator(SAMPLE_CSV).get_summary()
+        summary = CSVValidator(SAMPLE_CSV, mode=mode).get_summary()
+
+        assert summary == memory
+        assert summary["status_distribution"] == {"Pendente": 410}
+
+    def test_streaming_does_not_keep_rows(self):
+        validator = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_STREAMING)
+        validator.validate_status_values()
+        validator.get_summary()
+
+        assert validator.data == []
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_detects_invalid_values(self, tmp_path, mode):
+        path = write_csv(tmp_path / "invalido.csv", [
+            make_row(),
+            make_row(status="Inexistente", date="31/02/2025"),
+        ])
+        validator = CSVValidator(path, mode=mode)
+
+        assert not validator.validate_status_values()
+        assert not validator.validate_date_format("Data da cobranca")
+
+    def test_streaming_empty_file(self, tmp_path):
+        path = write_csv(tmp_path / "vazio.csv", [])
+        validator = CSVValidator(path, mode=CSVValidator.MODE_STREAMING)
+
+        assert validator.validate_headers()
+        assert not validator.validate_not_empty()
+        assert validator.get_row_count() == 0
+
+    def test_invalid_mode_raises(self):
+        with pytest.raises(ValueError):
+            CSVValidator(SAMPLE_CSV, mode="desconhecido")
+
+
+class TestCSVRules:
+    """O motor de regras deve validar tudo em uma única passada."""
+
+    def test_all_rules_pass_on_sample_export(self):
+        results = CSVValidator(SAMPLE_CSV).validate_rules([
+            HeadersRule(),
+            HasRowsRule(),
+            NotEmptyColumnsRule(["ID da cobranca", "Nome da loja"]),
+            StatusEnumRule(),
+            DateFormatRule("Data da cobranca"),
+            ExpectedStatusRule("Pendente"),
+        ])
+
+        assert [result.passed for result in results] == [True] * 6
+        assert results[1].checked_rows == 410
+
+    def test_rules_report_failures_with_row_numbers(self, tmp_path):
+        path = write_csv(tmp_path / "invalido.csv", [
+            make_row(),
+            make_row(status="Inexistente"),
+            make_row(status="Paga", date="2025-11-27"),
+        ])
+        validator = CSVValidator(path, mode=CSVValidator.MODE_STREAMING)
+
+        enum, expected, dates = validator.validate_rules([
+            StatusEnumRule(),
+            ExpectedStatusRule("Pendente"),
+            DateFormatRule("Data da cobranca"),
+        ])
+
+        assert not enum.passed
+        assert enum.samples == [(2, "Inexistente")]
+        assert not expected.passed
+        assert expected.failed_rows == 2
+        assert expected.details["unexpected_values"] == ["Inexistente", "Paga"]
+        assert dates.samples == [(3, "2025-11-27")]
+
+    def test_missing_column_is_reported_without_reading_rows(self, tmp_path):
+        path = write_csv(tmp_path / "sem_status.csv", [["a", "b"]], header="Coluna A;Coluna B")
+
+        headers, status = CSVValidator(path).validate_rules([HeadersRule(), StatusEnumRule()])
+
+        assert not headers.passed
+        assert "Status da cobranca" in headers.details["missing_columns"]
+        assert not status.passed
+        assert status.checked_rows == 0
+
+
+class TestColumnarTable:
+    """O modo columnar guarda uma lista por coluna, com valores repetidos compartilhados."""
+
+    def test_column_values_match_row_mode(self):
+        rows = CSVValidator(SAMPLE_CSV)
+        columnar = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_COLUMNAR)
+
+        for column in ("Status da cobranca", "Bandeira", "ID da cobranca"):
+            view = columnar.get_column_values(column)
+            assert isinstance(view, ColumnView)
+            assert list(view) == rows.get_column_values(column)
+
+    def test_repeated_values_are_stored_once(self):
+        table = ColumnarTable.from_csv(SAMPLE_CSV)
+
+        assert len(table) == 410
+        assert table.column("Status da cobranca").distinct() == ["Pendente"]
+        assert len(table.column("Bandeira").distinct()) == 5
+        assert table.column("Bandeira").value_counts()["Visa"] == 136
+
+    def test_rows_are_rebuilt_on_demand(self):
+        table = ColumnarTable.from_csv(SAMPLE_CSV)
+        first = CSVValidator(SAMPLE_CSV).read_csv()[0]
+
+        assert table.row(0) == dict(first)
+        assert next(table.iter_rows()) == dict(first)
+
+    def test_short_rows_are_padded_like_dict_reader(self, tmp_path):
+        path = write_csv(tmp_path / "curto.csv", [["a"]], header="A;B")
+        table = ColumnarTable.from_csv(path)
+
+        assert table.row(0) == {"A": "a", "B": None}
+
+    def test_wide_rows_keep_extra_fields_like_dict_reader(self, tmp_path):
+        path = write_csv(tmp_path / "largo.csv", [["a", "b", "sobra1", "sobra2"], ["c", "d"]], header="A;B")
+        table = ColumnarTable.from_csv(path)
+
+        assert table.wide_rows == 1
+        assert table.extra_fields == {0: ["sobra1", "sobra2"]}
+        assert table.row(0) == {"A": "a", "B": "b", None: ["sobra1", "sobra2"]}
+        assert list(table.iter_rows()) == [dict(row) for row in CSVValidator(path).read_csv()]
+
+    def test_rules_run_on_columnar_mode(self):
+        validator = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_COLUMNAR)
+
+        results = validator.validate_rules([HeadersRule(), StatusEnumRule()])
+
+        assert all(result.passed for result in results)
+
+
+class TestParallelValidation:
+    """A validação paralela deve dar o mesmo resultado da serial."""
+
+    def build_rules(self):
+        return [
+            HeadersRule(),
+            HasRowsRule(),
+            NotEmptyColumnsRule(["NSU"]),
+            StatusEnumRule(),
+            ExpectedStatusRule("Pendente"),
+            DateFormatRule("Data da cobranca"),
+            ValueCountsRule(),
+        ]
+
+    def test_byte_ranges_are_aligned_to_lines(self):
+        headers, data_start = read_header(SAMPLE_CSV)
+        ranges = split_byte_ranges(SAMPLE_CSV, data_start, 7)
+
+        assert headers[0] == "Data da cobranca"
+        assert len(ranges) == 7
+        assert ranges[0][0] == data_start
+        assert ranges[-1][1] == os.path.getsize(SAMPLE_CSV)
+        with open(SAMPLE_CSV, "rb") as file:
+            content = file.read()
+        for start, end in ranges:
+            assert content[start - 1:start] == b"\n"
+            assert content[end - 1:end] == b"\n"
+
+    def test_parallel_matches_serial(self, tmp_path):
+        rows = [make_row() for _ in range(200)]
+        rows[3] = make_row(status="Inexistente")
+        rows[150] = make_row(status="Paga", date="31/02/2025")
+        rows[199] = make_row(date="x")
+        path = write_csv(tmp_path / "grande.csv", rows)
+
+        serial = CSVValidator(path).validate_rules(self.build_rules())
+        parallel = validate_rules_parallel(path, self.build_rules(), workers=2, chunks=9)
+
+        assert parallel == serial
+        assert parallel[-1].details["counts"] == {"Pendente": 198, "Inexistente": 1, "Paga": 1}
+        assert parallel[5].samples == [(151, "31/02/2025"), (200, "x")]
+
+    def test_validator_uses_parallel_mode_with_workers(self):
+        validator = CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_STREAMING)
+
+        results = validator.validate_rules(self.build_rules(), workers=2)
+
+        assert results == CSVValidator(SAMPLE_CSV).validate_rules(self.build_rules())
+        assert validator.headers[0] == "Data da cobranca"
+
+
+class TestMappedReader:
+    """Leitura de linhas por número via mmap, sem parse do arquivo inteiro."""
+
+    def test_rows_match_dict_reader(self):
+        rows = CSVValidator(SAMPLE_CSV).read_csv()
+
+        with MappedCSVReader(SAMPLE_CSV) as reader:
+            assert len(reader) == len(rows)
+            assert reader.get_row(1) == rows[0]
+            assert reader.get_rows([410, 7]) == [rows[409], rows[6]]
+            assert list(reader.iter_range(100, 105)) == rows[99:105]
+            with pytest.raises(IndexError):
+                reader.get_row(411)
+
+    def test_blank_and_short_lines(self, tmp_path):
+        path = tmp_path / "linhas.csv"
+        path.write_bytes(b"A;B\r\n1;2\r\n\r\n3\n\n4;5;6")
+        rows = CSVValidator(str(path)).read_csv()
+
+        with MappedCSVReader(str(path)) as reader:
+            assert reader.get_rows(range(1, len(reader) + 1)) == rows
+            assert reader.get_row(2) == {"A": "3", "B": None}
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "vazio.csv"
+        path.write_bytes(b"")
+
+        with MappedCSVReader(str(path)) as reader:
+            assert len(reader) == 0
+
+    @pytest.mark.parametrize("mode", CSVValidator.MODES)
+    def test_validator_returns_failed_rows(self, tmp_path, mode):
+        path = write_csv(tmp_path / "invalido.csv", [make_row(), make_row(status="Inexistente")])
+        validator = CSVValidator(path, mode=mode)
+
+        result = validator.validate_rules([StatusEnumRule()])[0]
+        rows = validator.get_rows(row for row, _ in result.samples)
+        validator.close()
+
+        assert [row["Status da cobranca"] for row in rows] == ["Inexistente"]
@@ -0,0 +1,142 @@
+"""
+Testes unitários dos diretórios de download por teste (tests/utils/download_dirs.py).
+"""
+import os
+import pytest
+from tests.utils.download_dirs import (
+    KEEP_ALL,
+    KEEP_FAILED,
+    KEEP_NONE,
+    close_test_download_dir,
+    create_test_download_dir,
+    dir_name_for,
+    finish_test_download_dir,
+    prune_download_dirs,
+    set_download_dir,
+    worker_download_root,
+    worker_id,
+)
+
+
+class FakeChromeDriver:
+    """WebDriver falso que registra os comandos CDP; pode recusar Page.setDownloadBehavior."""
+
+    def __init__(self, reject_page_command=False):
+        self.reject_page_command = reject_page_command
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        if self.reject_page_command and command.startswith("Page."):
+            raise Exception("'Page.setDownloadBehavior' wasn't found")
+        self.commands.append((command, params))
+        return {}
+
+
+class TestWorkerRoot:
+    """Raiz de download por worker do pytest-xdist."""
+
+    def test_worker_id_from_xdist(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+        assert worker_id() == "gw3"
+        monkeypatch.delenv("PYTEST_XDIST_WORKER")
+        assert worker_id() == "main"
+
+    def test_worker_roots_are_separate(self, tmp_path):
+        first = worker_download_root(str(tmp_path), "gw0")
+        second = worker_download_root(str(tmp_path), "gw1")
+
+        assert first != second
+        assert os.path.isdir(first) and os.path.isdir(second)
+
+
+class TestTestDownloadDir:
+    """Subdiretório por teste e troca do diretório do Chrome."""
+
+    @pytest.mark.parametrize("nodeid, expected", [
+        ("tests/test_transactions.py::TestTransactions::test_export", "TestTransactions.test_export"),
+        ("tests/test_x.py::test_export[Pago/Pendente]", "test_export-Pago-Pendente"),
+        ("tests/test_x.py::" + "a" * 100, "a" * 80),
+    ])
+    def test_dir_name_for(self, nodeid, expected):
+        assert dir_name_for(nodeid) == expected
+
+    def test_each_call_creates_empty_dir(self, tmp_path):
+        nodeid = "tests/test_transactions.py::TestTransactions::test_export"
+
+        first = create_test_download_dir(str(tmp_path), nodeid)
+        second = create_test_download_dir(str(tmp_path), nodeid)
+
+        assert first != second
+        assert os.path.basename(first).startswith("TestTransactions.test_export_")
+        assert os.listdir(first) == []
+
+    def test_set_download_dir_uses_page_command(self, tmp_path):
+        driver = FakeChromeDriver()
+
+        set_download_dir(driver, str(tmp_path))
+
+        assert driver.commands == [
+            ("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": str(tmp_path)}),
+        ]
+
+    def test_set_download_dir_falls_back_to_browser_command(self, tmp_path):
+        driver = FakeChromeDriver(reject_page_command=True)
+
+        set_download_dir(driver, str(tmp_path))
+
+        assert [command for command, _ in driver.commands] == ["Browser.setDownloadBehavior"]
+
+    def test_set_download_dir_without_cdp(self, tmp_path):
+        with pytest.raises(RuntimeError, match="CDP"):
+            set_download_dir(object(), str(tmp_path))
+
+
+class TestRetention:
+    """Remoção dos diretórios ao fim do teste e limite por worker."""
+
+    @pytest.mark.parametrize("keep, failed, kept", [
+        (KEEP_FAILED, False, False),
+        (KEEP_FAILED, True, True),
+        (KEEP_ALL, False, True),
+        (KEEP_NONE, True, False),
+    ])
+    def test_finish_test_download_dir(self, tmp_path, keep, failed, kept):
+        path = tmp_path / "teste"
+        path.mkdir()
+        (path / "export.csv").write_text("a")
+
+        assert finish_test_download_dir(str(path), failed, keep) == kept
+        assert path.exists() == kept
+
+    def test_invalid_policy(self, tmp_path):
+        with pytest.raises(ValueError, match="Política"):
+            finish_test_download_dir(str(tmp_path), False, "sempre")
+        assert tmp_path.exists()
+
+    def test_prune_keeps_newest(self, tmp_path):
+        for index in range(5):
+            path = tmp_path / f"teste_{index}"
+            path.mkdir()
+            os.utime(path, (1000 + index, 1000 + index))
+        (tmp_path / "solto.csv").write_text("a")  # Arquivos soltos na raiz não contam
+
+        removed = prune_download_dirs(str(tmp_path), retention=2)
+
+        assert sorted(os.path.basename(path) for path in removed) == ["teste_0", "teste_1", "teste_2"]
+        assert sorted(os.listdir(tmp_path)) == ["solto.csv", "teste_3", "teste_4"]
+        assert prune_download_dirs(str(tmp_path), retention=0) and sorted(os.listdir(tmp_path)) == ["solto.csv"]
+
+    def test_fixture_teardown_with_project_config(self, tmp_path, monkeypatch):
+        # Mesmo fim da fixture download_dir, com a classe Config de verdade
+        monkeypatch.setenv("EMAIL", "teste@exemplo.com")
+        monkeypatch.setenv("PASSWORD", "senha")
+        Config = pytest.importorskip("portal_automation.utils.config").Config
+        driver = FakeChromeDriver()
+        worker_root = str(tmp_path)
+        path = create_test_download_dir(worker_root, "tests/test_transactions.py::TestTransactions::test_export")
+
+        kept = close_test_download_dir(driver, worker_root, path, failed=False, settings=Config)
+
+        assert kept == (Config.DOWNLOADS_KEEP == KEEP_ALL)
+        assert os.path.exists(path) == kept
+        assert driver.commands[-1][1]["downloadPath"] == worker_root
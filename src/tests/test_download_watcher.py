@@ -0,0 +1,87 @@
+"""
+Testes unitários da espera de downloads (tests/utils/download_watcher.py).
+"""
+import os
+import threading
+import time
+import pytest
+from tests.utils.download_watcher import DownloadWatcher
+
+
+def download_later(directory, name, chunks=1, delay=0.1, interval=0.05, temp_suffix=".crdownload"):
+    """Simula o navegador: escreve o temporário aos poucos e renomeia para o nome final."""
+    def run():
+        time.sleep(delay)
+        temp_path = os.path.join(directory, name + temp_suffix) if temp_suffix else os.path.join(directory, name)
+        with open(temp_path, "w") as file:
+            for _ in range(chunks):
+                file.write("x" * 1000)
+                file.flush()
+                time.sleep(interval)
+        if temp_suffix:
+            os.rename(temp_path, os.path.join(directory, name))
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request):
+    return request.param
+
+
+class TestDownloadWatcher:
+    """Detecção do arquivo novo, estabilidade do tamanho e tempo limite."""
+
+    def test_ignores_files_from_before_the_snapshot(self, tmp_path, use_inotify):
+        (tmp_path / "antigo.csv").write_text("a")
+        with DownloadWatcher(str(tmp_path), use_inotify=use_inotify) as watcher:
+            assert watcher.find_new() is None
+            thread = download_later(str(tmp_path), "novo.csv")
+            path = watcher.wait(timeout=5)
+            (tmp_path / "antigo.csv").write_text("b")  # Modificado depois, mas já estava no retrato
+            assert watcher.find_new() == path
+        thread.join()
+
+        assert path == str(tmp_path / "novo.csv")
+
+    def test_returns_new_file_after_temporary_is_renamed(self, tmp_path, use_inotify):
+        (tmp_path / "TRANSAÇÕES_antigo.csv").write_text("a")
+        with DownloadWatcher(str(tmp_path), use_inotify=use_inotify) as watcher:
+            assert watcher.uses_inotify == use_inotify
+            thread = download_later(str(tmp_path), "TRANSAÇÕES_novo.csv", chunks=4)
+            started = time.monotonic()
+            path = watcher.wait(timeout=5, stable_for=0.1)
+            elapsed = time.monotonic() - started
+        thread.join()
+
+        assert path == str(tmp_path / "TRANSAÇÕES_novo.csv")
+        assert os.path.getsize(path) == 4000
+        assert elapsed < 1.5
+
+    def test_waits_for_size_to_be_stable(self, tmp_path, use_inotify):
+        with DownloadWatcher(str(tmp_path), use_inotify=use_inotify) as watcher:
+            # Escreve direto no nome final, sem temporário
+            thread = download_later(str(tmp_path), "direto.csv", chunks=6, interval=0.1, temp_suffix="")
+            path = watcher.wait(timeout=5, stable_for=0.3)
+        thread.join()
+
+        assert os.path.getsize(path) == 6000
+
+    def test_timeout_without_new_file(self, tmp_path, use_inotify):
+        (tmp_path / "antigo.csv").write_text("a")
+        (tmp_path / "baixando.csv.crdownload").write_text("a")
+
+        with DownloadWatcher(str(tmp_path), use_inotify=use_inotify) as watcher:
+            with pytest.raises(TimeoutError):
+                watcher.wait(timeout=0.3)
+
+    def test_since_accepts_file_finished_before_start(self, tmp_path):
+        clicked_at = time.time() - 1
+        (tmp_path / "recente.csv").write_text("a")
+
+        with DownloadWatcher(str(tmp_path), since=clicked_at) as watcher:
+            assert watcher.wait(timeout=2, stable_for=0.05) == str(tmp_path / "recente.csv")
+        with DownloadWatcher(str(tmp_path)) as watcher:
+            assert watcher.find_new() is None
@@ -0,0 +1,199 @@
+"""
+Testes unitários do download da exportação por HTTP (tests/utils/http_export.py).
+"""
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import socket
+import threading
+from urllib.parse import parse_qs, urlparse
+import pytest
+import requests
+from tests.utils.csv_rules import HasRowsRule, HeadersRule, StatusEnumRule
+from tests.utils.csv_validator import CSVValidator
+from tests.utils.http_export import (
+    EXPORT_PATH,
+    ExportClient,
+    export_file_name,
+    session_from_driver,
+    split_date_range,
+)
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+
+def make_rules():
+    return [HeadersRule(), HasRowsRule(), StatusEnumRule()]
+
+
+class FakeDriver:
+    """WebDriver falso com cookies e o resultado do script do navegador."""
+
+    def __init__(self, cookies, user_agent="Navegador de teste", token=None):
+        self.cookies = cookies
+        self.user_agent = user_agent
+        self.token = token
+        self.scripts = []
+
+    def get_cookies(self):
+        return self.cookies
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        return [self.user_agent, self.token]
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    """Endpoint de exportação: exige o cookie de sessão e devolve o CSV em pedaços."""
+
+    body = b""
+    requests_seen = []
+    cut_after = None  # Encerra a conexão depois de tantos bytes (simula queda no meio do download)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.requests_seen.append((url.path, parse_qs(url.query), dict(self.headers)))
+        if "sessao=abc" not in self.headers.get("Cookie", ""):
+            self.send_response(401)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(self.body), 4096):
+            if self.cut_after is not None and start >= self.cut_after:
+                self.wfile.flush()
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            chunk = self.body[start:start + 4096]
+            self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    with open(SAMPLE_CSV, "rb") as file:
+        ExportHandler.body = file.read()
+    ExportHandler.requests_seen = []
+    ExportHandler.cut_after = None
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ExportHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server):
+    driver = FakeDriver([{"name": "sessao", "value": "abc", "domain": "127.0.0.1", "path": "/"}])
+    session = session_from_driver(driver, pool_size=4)
+    yield ExportClient(session, f"http://127.0.0.1:{server.server_port}/")
+    session.close()
+
+
+class TestSessionFromDriver:
+    """Cópia da sessão do navegador para o requests.Session."""
+
+    def test_copies_cookies_user_agent_and_token(self):
+        driver = FakeDriver([{"name": "sessao", "value": "abc", "domain": ".aditum.com.br", "path": "/"}],
+                            token="jwt")
+
+        session = session_from_driver(driver, headers={"Accept": "text/csv"}, auth_storage_key="token")
+
+        assert session.cookies.get("sessao", domain=".aditum.com.br") == "abc"
+        assert session.headers["User-Agent"] == "Navegador de teste"
+        assert session.headers["Authorization"] == "Bearer jwt"
+        assert session.headers["Accept"] == "text/csv"
+        assert driver.scripts[0][1] == ("token",)
+        assert session.get_adapter("https://x").poolmanager.connection_pool_kw["maxsize"] == 8
+
+    def test_without_token(self):
+        session = session_from_driver(FakeDriver([]))
+
+        assert "Authorization" not in session.headers
+
+
+class TestExportClient:
+    """Download com validação em stream, em série e em paralelo."""
+
+    def test_download_validates_and_saves_file(self, server, client, tmp_path):
+        download = client.download(date(2025, 11, 20), date(2025, 11, 27), str(tmp_path), make_rules(),
+                                   params={"status": "Pago"})
+
+        path, query, headers = ExportHandler.requests_seen[0]
+        assert path == EXPORT_PATH
+        assert query == {"startDate": ["2025-11-20"], "endDate": ["2025-11-27"], "status": ["Pago"]}
+        assert headers["User-Agent"] == "Navegador de teste"
+
+        assert download.passed
+        assert download.row_count == 410
+        assert download.bytes_received == len(ExportHandler.body)
+        assert download.file_path == str(tmp_path / "TRANSAÇÕES_2025-11-20_2025-11-27.csv")
+        assert os.listdir(tmp_path) == ["TRANSAÇÕES_2025-11-20_2025-11-27.csv"]
+        assert download.results == CSVValidator(download.file_path).validate_rules(make_rules())
+
+    def test_download_without_directory_only_validates(self, server, client):
+        download = client.download(date(2025, 11, 20), date(2025, 11, 27), rules=make_rules())
+
+        assert download.file_path is None
+        assert download.row_count == 410
+
+    def test_fail_fast_on_bad_header(self, server, client, tmp_path):
+        ExportHandler.body = b"Coluna;Outra\n" + b"x;y\n" * 50000
+
+        download = client.download(date(2025, 11, 20), date(2025, 11, 20), str(tmp_path), make_rules())
+
+        assert not download.passed
+        assert download.file_path is None
+        assert download.bytes_received < len(ExportHandler.body)
+        assert os.listdir(tmp_path) == []
+
+    def test_interrupted_download_removes_partial_file(self, server, client, tmp_path):
+        ExportHandler.cut_after = 20000
+
+        with pytest.raises(requests.RequestException):
+            client.download(date(2025, 11, 20), date(2025, 11, 27), str(tmp_path), make_rules())
+        assert os.listdir(tmp_path) == []
+
+    def test_expired_session_raises(self, server, tmp_path):
+        client = ExportClient(session_from_driver(FakeDriver([])), f"http://127.0.0.1:{server.server_port}")
+
+        with pytest.raises(requests.HTTPError):
+            client.download(date(2025, 11, 20), date(2025, 11, 27), str(tmp_path))
+        assert os.listdir(tmp_path) == []
+
+    def test_download_many_keeps_range_order(self, server, client, tmp_path):
+        ranges = split_date_range(date(2025, 11, 20), date(2025, 11, 27), days=3)
+
+        downloads = client.download_many(ranges, str(tmp_path), rules_factory=make_rules, workers=3)
+
+        assert [(item.start, item.end) for item in downloads] == ranges
+        assert all(item.passed and item.row_count == 410 for item in downloads)
+        assert sorted(os.listdir(tmp_path)) == sorted(export_file_name(*period) for period in ranges)
+        assert len(ExportHandler.requests_seen) == 3
+
+
+class TestSplitDateRange:
+    """Divisão do período em períodos menores."""
+
+    def test_split(self):
+        assert split_date_range(date(2025, 11, 20), date(2025, 11, 27), 3) == [
+            (date(2025, 11, 20), date(2025, 11, 22)),
+            (date(2025, 11, 23), date(2025, 11, 25)),
+            (date(2025, 11, 26), date(2025, 11, 27)),
+        ]
+        assert split_date_range(date(2025, 11, 20), date(2025, 11, 20), 7) == [
+            (date(2025, 11, 20), date(2025, 11, 20)),
+        ]
+        assert split_date_range(date(2025, 11, 21), date(2025, 11, 20), 7) == []
+
+    def test_invalid_days(self):
+        with pytest.raises(ValueError):
+            split_date_range(date(2025, 11, 20), date(2025, 11, 27), 0)
@@ -0,0 +1,143 @@
+"""
+Testes unitários da conciliação tela x CSV (tests/utils/reconciliation.py).
+"""
+import csv
+import os
+import pytest
+from tests.utils.csv_validator import CSVValidator
+from tests.utils.reconciliation import reconcile, values_match
+
+SAMPLE_CSV = os.path.join(
+    os.path.dirname(__file__), "downloads", "TRANSAÇÕES_2025-11-20_2025-11-27.csv"
+)
+
+FIELDS = {"Status": "Status da cobranca", "Valor": "Valor total da cobrança", "Bandeira": "Bandeira"}
+
+
+def read_sample_rows():
+    with open(SAMPLE_CSV, encoding="iso-8859-1") as file:
+        return list(csv.DictReader(file, delimiter=";"))
+
+
+def ui_record(row, **changes):
+    """Monta um registro como a tela exibe (valor com R$)."""
+    record = {
+        "ID da cobrança": row["ID da cobranca"],
+        "Status": row["Status da cobranca"],
+        "Valor": f"R$ {row['Valor total da cobrança']}",
+        "Bandeira": row["Bandeira"],
+    }
+    record.update(changes)
+    return record
+
+
+class TestValuesMatch:
+    """Comparação de valores da tela com o CSV."""
+
+    @pytest.mark.parametrize("ui_value, csv_value, expected", [
+        ("Pendente", "Pendente", True),
+        (" Pendente ", "Pendente", True),
+        ("R$ 200,00", "200,00", True),
+        ("R$ 1.804,11", "1804,11", True),
+        ("R$ 200,00", "2,00", False),
+        ("Visa", "Elo", False),
+        ("", None, True),
+    ])
+    def test_values_match(self, ui_value, csv_value, expected):
+        assert values_match(ui_value, csv_value) is expected
+
+
+class TestReconcile:
+    """Hash join entre os registros da tela e as linhas do CSV."""
+
+    def setup_method(self):
+        self.rows = read_sample_rows()
+        seen = set()
+        self.unique_rows = []
+        for row in self.rows:
+            if row["ID da cobranca"] not in seen:
+                seen.add(row["ID da cobranca"])
+                self.unique_rows.append(row)
+
+    def test_first_page_matches_export(self):
+        # As linhas 15 a 19 da exportação são a mesma cobrança (boleto)
+        ui_records = [ui_record(row) for row in self.rows[:20]]
+
+        report = reconcile(ui_records, CSVValidator(SAMPLE_CSV, mode=CSVValidator.MODE_STREAMING).iter_rows(),
+                           fields=FIELDS)
+
+        assert report.passed, report.summary()
+        assert report.matched == 20
+        assert report.csv_rows == 410
+        assert report.missing_in_ui_count == 390
+
+    def test_reports_missing_extra_and_field_diffs(self):
+        first, second = self.unique_rows[0], self.unique_rows[1]
+        ui_records = [
+            ui_record(first, Status="Paga"),
+            ui_record(second),
+            {"ID da cobrança": "nao-existe", "Status": "Pendente"},
+        ]
+        csv_rows = [first, second, self.unique_rows[2]]
+
+        report = reconcile(ui_records, iter(csv_rows), fields=FIELDS, ui_is_subset=False)
+
+        assert not report.passed
+        assert report.missing_in_csv == ["nao-existe"]
+        assert report.missing_in_ui_samples == [(3, self.unique_rows[2]["ID da cobranca"])]
+        assert report.mismatched_rows == 1
+        diff = report.mismatches[0]
+        assert (diff.field, diff.ui_value, diff.csv_value, diff.row_number) == ("Status", "Paga", "Pendente", 1)
+
+    def test_extra_csv_rows_fail_when_ui_is_complete(self):
+        report = reconcile([ui_record(self.unique_rows[0])], iter(self.unique_rows[:2]),
+                           fields=FIELDS, ui_is_subset=False)
+
+        assert report.missing_in_ui_count == 1
+        assert not report.passed
+
+    def test_repeated_key_matches_occurrences_in_order(self):
+        row = self.unique_rows[0]
+
+        report = reconcile([ui_record(row), ui_record(row, Status="Paga")], iter([row, row, row]), fields=FIELDS)
+
+        assert report.matched == 2
+        assert report.mismatches[0].row_number == 2
+        assert report.duplicates_in_csv == [(3, row["ID da cobranca"])]
+
+    def test_repeated_csv_key_fails_when_ui_is_complete(self):
+        row = self.unique_rows[0]
+
+        report = reconcile([ui_record(row)], iter([row, row]), fields=FIELDS, ui_is_subset=False)
+
+        assert report.duplicates_in_csv == [(2, row["ID da cobranca"])]
+        assert not report.passed
+
+    def test_duplicates_counted_beyond_sample_limit(self):
+        row = self.unique_rows[0]
+
+        report = reconcile([ui_record(row)], iter([row] * 6), fields=FIELDS, limit=2)
+
+        assert report.duplicates_in_csv_count == 5
+        assert len(report.duplicates_in_csv) == 2
+        assert "5 repetidos no CSV" in report.summary()
+
+    def test_repeated_ui_key_missing_from_csv(self):
+        row = self.unique_rows[0]
+
+        report = reconcile([ui_record(row), ui_record(row)], iter([row]), fields=FIELDS)
+
+        assert report.missing_in_csv == [row["ID da cobranca"]]
+
+    def test_custom_comparator(self):
+        row = self.unique_rows[0]
+        ui_records = [ui_record(row, Bandeira=row["Bandeira"].upper())]
+
+        report = reconcile(ui_records, iter([row]), fields=FIELDS,
+                           comparators={"Bandeira": lambda ui, csv_value: ui.lower() == (csv_value or "").lower()})
+
+        assert report.passed
+
+    def test_record_without_key_raises(self):
+        with pytest.raises(ValueError):
+            reconcile([{"Status": "Pendente"}], iter([]), fields=FIELDS)
@@ -82,59 +82,56 @@ class TestTransactions:
         Cenário: Exportar relatório de transações deve baixar arquivo CSV válido.
         
         Este teste:
-        1. Limpa arquivos CSV antigos do diretório de download
-        2. Clica no botão "Exportar relatório"
-        3. Aguarda o download ser concluído
-        4. Valida a estrutura e conteúdo do CSV
+        1. Clica no botão "Exportar relatório" (download_dir é exclusivo do teste)
+        2. Aguarda o download ser concluído
+        3. Valida a estrutura, o conteúdo e os campos de cartão do CSV
         """
         # ARRANGE
         import os
-        import glob
         from tests.utils.csv_validator import CSVValidator
-        
-        # Limpa arquivos CSV antigos do diretório de download
-        # Isso garante que vamos pegar o arquivo correto
-        old_files = glob.glob(os.path.join(download_dir, "*.csv"))
-        for f in old_files:
-            try:
-                os.remove(f)
-            except:
-                pass # Ignora se não conseguir deletar
+        from tests.utils.csv_rules import HeadersRule, HasRowsRule, StatusEnumRule, DateFormatRule
+        from tests.utils.csv_cards import CardConsistencyRule
             
         # ACT
-        # Clica no botão de exportar relatório
-        self.transactions_page.click_export_report()
-        
-        # Aguarda o download ser concluído (timeout de 30 segundos)
-        downloaded_file = self.transactions_page.wait_for_download(download_dir, timeout=30)
+        # Clica no botão de exportar relatório (observando o diretório de download)
+        self.transactions_page.click_export_report(download_dir)
+        
+        # Aguarda o download (timeout de 30 segundos) validando headers, conteúdo,
+        # status, datas e campos de cartão enquanto o arquivo é baixado (bandeira
+        # x Bin só com CHECK_CARD_BRAND, em produção)
+        downloaded_file, (headers, has_rows, statuses, dates, cards) = self.transactions_page.wait_for_download_validated(
+            download_dir,
+            [HeadersRule(), HasRowsRule(), StatusEnumRule(), DateFormatRule("Data da cobranca"),
+             CardConsistencyRule(check_brand=self.config.CHECK_CARD_BRAND)],
+            timeout=30,
+        )
         
         #ASSERT - Validações
         
-        # 1. Verifica se o arquivo foi baixado
+        # 1. Header inválido encerra a espera nos primeiros bytes do download
+        assert headers.passed, f"CSV não contém todas as colunas esperadas: {headers.message}"
+        print("Headers validados com sucesso")
+
+        # 2. Verifica se o arquivo foi baixado
         assert os.path.exists(downloaded_file), f"Arquivo não foi baixado: {downloaded_file}"
         print(f"\n Arquivo baixado: {downloaded_file}")
          
-        # 2. Cria o validador de CSV
-        validator = CSVValidator(downloaded_file)
-         
-        # 3. Valida se o CSV tem todas as colunas esperadas
-        assert validator.validate_headers(), "CSV não contém todas as colunas esperadas"
-        print("Headers validados com sucesso")
+        # 3-6. Resultados das regras executadas durante o download
+        assert has_rows.passed, "CSV está vazio"
+        print(f"CSV contém {has_rows.checked_rows} linhas")
         
-        # 4. Valida se o CSV não está vazio
-        assert validator.validate_not_empty(), "CSV está vazio"
-        print(f"CSV contém {validator.get_row_count()} linhas")
-        
-        # 5. Valida se os valores de status são válidos
-        assert validator.validate_status_values(), "CSV contém status inválidos"
+        assert statuses.passed, f"CSV contém status inválidos: {statuses.samples}"
         print("Status validados com sucesso")
         
-        # 6. Valida se as datas estão no formato correto
-        assert validator.validate_date_format("Data da cobranca"), "Formato de data inválido"
+        assert dates.passed, f"Formato de data inválido: {dates.samples}"
         print("Formato de datas validado")
         
-        # 7. Exibe um resumo completo do CSV
-        summary = validator.get_summary()
+        # 7. Consistência de Bandeira, número mascarado e Bin
+        assert cards.passed, f"Campos de cartão inconsistentes: {cards.message}. Amostras: {cards.samples}"
+        print("Campos de cartão validados")
+        
+        # 8. Exibe um resumo completo do CSV
+        summary = CSVValidator(downloaded_file).get_summary()
         print(f"\n RESUMO DO CSV:")
         print(f"   - Total de linhas: {summary['total_rows']}")
         print(f"   - Total de colunas: {summary['total_columns']}")
@@ -159,19 +156,10 @@ class TestTransactions:
         # ARRANGE
         
         import os
-        import glob
         from tests.utils.csv_validator import CSVValidator
         
         # Define qual status será filtrado
         status_to_filter = "Pendente"
-        
-        # Limpa arquivos CSV antigos do diretório de download
-        old_files = glob.glob(os.path.join(download_dir, "*.csv"))
-        for f in old_files:
-            try:
-                os.remove(f)
-            except:
-                pass  # Ignora se não conseguir deletar
             
         # ACT
         
@@ -179,8 +167,8 @@ class TestTransactions:
         self.transactions_page.select_status_filter(status_to_filter)
         time.sleep(2) # Aguarda o filtro ser aplicado
         
-        # 2. Clica no botão de exportar relatório
-        self.transactions_page.click_export_report()
+        # 2. Clica no botão de exportar relatório (observando o diretório de download)
+        self.transactions_page.click_export_report(download_dir)
         
         # 3. Aguarda o download ser concluído
         downloaded_file = self.transactions_page.wait_for_download(download_dir, timeout=30)
@@ -196,4 +184,32 @@ class TestTransactions:
             f"CSV contém status diferentes de '{status_to_filter}'"
         
         # 3. Exibe mensagem de sucesso
-        print(f" Todos os {validator.get_row_count()} registros têm status '{status_to_filter}'")
\ No newline at end of file
+        print(f" Todos os {validator.get_row_count()} registros têm status '{status_to_filter}'")
+
+    @pytest.mark.regression
+    def test_table_should_match_exported_csv(self, download_dir):
+        """
+        Cenário: As transações exibidas na tabela devem estar na exportação com os mesmos valores.
+
+        Este teste:
+        1. Lê os registros visíveis na tabela
+        2. Exporta o relatório
+        3. Concilia a tabela com o CSV pelo ID da cobrança (campo a campo)
+        """
+        # ARRANGE
+        from tests.utils.csv_validator import CSVValidator
+        from tests.utils.reconciliation import reconcile
+
+        # ACT
+        ui_records = self.transactions_page.get_table_records()
+        self.transactions_page.click_export_report(download_dir)
+        downloaded_file = self.transactions_page.wait_for_download(download_dir, timeout=30)
+
+        # O CSV é percorrido em streaming; a tabela mostra só a primeira página,
+        # então linhas do CSV fora da tela não são falha
+        report = reconcile(ui_records, CSVValidator(downloaded_file).iter_rows(), ui_is_subset=True)
+
+        # ASSERT
+        assert_list_not_empty(ui_records, "Nenhuma transação encontrada na tabela.")
+        assert report.passed, f"Tabela e CSV divergem: {report.summary()}"
+        print(f"\n Conciliação: {report.summary()}")
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Testes unitários da leitura da tabela da tela (tests/utils/ui_table.py).
+"""
+import threading
+import time
+import pytest
+from tests.utils.csv_schema import INTEGER, MONEY
+from tests.utils.ui_table import (
+    READ_PAGE_SCRIPT,
+    READ_TABLE_SCRIPT,
+    convert_value,
+    crawl_parallel,
+    parse_page_info,
+    pick_page_link,
+    read_page,
+    read_table,
+    split_pages,
+    type_records,
+)
+
+
+class FakeDriver:
+    """WebDriver falso que registra as chamadas execute_script."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.result
+
+
+RECORDS = [
+    {"Data": "21/11/2025 12:25:38", "Status": "Pendente", "Valor": "R$ 200,00", "Parcelas": "1"},
+    {"Data": "", "Status": "Paga", "Valor": "R$ 1.804,11", "Parcelas": "-"},
+]
+
+
+class TestReadTable:
+    """Leitura da tabela com uma única chamada ao WebDriver."""
+
+    def test_single_execute_script_call(self):
+        driver = FakeDriver(RECORDS)
+
+        records = read_table(driver, "table.adt_table", "table.adt_table tbody tr")
+
+        assert records == RECORDS
+        assert driver.calls == [(READ_TABLE_SCRIPT, ("table.adt_table", "table.adt_table tbody tr", "td[data-title]"))]
+
+    def test_missing_table_returns_none(self):
+        assert read_table(FakeDriver(None), "table", "table tr") is None
+
+
+class TestTypeRecords:
+    """Conversão dos textos da tela para tipos."""
+
+    def test_default_column_types(self):
+        assert type_records(RECORDS) == [
+            {"Data": 1763727938, "Status": "Pendente", "Valor": 20000, "Parcelas": 1},
+            {"Data": None, "Status": "Paga", "Valor": 180411, "Parcelas": None},
+        ]
+
+    def test_custom_column_types(self):
+        typed = type_records([{"Total": " 50,00 ", "Valor": "R$ 1,00"}], {"Total": MONEY})
+
+        assert typed == [{"Total": 5000, "Valor": "R$ 1,00"}]
+
+    def test_convert_value(self):
+        assert convert_value("12", INTEGER) == 12
+        assert convert_value(None, MONEY) is None
+        assert convert_value("Pendente") == "Pendente"
+
+
+class TestPagination:
+    """Paginação da listagem: texto da paginação, faixas de páginas e leitura em paralelo."""
+
+    def test_read_page_single_call(self):
+        driver = FakeDriver(["Página 2 / 47", RECORDS])
+
+        assert read_page(driver, "table", "table tr", "td", ".info") == ("Página 2 / 47", RECORDS)
+        assert driver.calls == [(READ_PAGE_SCRIPT, ("table", "table tr", "td", ".info"))]
+
+    @pytest.mark.parametrize("text, expected", [
+        ("Página 1 / 47", (1, 47)),
+        ("  Pagina 12/12 ", (12, 12)),
+        ("Página 3 de 5", (3, 5)),
+    ])
+    def test_parse_page_info(self, text, expected):
+        assert parse_page_info(text) == expected
+
+    def test_parse_page_info_invalid(self):
+        with pytest.raises(ValueError, match="Página N / M"):
+            parse_page_info("Carregando...")
+
+    def test_split_pages(self):
+        assert split_pages(47, 4) == [(1, 12), (13, 24), (25, 36), (37, 47)]
+        assert split_pages(2, 5) == [(1, 1), (2, 2)]
+        assert split_pages(5, 1) == [(1, 5)]
+
+    def test_crawl_parallel_keeps_page_order(self):
+        # As três faixas só passam da barreira se forem percorridas ao mesmo tempo
+        barrier = threading.Barrier(3, timeout=5)
+
+        def crawl_range(start, end):
+            barrier.wait()
+            time.sleep(0.05 if start == 1 else 0)  # A primeira faixa termina por último
+            return [f"registro {page}" for page in range(start, end + 1)]
+
+        records = list(crawl_parallel(crawl_range, total_pages=10, workers=3))
+
+        assert records == [f"registro {page}" for page in range(1, 11)]
+
+    @pytest.mark.parametrize("visible, current, target, expected", [
+        ([1, 2, 3, 4, 5, 47], 1, 4, 4),
+        ([1, 2, 3, 4, 5, 47], 1, 30, 5),
+        ([1, 28, 29, 30, 31, 32, 47], 28, 30, 30),
+        ([1, 45, 46, 47], 47, 10, 45),
+        ([1, 45, 46, 47], 47, 1, 1),
+        ([1, 45, 46, 47], 47, 46, 46),
+        ([5], 5, 9, None),
+        ([1, 2], 2, 2, None),
+    ])
+    def test_pick_page_link(self, visible, current, target, expected):
+        assert pick_page_link(visible, current, target) == expected
+
+    def test_crawl_parallel_streams_first_range(self):
+        # O primeiro registro sai antes de a última faixa terminar
+        last_range_may_finish = threading.Event()
+
+        def crawl_range(start, end):
+            if start > 1:
+                assert last_range_may_finish.wait(timeout=5)
+            for page in range(start, end + 1):
+                yield f"registro {page}"
+
+        records = crawl_parallel(crawl_range, total_pages=4, workers=2)
+
+        assert next(records) == "registro 1"
+        last_range_may_finish.set()
+        assert list(records) == ["registro 2", "registro 3", "registro 4"]
+
+    def test_crawl_parallel_raises_range_error_in_order(self):
+        def crawl_range(start, end):
+            if start > 1:
+                raise RuntimeError("sessão caiu")
+            yield from (f"registro {page}" for page in range(start, end + 1))
+
+        records = crawl_parallel(crawl_range, total_pages=4, workers=2)
+
+        assert [next(records), next(records)] == ["registro 1", "registro 2"]
+        with pytest.raises(RuntimeError, match="sessão caiu"):
+            next(records)
+
+    def test_crawl_parallel_close_stops_ranges(self):
+        closed = []
+
+        def crawl_range(start, end):
+            try:
+                for page in range(start, 1000):
+                    yield page
+            finally:
+                closed.append(start)
+
+        records = crawl_parallel(crawl_range, total_pages=10, workers=2, max_buffered=5)
+        assert next(records) == 1
+        records.close()
+
+        assert sorted(closed) == [1, 6]
@@ -0,0 +1,338 @@
+"""
+Benchmark da validação de exportações CSV (CSVValidator).
+
+Mede os métodos públicos do CSVValidator em exportações sintéticas de
+tamanhos crescentes (ver tests/data_generator/transaction_export_data.py):
+- rows_per_second: linhas por segundo no melhor de `repeat` execuções;
+- peak_rss_kb: pico de memória residente do processo (inclui a carga do arquivo);
+- peak_alloc_bytes: pico de memória alocada pelo método (tracemalloc);
+- allocated_blocks: blocos de memória que continuam alocados após o método.
+
+Cada caso (método, modo, tamanho) roda em um processo novo, para que o pico
+de RSS de um caso não contamine o seguinte. A preparação (criar o validador e,
+nos modos memory/columnar, carregar o arquivo) não entra no tempo medido,
+exceto no read_csv, que mede a própria carga: read_csv no modo memory,
+load_table no modo columnar e uma passada por iter_rows no modo streaming.
+
+Os resultados são gravados em JSON. Comparando com um JSON de referência
+(--baseline), o comando retorna 1 se algum caso ficou mais lento ou mais
+pesado que a tolerância, para o CI sinalizar a regressão.
+
+Uso básico:
+    python -m tests.utils.csv_benchmark --sizes 10000 100000 --output benchmark.json
+    python -m tests.utils.csv_benchmark --output atual.json --baseline benchmark.json
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from tests.data_generator.transaction_export_data import TransactionExportGenerator
+from tests.utils.csv_validator import CSVValidator
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, o pico de RSS não é medido
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_MODES = (CSVValidator.MODE_MEMORY,)
+DEFAULT_SEED = 42
+DEFAULT_TOLERANCE = 0.25
+# Casos mais rápidos que isso variam demais entre execuções para comparar o tempo
+MIN_COMPARED_SECONDS = 0.01
+# Variação absoluta aceita no pico alocado (métodos que quase não alocam)
+ALLOC_SLACK_BYTES = 64 * 1024
+
+
+def _load(validator: CSVValidator):
+    """Carrega o arquivo da forma usada pelo modo do validador."""
+    if validator.mode == CSVValidator.MODE_MEMORY:
+        validator.read_csv()
+    elif validator.mode == CSVValidator.MODE_COLUMNAR:
+        validator.load_table()
+    else:
+        deque(validator.iter_rows(), maxlen=0)
+
+
+# Método -> função executada no validador (os nomes são os dos métodos do CSVValidator)
+BENCHMARKS: Dict[str, Callable[[CSVValidator], Any]] = {
+    "read_csv": _load,
+    "validate_headers": lambda validator: validator.validate_headers(),
+    "validate_status_values": lambda validator: validator.validate_status_values(),
+    "validate_date_format": lambda validator: validator.validate_date_format("Data da cobranca"),
+    "get_column_values": lambda validator: validator.get_column_values("Status da cobranca"),
+    "get_summary": lambda validator: validator.get_summary(),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Medição de um método em um modo e tamanho de arquivo.
+
+    Atributos:
+        method: Nome do método (chave de BENCHMARKS)
+        mode: Modo de leitura do CSVValidator
+        rows: Linhas do arquivo
+        seconds: Melhor tempo entre as repetições
+        rows_per_second: rows / seconds
+        peak_rss_kb: Pico de memória residente do processo do caso (None se indisponível)
+        peak_alloc_bytes: Pico de memória alocada durante o método (tracemalloc)
+        allocated_blocks: Blocos de memória que continuam alocados após o método
+    """
+    method: str
+    mode: str
+    rows: int
+    seconds: float
+    rows_per_second: float
+    peak_rss_kb: Optional[int]
+    peak_alloc_bytes: int
+    allocated_blocks: int
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return self.method, self.mode, self.rows
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS informa em bytes
+
+
+def _prepared_validator(file_path: str, method: str, mode: str) -> CSVValidator:
+    validator = CSVValidator(file_path, mode=mode)
+    if method != "read_csv":
+        _load(validator)
+    return validator
+
+
+def run_case(file_path: str, method: str, mode: str, rows: int, repeat: int = 3) -> BenchmarkResult:
+    """
+    Mede um método em um arquivo.
+
+    O tempo é o melhor de `repeat` execuções, cada uma em um validador novo.
+    Depois, uma execução extra com tracemalloc mede as alocações (o tracemalloc
+    deixa o código mais lento, então não entra no tempo).
+
+    Returns:
+        BenchmarkResult do caso
+
+    Raises:
+        KeyError: Se o método não estiver em BENCHMARKS
+    """
+    benchmark = BENCHMARKS[method]
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        validator = _prepared_validator(file_path, method, mode)
+        started = time.perf_counter()
+        benchmark(validator)
+        best = min(best, time.perf_counter() - started)
+        del validator
+
+    validator = _prepared_validator(file_path, method, mode)
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = benchmark(validator)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    allocated_blocks = sys.getallocatedblocks() - blocks_before
+    del result
+
+    return BenchmarkResult(
+        method=method,
+        mode=mode,
+        rows=rows,
+        seconds=round(best, 6),
+        rows_per_second=round(rows / best, 1) if best else 0.0,
+        peak_rss_kb=_peak_rss_kb(),
+        peak_alloc_bytes=peak - baseline,
+        allocated_blocks=allocated_blocks,
+    )
+
+
+def _run_isolated(file_path: str, method: str, mode: str, rows: int, repeat: int) -> BenchmarkResult:
+    """Roda o caso em um processo novo (spawn), para medir o pico de RSS só do caso."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(run_case, file_path, method, mode, rows, repeat).result()
+
+
+def generate_exports(sizes: Sequence[int], directory: str, seed: int = DEFAULT_SEED) -> Dict[int, str]:
+    """
+    Gera (ou reaproveita) uma exportação sintética para cada tamanho.
+
+    Os arquivos ficam em <directory>/<linhas>_seed<seed>/ com o nome da exportação da tela,
+    então gerações com o mesmo seed são reaproveitadas entre execuções.
+
+    Returns:
+        Dicionário {linhas: caminho do arquivo}
+    """
+    files = {}
+    for rows in sizes:
+        generator = TransactionExportGenerator(seed=seed)
+        file_path = os.path.join(directory, f"{rows}_seed{seed}", generator.file_name)
+        if not os.path.exists(file_path):
+            generator.write(file_path, rows)
+        files[rows] = file_path
+    return files
+
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES, methods: Optional[Sequence[str]] = None,
+                   modes: Sequence[str] = DEFAULT_MODES, repeat: int = 3, seed: int = DEFAULT_SEED,
+                   directory: Optional[str] = None, isolated: bool = True) -> List[BenchmarkResult]:
+    """
+    Mede os métodos em exportações sintéticas de cada tamanho.
+
+    Args:
+        sizes: Quantidades de linhas das exportações
+        methods: Métodos medidos (padrão: todos de BENCHMARKS)
+        modes: Modos de leitura do CSVValidator
+        repeat: Execuções por caso (vale o melhor tempo)
+        seed: Semente das exportações geradas
+        directory: Onde gravar as exportações (padrão: diretório temporário do sistema)
+        isolated: Se True, cada caso roda em um processo novo (pico de RSS por caso)
+
+    Returns:
+        Lista de BenchmarkResult na ordem tamanho, modo, método
+
+    Raises:
+        ValueError: Se algum método não estiver em BENCHMARKS
+    """
+    methods = list(methods or BENCHMARKS)
+    unknown = [method for method in methods if method not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Métodos sem benchmark: {unknown}. Use um de {list(BENCHMARKS)}")
+
+    directory = directory or os.path.join(tempfile.gettempdir(), "csv_benchmark")
+    files = generate_exports(sizes, directory, seed)
+    run = _run_isolated if isolated else run_case
+
+    results = []
+    for rows in sizes:
+        for mode in modes:
+            for method in methods:
+                result = run(files[rows], method, mode, rows, repeat)
+                logger.info(f"{method} [{mode}] {rows} linhas: {result.rows_per_second:.0f} linhas/s, "
+                            f"RSS {result.peak_rss_kb} KB, pico alocado {result.peak_alloc_bytes} bytes")
+                results.append(result)
+    return results
+
+
+def save_results(results: Sequence[BenchmarkResult], file_path: str, seed: int = DEFAULT_SEED) -> str:
+    """
+    Grava os resultados em JSON, com a versão do Python e a máquina da medição.
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    payload = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": [asdict(result) for result in results],
+    }
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(payload, file, indent=2, ensure_ascii=False)
+    return file_path
+
+
+def load_results(file_path: str) -> List[BenchmarkResult]:
+    """Lê os resultados gravados por save_results."""
+    with open(file_path, encoding="utf-8") as file:
+        return [BenchmarkResult(**item) for item in json.load(file)["results"]]
+
+
+def compare_results(results: Sequence[BenchmarkResult], baseline: Sequence[BenchmarkResult],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compara os resultados com uma referência.
+
+    Um caso regrediu se ficou mais lento (linhas/s abaixo de 1 - tolerance da
+    referência) ou mais pesado (pico de RSS ou pico alocado acima de
+    1 + tolerance). O tempo só é comparado em casos que levaram pelo menos
+    MIN_COMPARED_SECONDS na referência, e o pico alocado aceita mais
+    ALLOC_SLACK_BYTES de variação. Casos sem correspondência na referência
+    são ignorados.
+
+    Returns:
+        Lista com a descrição de cada regressão (vazia = sem regressões)
+    """
+    reference = {result.key: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = reference.get(result.key)
+        if before is None:
+            continue
+        name = f"{result.method} [{result.mode}] {result.rows} linhas"
+        if (before.seconds >= MIN_COMPARED_SECONDS
+                and result.rows_per_second < before.rows_per_second * (1 - tolerance)):
+            regressions.append(f"{name}: {result.rows_per_second:.0f} linhas/s "
+                               f"(referência {before.rows_per_second:.0f})")
+        if result.peak_rss_kb and before.peak_rss_kb and result.peak_rss_kb > before.peak_rss_kb * (1 + tolerance):
+            regressions.append(f"{name}: pico de RSS {result.peak_rss_kb} KB (referência {before.peak_rss_kb} KB)")
+        if result.peak_alloc_bytes > before.peak_alloc_bytes * (1 + tolerance) + ALLOC_SLACK_BYTES:
+            regressions.append(f"{name}: pico alocado {result.peak_alloc_bytes} bytes "
+                               f"(referência {before.peak_alloc_bytes} bytes)")
+    return regressions
+
+
+def format_table(results: Sequence[BenchmarkResult]) -> str:
+    """Tabela de texto com os resultados (uma linha por caso)."""
+    lines = [f"{'método':24} {'modo':10} {'linhas':>10} {'linhas/s':>12} {'RSS (KB)':>10} {'pico alocado':>14}"]
+    for result in results:
+        lines.append(f"{result.method:24} {result.mode:10} {result.rows:>10} {result.rows_per_second:>12.0f} "
+                     f"{result.peak_rss_kb or '-':>10} {result.peak_alloc_bytes:>14}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Roda o benchmark pela linha de comando. Retorna 1 se houver regressão em relação ao --baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark da validação de exportações CSV.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Linhas das exportações")
+    parser.add_argument("--methods", nargs="+", default=None, choices=list(BENCHMARKS), help="Métodos medidos")
+    parser.add_argument("--modes", nargs="+", default=list(DEFAULT_MODES), choices=list(CSVValidator.MODES),
+                        help="Modos de leitura")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por caso (vale o melhor tempo)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semente das exportações")
+    parser.add_argument("--data-dir", default=None, help="Diretório das exportações geradas")
+    parser.add_argument("--output", default="csv_benchmark.json", help="Arquivo JSON com os resultados")
+    parser.add_argument("--baseline", default=None, help="JSON de referência para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Variação aceita (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = run_benchmarks(args.sizes, args.methods, args.modes, args.repeat, args.seed, args.data_dir)
+    save_results(results, args.output, args.seed)
+    print(format_table(results))
+    print(f"Resultados gravados em {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            return 1
+        print("Sem regressões em relação à referência")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+"""
+Cache em disco das exportações CSV já carregadas no formato colunar.
+
+Vários testes e scripts abrem o mesmo arquivo de tests/downloads. Em vez de
+ler e decodificar o CSV de novo, a ColumnarTable já montada é gravada em um
+arquivo binário (pickle) no diretório de cache. A segunda abertura só carrega
+os arrays de códigos e as listas de valores distintos.
+
+Cada entrada guarda a chave do arquivo de origem:
+- caminho absoluto e colunas carregadas (projeção, ver csv_projection.py)
+- tamanho e data de modificação (mtime em ns)
+- hash de conteúdo por amostragem (início, meio e fim do arquivo)
+
+Se o arquivo mudar, a chave não bate e a entrada é descartada. O tamanho total
+do cache é limitado (max_bytes) e as entradas usadas há mais tempo são removidas
+primeiro (LRU, usando o mtime da entrada, atualizado a cada leitura).
+
+Uso básico:
+    validator = CSVValidator("arquivo.csv", mode=CSVValidator.MODE_COLUMNAR, cache=True)
+"""
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+from tests.utils.csv_columnar import ColumnarTable
+
+logger = logging.getLogger(__name__)
+
+# Diretório padrão do cache (pode ser trocado pela variável de ambiente CSV_CACHE_DIR)
+DEFAULT_CACHE_DIR = os.getenv("CSV_CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".csv_cache"))
+DEFAULT_MAX_BYTES = int(os.getenv("CSV_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Trocar a versão invalida todas as entradas (ex: mudança na ColumnarTable)
+CACHE_VERSION = 2
+_MAGIC = b"CSVCACHE"
+_SAMPLE_SIZE = 64 * 1024
+
+
+def content_hash(file_path: str) -> str:
+    """
+    Hash do conteúdo por amostragem: tamanho + blocos do início, meio e fim do arquivo.
+
+    Evita ler exportações de vários GB inteiras a cada abertura. Junto com o
+    tamanho e o mtime detecta tanto alterações normais quanto arquivos
+    regravados com a mesma data.
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(file_path, 'rb') as file:
+        for position in (0, max(0, size // 2 - _SAMPLE_SIZE // 2), max(0, size - _SAMPLE_SIZE)):
+            file.seek(position)
+            digest.update(file.read(_SAMPLE_SIZE))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Cache em disco de ColumnarTable, com invalidação automática e limite de tamanho.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        """
+        Args:
+            cache_dir: Diretório das entradas (padrão: DEFAULT_CACHE_DIR)
+            max_bytes: Tamanho máximo do cache em bytes (padrão: DEFAULT_MAX_BYTES)
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+
+    def _entry_path(self, file_path: str, columns: Optional[Sequence[str]] = None) -> Path:
+        source = os.path.abspath(file_path)
+        if columns is not None:
+            source += "\0" + "\0".join(columns)  # Cada projeção tem a sua entrada
+        name = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{name}.bin"
+
+    @staticmethod
+    def _key(file_path: str, encoding: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        stat = os.stat(file_path)
+        return {
+            "version": CACHE_VERSION,
+            "path": os.path.abspath(file_path),
+            "columns": None if columns is None else list(columns),
+            "encoding": encoding,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": content_hash(file_path),
+        }
+
+    def load(self, file_path: str, encoding: str = 'iso-8859-1',
+             columns: Optional[Sequence[str]] = None) -> Optional[ColumnarTable]:
+        """
+        Carrega a tabela do cache.
+
+        Args:
+            file_path: Caminho do CSV de origem
+            encoding: Encoding do CSV
+            columns: Colunas carregadas na tabela (None = todas)
+
+        Returns:
+            ColumnarTable, ou None se não houver entrada válida para o arquivo
+        """
+        entry = self._entry_path(file_path, columns)
+        if not entry.exists():
+            return None
+
+        try:
+            with open(entry, 'rb') as file:
+                if file.read(len(_MAGIC)) != _MAGIC:
+                    raise ValueError("Arquivo de cache inválido")
+                key = pickle.load(file)
+                if key != self._key(file_path, encoding, columns):
+                    logger.info(f"Cache desatualizado para {file_path}, descartando")
+                    file.close()
+                    entry.unlink(missing_ok=True)
+                    return None
+                table = pickle.load(file)
+        except Exception as e:
+            logger.warning(f"Erro ao ler cache de {file_path}: {str(e)}")
+            entry.unlink(missing_ok=True)
+            return None
+
+        # Marca a entrada como usada agora (LRU)
+        os.utime(entry)
+        logger.info(f"CSV carregado do cache: {file_path} ({len(table)} linhas)")
+        return table
+
+    def store(self, file_path: str, table: ColumnarTable, encoding: str = 'iso-8859-1',
+              columns: Optional[Sequence[str]] = None):
+        """
+        Grava a tabela no cache e remove as entradas mais antigas se passar do limite.
+
+        columns deve ser a mesma projeção usada para montar a tabela (None = todas as colunas).
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(file_path, columns)
+        temp = entry.with_suffix(f".tmp{os.getpid()}")
+
+        try:
+            with open(temp, 'wb') as file:
+                file.write(_MAGIC)
+                pickle.dump(self._key(file_path, encoding, columns), file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(table, file, protocol=pickle.HIGHEST_PROTOCOL)
+            # Troca atômica: leitores nunca veem uma entrada pela metade
+            os.replace(temp, entry)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o cache de {file_path}: {str(e)}")
+            temp.unlink(missing_ok=True)
+            return
+
+        logger.info(f"CSV gravado no cache: {entry}")
+        self._evict()
+
+    def _evict(self):
+        """Remove as entradas usadas há mais tempo até o cache caber em max_bytes."""
+        entries = []
+        for entry in self.cache_dir.glob("*.bin"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Entrada removida do cache (LRU): {entry}")
+
+    def clear(self):
+        """Remove todas as entradas do cache."""
+        for entry in self.cache_dir.glob("*.bin"):
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,222 @@
+"""
+Consistência dos campos de cartão da exportação ("Bandeira", "Numero do cartao" e "Bin").
+
+Verificações:
+- mascara: o número segue a máscara PCI DSS, com no máximo o BIN (6 ou 8
+  primeiros dígitos) e os 4 últimos visíveis, ex: 516292******0175 (13 a 19
+  caracteres);
+- bin: o Bin tem 6 ou 8 dígitos e é o início do número mascarado;
+- bandeira: o Bin está em uma faixa da bandeira informada (BRAND_RANGES).
+  Bandeiras fora de BRAND_RANGES não são verificadas. Desligada por padrão:
+  o sandbox usa cartões de teste com Bin de outra bandeira (ex: Elo e Visa
+  com 520132, 515590 e 542685), então só deve ser ligada (check_brand=True)
+  para dados de produção;
+- incompleto: alguns dos três campos estão preenchidos e outros não
+  (linhas sem nenhum dos três, ex: boleto, são ignoradas).
+
+Os três campos se repetem muito (poucos cartões por exportação), então a
+verificação é feita por combinação distinta: as combinações são contadas em
+uma única passada (Counter sobre itemgetter, ou pelos códigos no modo
+columnar) e cada uma é verificada uma vez. As linhas de exemplo só são
+procuradas quando há falha.
+
+Uso básico:
+    result = CSVValidator("arquivo.csv").validate_cards()
+    result = CSVValidator("arquivo.csv").validate_cards(check_brand=True)  # produção
+    result = CSVValidator("arquivo.csv").validate_rules([CardConsistencyRule(), HasRowsRule()])
+"""
+from collections import Counter
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from tests.utils.csv_rules import Rule
+
+BRAND_COLUMN = "Bandeira"
+NUMBER_COLUMN = "Numero do cartao"
+BIN_COLUMN = "Bin"
+CARD_COLUMNS = (BRAND_COLUMN, NUMBER_COLUMN, BIN_COLUMN)
+
+# Nomes das verificações (chaves de details["failures_by_check"])
+MASK = "mascara"
+BIN = "bin"
+BRAND = "bandeira"
+INCOMPLETE = "incompleto"
+
+# Faixas de BIN por bandeira, como (início, fim) comparados com os primeiros
+# dígitos do Bin (mesma quantidade de dígitos do início da faixa)
+BRAND_RANGES: Dict[str, List[Tuple[str, str]]] = {
+    "Visa": [("4", "4")],
+    "MasterCard": [("51", "55"), ("2221", "2720")],
+    "Amex": [("34", "34"), ("37", "37")],
+    "Elo": [
+        ("401178", "401179"), ("431274", "431274"), ("438935", "438935"), ("451416", "451416"),
+        ("457393", "457393"), ("457631", "457632"), ("504175", "504175"), ("506699", "506778"),
+        ("509000", "509999"), ("627780", "627780"), ("636297", "636297"), ("636368", "636368"),
+        ("650031", "650033"), ("650035", "650051"), ("650405", "650439"), ("650485", "650538"),
+        ("650541", "650598"), ("650700", "650718"), ("650720", "650727"), ("650901", "650978"),
+        ("651652", "651679"), ("655000", "655019"), ("655021", "655058"),
+    ],
+    "Hipercard": [("606282", "606282"), ("384100", "384100"), ("384140", "384140"), ("384160", "384160")],
+    "Diners": [("300", "305"), ("36", "36"), ("38", "39")],
+    "Discover": [("6011", "6011"), ("644", "649"), ("65", "65")],
+    "JCB": [("3528", "3589")],
+}
+
+_MASK_PATTERN = re.compile(r"(?:\d{6}|\d{8})\*+\d{4}")
+_BIN_PATTERN = re.compile(r"\d{6}|\d{8}")
+
+# Quantidade máxima de combinações com resultado guardado (check_row)
+CACHE_SIZE = 4096
+
+
+def brands_for_bin(bin_value: str) -> List[str]:
+    """
+    Bandeiras cuja faixa contém o Bin, considerando só a faixa mais específica.
+
+    Faixas mais longas têm prioridade (ex: 438935 é Elo, não Visa; 650031 é
+    Elo, não Discover).
+
+    Returns:
+        Bandeiras da faixa mais específica (vazio se nenhuma faixa contém o Bin)
+    """
+    best_length = 0
+    brands: List[str] = []
+    for brand, ranges in BRAND_RANGES.items():
+        for start, end in ranges:
+            length = len(start)
+            if length < best_length or not start <= bin_value[:length] <= end:
+                continue
+            if length > best_length:
+                best_length, brands = length, []
+            if brand not in brands:
+                brands.append(brand)
+    return brands
+
+
+def card_issues(brand: Optional[str], number: Optional[str], bin_value: Optional[str],
+                check_brand: bool = False) -> Optional[Tuple[str, ...]]:
+    """
+    Verifica uma combinação de Bandeira, número mascarado e Bin.
+
+    Args:
+        brand: Valor de "Bandeira"
+        number: Valor de "Numero do cartao"
+        bin_value: Valor de "Bin"
+        check_brand: Verifica se o Bin pertence à bandeira (só para dados de produção)
+
+    Returns:
+        None se os três campos estiverem vazios (linha sem cartão), senão a
+        tupla das verificações que falharam (vazia se a combinação é consistente)
+    """
+    if not (brand or number or bin_value):
+        return None
+    if not (brand and number and bin_value):
+        return (INCOMPLETE,)
+
+    issues = []
+    if not 13 <= len(number) <= 19 or _MASK_PATTERN.fullmatch(number) is None:
+        issues.append(MASK)
+    valid_bin = _BIN_PATTERN.fullmatch(bin_value) is not None
+    if not valid_bin or not number.startswith(bin_value):
+        issues.append(BIN)
+    if check_brand and valid_bin and brand in BRAND_RANGES and brand not in brands_for_bin(bin_value):
+        issues.append(BRAND)
+    return tuple(issues)
+
+
+class CardConsistencyRule(Rule):
+    """
+    Valida a consistência de "Bandeira", "Numero do cartao" e "Bin".
+
+    As amostras trazem (linha, {coluna: valor, "falhas": [verificações]}) e
+    details["failures_by_check"] a quantidade de linhas por verificação.
+    checked_rows conta só as linhas com algum campo de cartão preenchido.
+
+    Além do check_row usado pelo motor de regras, aceita as contagens das
+    combinações (check_counts), onde cada combinação distinta é verificada
+    uma única vez.
+    """
+    name = "cards"
+
+    def __init__(self, check_brand: bool = False):
+        """
+        Args:
+            check_brand: Verifica se o Bin pertence à faixa da bandeira (só para
+                         dados de produção; o sandbox usa Bins de outra bandeira)
+        """
+        super().__init__()
+        self.check_brand = check_brand
+        self.failures_by_check = Counter()
+        self._issues: Dict[Tuple, Optional[Tuple[str, ...]]] = {}
+
+    def check_headers(self, headers):
+        missing = [column for column in CARD_COLUMNS if column not in headers]
+        if missing:
+            self.error = f"Colunas de cartão não encontradas no CSV: {missing}"
+
+    def _lookup(self, values: Tuple) -> Optional[Tuple[str, ...]]:
+        """Resultado de card_issues para a combinação, guardando os já calculados."""
+        try:
+            return self._issues[values]
+        except KeyError:
+            issues = card_issues(*values, check_brand=self.check_brand)
+            if len(self._issues) >= CACHE_SIZE:
+                self._issues.clear()
+            self._issues[values] = issues
+            return issues
+
+    def _sample(self, values: Tuple, issues: Tuple[str, ...]) -> Dict[str, Any]:
+        sample: Dict[str, Any] = dict(zip(CARD_COLUMNS, values))
+        sample["falhas"] = list(issues)
+        return sample
+
+    def check_row(self, row_number, row):
+        values = (row.get(BRAND_COLUMN), row.get(NUMBER_COLUMN), row.get(BIN_COLUMN))
+        issues = self._lookup(values)
+        if issues is None:
+            return
+        self.checked_rows += 1
+        if issues:
+            self.failures_by_check.update(issues)
+            self._fail(row_number, self._sample(values, issues))
+
+    def check_counts(self, counts: Mapping[Tuple, int],
+                     rows: Optional[Callable[[], Iterable[Tuple]]] = None):
+        """
+        Verifica as combinações distintas a partir das contagens.
+
+        Args:
+            counts: {(Bandeira, número, Bin): quantidade de linhas}
+            rows: Função que devolve as combinações linha a linha, na ordem do
+                  arquivo; usada só se houver falha, para montar as amostras
+        """
+        bad = {}
+        for values, count in counts.items():
+            issues = self._lookup(values)
+            if issues is None:
+                continue
+            self.checked_rows += count
+            if issues:
+                bad[values] = issues
+                self.failed_rows += count
+                for issue in issues:
+                    self.failures_by_check[issue] += count
+
+        if bad and rows is not None:
+            for row_number, values in enumerate(rows(), start=1):
+                issues = bad.get(values)
+                if issues:
+                    self.samples.append((row_number, self._sample(values, issues)))
+                    if len(self.samples) >= self.max_samples:
+                        break
+
+    def merge(self, other, row_offset):
+        super().merge(other, row_offset)
+        self.failures_by_check.update(other.failures_by_check)
+
+    def _message(self):
+        if self.failed_rows:
+            return f"{self.failed_rows} linhas com cartão inconsistente. Verificações: {dict(self.failures_by_check)}"
+        return f"Campos de cartão consistentes em {self.checked_rows} linhas"
+
+    def _details(self):
+        return {"failures_by_check": dict(self.failures_by_check)}
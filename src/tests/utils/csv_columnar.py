@@ -0,0 +1,185 @@
+"""
+Representação colunar compacta de exportações CSV.
+
+Em vez de um dicionário por linha (que repete os nomes das 45 colunas em cada
+linha), cada coluna é guardada como:
+- categories: lista com os valores distintos da coluna (cada valor é guardado uma vez)
+- codes: array('I') com o índice do valor de cada linha em categories
+
+Colunas repetitivas como status, Bandeira, Adquirente e Nome da loja ficam com
+poucos valores distintos, então o custo por linha é de 4 bytes por coluna.
+Contagens por valor são feitas sobre os códigos, sem criar strings.
+"""
+from array import array
+from collections import Counter
+import csv
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from tests.utils.csv_compression import open_text
+from tests.utils.csv_projection import project_rows
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnView(Sequence):
+    """
+    Visão somente leitura de uma coluna da ColumnarTable (sem cópia dos dados).
+
+    Se comporta como uma lista de strings: suporta len(), índice, fatias e iteração.
+    """
+    __slots__ = ("name", "codes", "categories")
+
+    def __init__(self, name: str, codes: array, categories: List[Optional[str]]):
+        self.name = name
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.categories[code] for code in self.codes[index]]
+        return self.categories[self.codes[index]]
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return map(self.categories.__getitem__, self.codes)
+
+    def __repr__(self) -> str:
+        return f"ColumnView({self.name!r}, linhas={len(self)}, distintos={len(self.categories)})"
+
+    def value_counts(self) -> Counter:
+        """Retorna a contagem de cada valor distinto da coluna."""
+        categories = self.categories
+        return Counter({categories[code]: count for code, count in Counter(self.codes).items()})
+
+    def distinct(self) -> List[Optional[str]]:
+        """Retorna os valores distintos da coluna (na ordem em que apareceram)."""
+        return list(self.categories)
+
+
+class ColumnarTable:
+    """
+    Tabela colunar com os dados de uma exportação CSV.
+
+    Linhas com mais valores que o header não são truncadas em silêncio: os
+    valores excedentes ficam em extra_fields ({índice da linha: valores}) e
+    aparecem na chave None de row()/iter_rows(), como no csv.DictReader.
+
+    Uso básico:
+        table = ColumnarTable.from_csv("arquivo.csv")
+        statuses = table.column("Status da cobranca")  # ColumnView, sem cópia
+        statuses.value_counts()  # {'Pendente': 410}
+    """
+
+    def __init__(self, headers: Sequence[str]):
+        self.headers: List[str] = list(headers)
+        self._codes: Dict[str, array] = {name: array("I") for name in self.headers}
+        self._categories: Dict[str, List[Optional[str]]] = {name: [] for name in self.headers}
+        self._lookups: Optional[List[Dict[Optional[str], int]]] = [{} for _ in self.headers]
+        self._row_count = 0
+        self.extra_fields: Dict[int, List[str]] = {}  # Só linhas largas demais (raras)
+
+    @classmethod
+    def from_csv(cls, file_path: str, encoding: str = 'iso-8859-1',
+                 columns: Optional[Sequence[str]] = None) -> "ColumnarTable":
+        """
+        Lê o arquivo CSV (delimitador ';') direto para o formato colunar.
+
+        Args:
+            file_path: Caminho do arquivo CSV (.csv, .csv.gz ou .zip)
+            encoding: Encoding do arquivo (padrão: iso-8859-1)
+            columns: Colunas carregadas (padrão: todas). Colunas ausentes no arquivo são ignoradas.
+                     Com projeção, valores além do header não são registrados em extra_fields.
+
+        Returns:
+            ColumnarTable com todas as linhas do arquivo (headers = colunas carregadas)
+        """
+        with open_text(file_path, encoding) as file:
+            reader = csv.reader(file, delimiter=';')
+            headers = next(reader, [])
+            if columns is None:
+                table = cls(headers)
+                table.extend(reader)
+            else:
+                names, rows = project_rows(reader, headers, columns)
+                table = cls(names)
+                table.extend(rows)
+
+        table.freeze()
+        logger.info(f"CSV carregado em formato colunar. Total de linhas: {len(table)}")
+        return table
+
+    def extend(self, rows: Iterable[Sequence[str]]):
+        """
+        Adiciona linhas (listas de valores na ordem dos headers).
+
+        Linhas vazias são ignoradas, colunas faltando ficam como None e valores
+        além dos headers vão para extra_fields, assim como no csv.DictReader.
+        """
+        if self._lookups is None:
+            raise RuntimeError("A tabela já foi finalizada (freeze) e não aceita novas linhas")
+
+        width = len(self.headers)
+        columns = list(zip(
+            [self._codes[name] for name in self.headers],
+            [self._categories[name] for name in self.headers],
+            self._lookups,
+        ))
+        for row in rows:
+            if not row:
+                continue
+            if len(row) < width:
+                row = list(row) + [None] * (width - len(row))
+            elif len(row) > width:
+                self.extra_fields[self._row_count] = list(row[width:])
+            for value, (codes, categories, lookup) in zip(row, columns):
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(categories)
+                    categories.append(value)
+                codes.append(code)
+            self._row_count += 1
+
+    def freeze(self):
+        """Descarta os dicionários auxiliares usados durante a carga."""
+        self._lookups = None
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    @property
+    def wide_rows(self) -> int:
+        """Quantidade de linhas com mais valores que o header."""
+        return len(self.extra_fields)
+
+    def column(self, name: str) -> ColumnView:
+        """
+        Retorna a visão de uma coluna.
+
+        Raises:
+            ValueError: Se a coluna não existir
+        """
+        if name not in self._codes:
+            raise ValueError(f"Coluna '{name}' não encontrada no CSV")
+        return ColumnView(name, self._codes[name], self._categories[name])
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Monta o dicionário de uma linha (índice começando em 0)."""
+        row = {
+            name: self._categories[name][self._codes[name][index]]
+            for name in self.headers
+        }
+        if index in self.extra_fields:
+            row[None] = self.extra_fields[index]
+        return row
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Percorre as linhas como dicionários (montados sob demanda)."""
+        views = [self.column(name) for name in self.headers]
+        extra_fields = self.extra_fields
+        for index, values in enumerate(zip(*views)):
+            row = dict(zip(self.headers, values))
+            if extra_fields and index in extra_fields:
+                row[None] = extra_fields[index]
+            yield row
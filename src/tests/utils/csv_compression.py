@@ -0,0 +1,80 @@
+"""
+Leitura de exportações CSV compactadas (.csv.gz e .zip) sem descompactar em disco.
+
+As exportações arquivadas ficam compactadas. open_text abre o arquivo como
+texto com a descompactação feita aos poucos, conforme o parser lê: nenhum
+arquivo temporário é criado e a memória não depende do tamanho da exportação.
+Arquivos sem extensão de compactação são abertos normalmente.
+
+- .gz: gzip (ex: TRANSAÇÕES_2025-11-20_2025-11-27.csv.gz)
+- .zip: o arquivo deve ter um único CSV (ou um único arquivo)
+
+Recursos que dependem de posição em bytes no arquivo (faixas da validação
+paralela e leitura de linhas por mmap) não se aplicam a arquivos compactados;
+CSVValidator e validate_rules_parallel usam a leitura sequencial nesses casos.
+
+Uso básico:
+    with open_text("TRANSAÇÕES_2025-11-20_2025-11-27.csv.gz") as file:
+        reader = csv.DictReader(file, delimiter=';')
+"""
+import gzip
+import io
+import zipfile
+from typing import IO, Optional
+
+GZIP_SUFFIX = ".gz"
+ZIP_SUFFIX = ".zip"
+
+
+def is_compressed(file_path: str) -> bool:
+    """Indica se o arquivo é uma exportação compactada (pela extensão)."""
+    return str(file_path).lower().endswith((GZIP_SUFFIX, ZIP_SUFFIX))
+
+
+def zip_member(archive: zipfile.ZipFile) -> str:
+    """
+    Escolhe o CSV dentro do .zip.
+
+    Returns:
+        Nome do único arquivo .csv (ou do único arquivo, se não houver .csv)
+
+    Raises:
+        ValueError: Se o .zip não tiver arquivos ou tiver mais de um CSV
+    """
+    files = [info.filename for info in archive.infolist() if not info.is_dir()]
+    csv_files = [name for name in files if name.lower().endswith(".csv")]
+    candidates = csv_files or files
+    if len(candidates) != 1:
+        raise ValueError(f"O arquivo {archive.filename} deve ter um único CSV, encontrados: {candidates}")
+    return candidates[0]
+
+
+def open_text(file_path: str, encoding: str = 'iso-8859-1', newline: Optional[str] = None) -> IO[str]:
+    """
+    Abre a exportação para leitura como texto, descompactando sob demanda se necessário.
+
+    Args:
+        file_path: Caminho do .csv, .csv.gz ou .zip
+        encoding: Encoding do CSV (padrão: iso-8859-1)
+        newline: Mesmo parâmetro de open() (padrão: None)
+
+    Returns:
+        Arquivo de texto (usar com with)
+
+    Raises:
+        ValueError: Se o .zip não tiver exatamente um CSV
+    """
+    lower = str(file_path).lower()
+    if lower.endswith(GZIP_SUFFIX):
+        return gzip.open(file_path, 'rt', encoding=encoding, newline=newline)
+
+    if lower.endswith(ZIP_SUFFIX):
+        archive = zipfile.ZipFile(file_path)
+        try:
+            stream = archive.open(zip_member(archive))
+        finally:
+            # O membro aberto mantém o arquivo .zip aberto até ser fechado
+            archive.close()
+        return io.TextIOWrapper(stream, encoding=encoding, newline=newline)
+
+    return open(file_path, 'r', encoding=encoding, newline=newline)
@@ -0,0 +1,223 @@
+"""
+Validação e conversão de colunas de data em lote.
+
+As datas da exportação usam os formatos DD/MM/YYYY HH:MM:SS e DD/MM/YYYY.
+Em vez de chamar datetime.strptime (até duas vezes) por valor, este módulo usa
+uma única expressão regular compilada que aceita exatamente o que o strptime
+aceita nesses dois formatos, mais uma checagem aritmética do dia do mês.
+
+No modo columnar apenas os valores distintos da coluna são verificados e
+convertidos; o resultado é espalhado para as linhas pelos códigos.
+
+Também converte a coluna em um array('q') de timestamps (segundos desde
+01/01/1970, sem fuso) para checagens de intervalo, como "todas as linhas estão
+dentro do período do nome do arquivo".
+"""
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+from tests.utils.csv_values import is_column_view, is_empty
+
+# Valor usado no array de timestamps para células vazias ou inválidas
+MISSING_TIMESTAMP = -2 ** 63
+
+# Mesmas alternativas usadas pelo strptime para %d, %m, %Y, %H, %M e %S.
+# Segundos 60 e 61 são aceitos pelo strptime mas rejeitados pelo datetime.
+_DATE_PATTERN = re.compile(
+    r"(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])/(1[0-2]|0[1-9]|[1-9])/(\d\d\d\d)"
+    r"(?:\s+(2[0-3]|[0-1]\d|\d):([0-5]\d|\d):([0-5]\d|\d))?"
+)
+
+# Período no nome do arquivo exportado, ex: TRANSAÇÕES_2025-11-20_2025-11-27.csv
+_FILE_RANGE_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2})_(\d{4})-(\d{2})-(\d{2})")
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _days_from_civil(year: int, month: int, day: int) -> int:
+    """Número de dias desde 01/01/1970 (algoritmo de Howard Hinnant)."""
+    year -= month <= 2
+    era = (year if year >= 0 else year - 399) // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[int]:
+    """
+    Converte uma data da exportação em segundos desde 01/01/1970.
+
+    Args:
+        value: Data em DD/MM/YYYY HH:MM:SS ou DD/MM/YYYY
+
+    Returns:
+        Timestamp em segundos, ou None se o valor for vazio ou inválido
+    """
+    if not value:
+        return None
+    match = _DATE_PATTERN.fullmatch(value)
+    if match is None:
+        return None
+
+    day, month, year, hour, minute, second = match.groups()
+    day, month, year = int(day), int(month), int(year)
+    if year < 1:
+        return None
+    if day > 28 and day > _DAYS_IN_MONTH[month] + (month == 2 and _is_leap(year)):
+        return None
+
+    timestamp = _days_from_civil(year, month, day) * 86400
+    if hour is not None:
+        timestamp += int(hour) * 3600 + int(minute) * 60 + int(second)
+    return timestamp
+
+
+def is_valid_date(value: str) -> bool:
+    """Verifica se a data está em DD/MM/YYYY HH:MM:SS ou DD/MM/YYYY."""
+    return parse_timestamp(value) is not None
+
+
+@dataclass
+class DateCheckResult:
+    """
+    Resultado da validação de uma coluna de datas.
+
+    Atributos:
+        checked: Quantidade de valores não vazios verificados
+        invalid_count: Quantidade de valores inválidos (ou fora do intervalo)
+        samples: Primeiras falhas como (número da linha, valor); linha 1 = primeira linha de dados
+    """
+    checked: int = 0
+    invalid_count: int = 0
+    samples: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.invalid_count == 0
+
+
+def _check(values: Iterable[Optional[str]], is_bad, limit: int) -> DateCheckResult:
+    """
+    Aplica is_bad(valor) a todos os valores não vazios da coluna.
+
+    Para ColumnView, is_bad é chamado uma vez por valor distinto e as linhas
+    com falha são localizadas pelos códigos.
+    """
+    result = DateCheckResult()
+
+    if is_column_view(values):
+        bad_codes = set()
+        blank_codes = set()
+        for code, value in enumerate(values.categories):
+            if is_empty(value):
+                blank_codes.add(code)
+            elif is_bad(value):
+                bad_codes.add(code)
+
+        counts = Counter(values.codes)
+        result.checked = sum(n for code, n in counts.items() if code not in blank_codes)
+        result.invalid_count = sum(counts.get(code, 0) for code in bad_codes)
+
+        if bad_codes and limit:
+            for position, code in enumerate(values.codes):
+                if code in bad_codes:
+                    result.samples.append((position + 1, values.categories[code]))
+                    if len(result.samples) >= limit:
+                        break
+        return result
+
+    for position, value in enumerate(values, start=1):
+        if is_empty(value):
+            continue
+        result.checked += 1
+        if is_bad(value):
+            result.invalid_count += 1
+            if len(result.samples) < limit:
+                result.samples.append((position, value))
+    return result
+
+
+def validate_dates(values: Iterable[Optional[str]], limit: int = 5) -> DateCheckResult:
+    """
+    Valida uma coluna inteira de datas. Valores vazios são ignorados.
+
+    Args:
+        values: Valores da coluna (lista, gerador ou ColumnView)
+        limit: Quantidade máxima de amostras de valores inválidos
+
+    Returns:
+        DateCheckResult com o total de inválidos e as primeiras posições/valores
+    """
+    return _check(values, lambda value: parse_timestamp(value) is None, limit)
+
+
+def to_timestamps(values: Iterable[Optional[str]]) -> array:
+    """
+    Converte uma coluna de datas em um array('q') de timestamps.
+
+    Valores vazios ou inválidos viram MISSING_TIMESTAMP.
+
+    Args:
+        values: Valores da coluna (lista, gerador ou ColumnView)
+
+    Returns:
+        array('q') com um timestamp por linha
+    """
+    if is_column_view(values):
+        converted = [parse_timestamp(value) for value in values.categories]
+        converted = [MISSING_TIMESTAMP if ts is None else ts for ts in converted]
+        return array("q", map(converted.__getitem__, values.codes))
+
+    timestamps = array("q")
+    for value in values:
+        timestamp = parse_timestamp(value)
+        timestamps.append(MISSING_TIMESTAMP if timestamp is None else timestamp)
+    return timestamps
+
+
+def parse_file_date_range(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Extrai o período do nome do arquivo exportado.
+
+    Ex: TRANSAÇÕES_2025-11-20_2025-11-27.csv -> (20/11/2025 00:00:00, 27/11/2025 23:59:59)
+
+    Returns:
+        Tupla (início, fim) em timestamps (fim inclusivo), ou None se o nome não tiver período
+    """
+    match = _FILE_RANGE_PATTERN.search(os.path.basename(file_path))
+    if match is None:
+        return None
+    y1, m1, d1, y2, m2, d2 = (int(part) for part in match.groups())
+    start = _days_from_civil(y1, m1, d1) * 86400
+    end = _days_from_civil(y2, m2, d2) * 86400 + 86399
+    return start, end
+
+
+def check_date_range(values: Iterable[Optional[str]], start: int, end: int, limit: int = 5) -> DateCheckResult:
+    """
+    Verifica se todas as datas da coluna estão dentro do intervalo [start, end].
+
+    Datas inválidas também contam como falha. Valores vazios são ignorados.
+
+    Args:
+        values: Valores da coluna (lista, gerador ou ColumnView)
+        start: Início do intervalo (timestamp, inclusivo)
+        end: Fim do intervalo (timestamp, inclusivo)
+        limit: Quantidade máxima de amostras
+
+    Returns:
+        DateCheckResult com as datas fora do intervalo
+    """
+    def is_bad(value):
+        timestamp = parse_timestamp(value)
+        return timestamp is None or not start <= timestamp <= end
+
+    return _check(values, is_bad, limit)
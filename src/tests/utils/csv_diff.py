@@ -0,0 +1,392 @@
+"""
+Comparação entre duas exportações de transações (ex: antes e depois de um deploy).
+
+As exportações são ligadas pelo "ID da cobranca" com um sort-merge:
+1. Cada arquivo é lido em blocos de até max_rows linhas. Cada bloco é ordenado
+   pela chave e, se o arquivo não couber em um bloco, gravado em um arquivo
+   temporário (run).
+2. Os runs são intercalados com heapq.merge, gerando as linhas do arquivo
+   inteiro em ordem de chave sem carregá-lo em memória.
+3. As duas sequências ordenadas são percorridas juntas: chaves só no arquivo
+   novo são adicionadas, só no antigo são removidas, e nas duas são comparadas
+   coluna a coluna.
+
+A memória fica limitada a max_rows linhas por arquivo (mais um buffer por run),
+então exportações de vários GB podem ser comparadas. Chaves repetidas (ex:
+boleto exportado em várias linhas) são pareadas primeiro com as ocorrências
+iguais do outro arquivo e as restantes por ordem de ocorrência. As duas
+exportações podem estar compactadas (.csv.gz ou .zip, ver csv_compression.py).
+
+Uso básico:
+    diff = diff_exports("antes.csv", "depois.csv")
+    diff.added_count, diff.removed_count, diff.changed_count, diff.changed_fields
+
+Pela linha de comando:
+    python -m tests.utils.csv_diff antes.csv depois.csv
+"""
+import argparse
+from collections import Counter
+import csv
+from dataclasses import dataclass, field
+import heapq
+from itertools import groupby
+import logging
+from operator import itemgetter
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from tests.utils.csv_compression import open_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY = "ID da cobranca"
+DEFAULT_MAX_ROWS = 200_000
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+# Linha ordenada: (chave, número da linha no arquivo, valores)
+SortedRow = Tuple[str, int, List[str]]
+
+
+class SortedExport:
+    """
+    Linhas de uma exportação em ordem de chave, com ordenação externa se necessário.
+
+    Deve ser usado como context manager para remover os arquivos temporários.
+    """
+
+    def __init__(self, file_path: str, key: str = DEFAULT_KEY, encoding: str = 'iso-8859-1',
+                 max_rows: int = DEFAULT_MAX_ROWS, temp_dir: Optional[str] = None):
+        """
+        Args:
+            file_path: Caminho da exportação
+            key: Coluna usada como chave
+            encoding: Encoding do arquivo (padrão: iso-8859-1)
+            max_rows: Quantidade máxima de linhas em memória
+            temp_dir: Diretório dos runs temporários (padrão: diretório temporário do sistema)
+
+        Raises:
+            ValueError: Se a coluna chave não existir no arquivo
+        """
+        self.file_path = file_path
+        self.key = key
+        self.encoding = encoding
+        self.max_rows = max(1, max_rows)
+        self.temp_dir = temp_dir
+        self.row_count = 0
+        self.runs: List[str] = []
+        self._in_memory: Optional[List[SortedRow]] = None
+        self._sorted = False
+
+        with open_text(file_path, encoding, newline='') as file:
+            self.headers: List[str] = next(csv.reader(file, delimiter=';'), [])
+        if key not in self.headers:
+            raise ValueError(f"Coluna '{key}' não encontrada em {file_path}")
+
+    def __enter__(self) -> "SortedExport":
+        try:
+            self._sort()
+        except BaseException:
+            # __exit__ não roda se __enter__ falhar: remove os runs já gravados
+            self.close()
+            raise
+        self._sorted = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _sort(self):
+        """Ordena os blocos do arquivo, gravando runs temporários se o arquivo não couber em um bloco."""
+        key_index = self.headers.index(self.key)
+        with open_text(self.file_path, self.encoding, newline='') as file:
+            reader = csv.reader(file, delimiter=';')
+            next(reader, None)
+            chunk: List[SortedRow] = []
+            for values in reader:
+                if not values:
+                    continue  # Linhas em branco são ignoradas, como no DictReader
+                self.row_count += 1
+                chunk.append((values[key_index] if key_index < len(values) else "", self.row_count, values))
+                if len(chunk) >= self.max_rows:
+                    self._write_run(chunk)
+                    chunk = []
+
+        # sort é estável: chaves repetidas mantêm a ordem do arquivo
+        chunk.sort(key=itemgetter(0))
+        if self.runs:
+            if chunk:
+                self._write_run(chunk, sorted_already=True)
+            logger.info(f"{self.file_path}: {self.row_count} linhas ordenadas em {len(self.runs)} runs")
+        else:
+            self._in_memory = chunk
+
+    def _write_run(self, chunk: List[SortedRow], sorted_already: bool = False):
+        if not sorted_already:
+            chunk.sort(key=itemgetter(0))
+        handle, path = tempfile.mkstemp(prefix="csv_diff_", suffix=".run", dir=self.temp_dir)
+        self.runs.append(path)
+        with os.fdopen(handle, 'w', encoding='utf-8', newline='') as run:
+            writer = csv.writer(run, delimiter=';', lineterminator='\n')
+            writer.writerows([key, row_number, *values] for key, row_number, values in chunk)
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[SortedRow]:
+        with open(path, 'r', encoding='utf-8', newline='') as run:
+            for record in csv.reader(run, delimiter=';'):
+                yield record[0], int(record[1]), record[2:]
+
+    def __iter__(self) -> Iterator[SortedRow]:
+        """
+        Raises:
+            RuntimeError: Se usado fora do bloco with (linhas ainda não ordenadas)
+        """
+        if not self._sorted:
+            raise RuntimeError("SortedExport deve ser usado dentro de um bloco with")
+        if self._in_memory is not None:
+            return iter(self._in_memory)
+        # Empates seguem a ordem dos runs, que é a ordem do arquivo
+        return heapq.merge(*(self._read_run(path) for path in self.runs), key=itemgetter(0))
+
+    def close(self):
+        """Remove os runs temporários."""
+        for path in self.runs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.runs = []
+        self._in_memory = None
+        self._sorted = False
+
+
+@dataclass
+class DiffEntry:
+    """
+    Resultado da comparação de uma transação entre as exportações.
+
+    Atributos:
+        kind: ADDED, REMOVED, CHANGED ou UNCHANGED
+        key: Valor da chave (ID da cobrança)
+        old_row: Número da linha no arquivo antigo (None se adicionada)
+        new_row: Número da linha no arquivo novo (None se removida)
+        changes: Colunas alteradas {coluna: (valor antigo, valor novo)} (só em CHANGED)
+    """
+    kind: str
+    key: str
+    old_row: Optional[int] = None
+    new_row: Optional[int] = None
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class ExportDiff:
+    """
+    Resumo da comparação entre duas exportações.
+
+    Atributos:
+        old_rows / new_rows: Linhas de cada arquivo
+        unchanged_count: Transações iguais nos dois arquivos
+        added_count / removed_count / changed_count: Quantidade de cada tipo de diferença
+        changed_fields: Quantidade de transações alteradas por coluna
+        columns_added / columns_removed: Colunas presentes em apenas um dos arquivos
+        samples: Primeiras diferenças encontradas (em ordem de chave)
+    """
+    old_rows: int = 0
+    new_rows: int = 0
+    unchanged_count: int = 0
+    added_count: int = 0
+    removed_count: int = 0
+    changed_count: int = 0
+    changed_fields: Counter = field(default_factory=Counter)
+    columns_added: List[str] = field(default_factory=list)
+    columns_removed: List[str] = field(default_factory=list)
+    samples: List[DiffEntry] = field(default_factory=list)
+
+    @property
+    def identical(self) -> bool:
+        return not (self.added_count or self.removed_count or self.changed_count
+                    or self.columns_added or self.columns_removed)
+
+    def summary(self) -> str:
+        """Descrição curta do resultado."""
+        text = (f"{self.added_count} adicionadas, {self.removed_count} removidas, "
+                f"{self.changed_count} alteradas, {self.unchanged_count} iguais")
+        if self.changed_fields:
+            text += f". Colunas alteradas: {dict(self.changed_fields.most_common())}"
+        if self.columns_added or self.columns_removed:
+            text += f". Colunas novas: {self.columns_added}, removidas: {self.columns_removed}"
+        return text
+
+
+def _groups(rows: Iterable[SortedRow]) -> Iterator[Tuple[str, List[SortedRow]]]:
+    for key, group in groupby(rows, key=itemgetter(0)):
+        yield key, list(group)
+
+
+def _value(values: Sequence[str], index: int) -> Optional[str]:
+    return values[index] if index < len(values) else None
+
+
+def _pair_identical(old_rows: List[SortedRow], new_rows: List[SortedRow],
+                    compared: Sequence[Tuple[str, int, int]]) -> Tuple[List[Tuple[int, int]], List[SortedRow], List[SortedRow]]:
+    """
+    Pareia primeiro as ocorrências iguais de uma chave repetida.
+
+    Evita diferenças falsas quando as ocorrências mudam de ordem entre as
+    exportações. As que sobram são pareadas depois na ordem do arquivo.
+
+    Returns:
+        Tupla (pares de linhas iguais, ocorrências antigas restantes, ocorrências novas restantes)
+    """
+    def signature(values, side):
+        return tuple(_value(values, indexes[side]) for _, *indexes in compared)
+
+    available: Dict[tuple, List[SortedRow]] = {}
+    for row in new_rows:
+        available.setdefault(signature(row[2], 1), []).append(row)
+
+    pairs, old_rest, used = [], [], set()
+    for row in old_rows:
+        candidates = available.get(signature(row[2], 0))
+        if candidates:
+            match = candidates.pop(0)
+            used.add(match[1])
+            pairs.append((row[1], match[1]))
+        else:
+            old_rest.append(row)
+    return pairs, old_rest, [row for row in new_rows if row[1] not in used]
+
+
+def iter_diff(old: SortedExport, new: SortedExport, ignore_columns: Iterable[str] = ()) -> Iterator[DiffEntry]:
+    """
+    Percorre as duas exportações ordenadas e gera uma entrada por transação, em ordem de chave.
+
+    Apenas as colunas presentes nos dois arquivos são comparadas.
+
+    Args:
+        old: Exportação antiga (já ordenada, dentro do with)
+        new: Exportação nova (já ordenada, dentro do with)
+        ignore_columns: Colunas que não devem ser comparadas (ex: datas de geração)
+
+    Yields:
+        DiffEntry de cada transação (adicionada, removida, alterada ou igual)
+    """
+    ignored = set(ignore_columns)
+    compared = [
+        (name, old.headers.index(name), new.headers.index(name))
+        for name in old.headers if name in new.headers and name not in ignored
+    ]
+
+    old_groups, new_groups = _groups(old), _groups(new)
+    old_item, new_item = next(old_groups, None), next(new_groups, None)
+
+    while old_item is not None or new_item is not None:
+        if new_item is None or (old_item is not None and old_item[0] < new_item[0]):
+            for _, row_number, _ in old_item[1]:
+                yield DiffEntry(REMOVED, old_item[0], old_row=row_number)
+            old_item = next(old_groups, None)
+            continue
+        if old_item is None or new_item[0] < old_item[0]:
+            for _, row_number, _ in new_item[1]:
+                yield DiffEntry(ADDED, new_item[0], new_row=row_number)
+            new_item = next(new_groups, None)
+            continue
+
+        # Mesma chave nos dois arquivos
+        key, old_rows, new_rows = old_item[0], old_item[1], new_item[1]
+        if len(old_rows) > 1 or len(new_rows) > 1:
+            identical, old_rows, new_rows = _pair_identical(old_rows, new_rows, compared)
+            for old_number, new_number in identical:
+                yield DiffEntry(UNCHANGED, key, old_number, new_number)
+        for (_, old_number, old_values), (_, new_number, new_values) in zip(old_rows, new_rows):
+            changes = {
+                name: (_value(old_values, old_index), _value(new_values, new_index))
+                for name, old_index, new_index in compared
+                if _value(old_values, old_index) != _value(new_values, new_index)
+            }
+            if changes:
+                yield DiffEntry(CHANGED, key, old_number, new_number, changes)
+            else:
+                yield DiffEntry(UNCHANGED, key, old_number, new_number)
+        for _, row_number, _ in old_rows[len(new_rows):]:
+            yield DiffEntry(REMOVED, key, old_row=row_number)
+        for _, row_number, _ in new_rows[len(old_rows):]:
+            yield DiffEntry(ADDED, key, new_row=row_number)
+        old_item, new_item = next(old_groups, None), next(new_groups, None)
+
+
+def diff_exports(old_path: str, new_path: str, key: str = DEFAULT_KEY, encoding: str = 'iso-8859-1',
+                 max_rows: int = DEFAULT_MAX_ROWS, ignore_columns: Iterable[str] = (),
+                 limit: int = 50, temp_dir: Optional[str] = None) -> ExportDiff:
+    """
+    Compara duas exportações pela chave com sort-merge externo.
+
+    Args:
+        old_path: Exportação antiga (ex: antes do deploy)
+        new_path: Exportação nova (ex: depois do deploy)
+        key: Coluna chave (padrão: "ID da cobranca")
+        encoding: Encoding dos arquivos (padrão: iso-8859-1)
+        max_rows: Quantidade máxima de linhas de cada arquivo em memória
+        ignore_columns: Colunas que não devem ser comparadas
+        limit: Quantidade máxima de diferenças guardadas em samples
+        temp_dir: Diretório dos arquivos temporários da ordenação
+
+    Returns:
+        ExportDiff com as contagens e as primeiras diferenças
+
+    Raises:
+        ValueError: Se a coluna chave não existir em algum dos arquivos
+    """
+    diff = ExportDiff()
+    with SortedExport(old_path, key, encoding, max_rows, temp_dir) as old, \
+            SortedExport(new_path, key, encoding, max_rows, temp_dir) as new:
+        diff.old_rows, diff.new_rows = old.row_count, new.row_count
+        diff.columns_added = [name for name in new.headers if name not in old.headers]
+        diff.columns_removed = [name for name in old.headers if name not in new.headers]
+
+        for entry in iter_diff(old, new, ignore_columns):
+            if entry.kind == UNCHANGED:
+                diff.unchanged_count += 1
+                continue
+            if entry.kind == ADDED:
+                diff.added_count += 1
+            elif entry.kind == REMOVED:
+                diff.removed_count += 1
+            else:
+                diff.changed_count += 1
+                diff.changed_fields.update(entry.changes.keys())
+            if len(diff.samples) < limit:
+                diff.samples.append(entry)
+
+    if diff.identical:
+        logger.info(f"Exportações iguais: {old_path} e {new_path}")
+    else:
+        logger.warning(f"Diferenças entre {old_path} e {new_path}: {diff.summary()}")
+    return diff
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Compara duas exportações pela linha de comando. Retorna 1 se houver diferenças."""
+    parser = argparse.ArgumentParser(description="Compara duas exportações de transações pelo ID da cobrança.")
+    parser.add_argument("old", help="Exportação antiga")
+    parser.add_argument("new", help="Exportação nova")
+    parser.add_argument("--key", default=DEFAULT_KEY, help="Coluna chave")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS, help="Linhas em memória por arquivo")
+    parser.add_argument("--ignore", action="append", default=[], help="Coluna a ignorar (pode repetir)")
+    parser.add_argument("--limit", type=int, default=20, help="Quantidade de diferenças exibidas")
+    args = parser.parse_args(argv)
+
+    diff = diff_exports(args.old, args.new, key=args.key, max_rows=args.max_rows,
+                        ignore_columns=args.ignore, limit=args.limit)
+    print(diff.summary())
+    for entry in diff.samples:
+        print(f"  {entry.kind:8} {entry.key} (linhas {entry.old_row} -> {entry.new_row}) {entry.changes or ''}")
+    return 0 if diff.identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
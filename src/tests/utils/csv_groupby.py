@@ -0,0 +1,245 @@
+"""
+Agrupamentos e distribuições de exportações CSV em uma única passada.
+
+Um agrupamento (GroupBy) tem uma ou mais colunas-chave (ex: "Nome da loja",
+"Bandeira") e um ou mais agregados (Count, Sum, Min, Max). Vários
+agrupamentos são calculados juntos, com uma única leitura das linhas:
+
+- cada agrupamento tem o seu acumulador (GroupAccumulator), com o estado dos
+  agregados por chave ({chave: [contagem, soma, ...]}), atualizado a cada linha;
+- a memória é proporcional à quantidade de grupos de cada agrupamento, e não
+  às combinações de valores das colunas lidas (colunas de valor têm milhares
+  de valores distintos em exportações grandes);
+- no modo columnar as linhas já estão em memória, então cada agrupamento
+  conta as combinações dos códigos das suas próprias colunas (group_counts).
+
+Colunas de identificador (ex: "ID da cobranca") não devem ser usadas como
+chave, pois cada linha vira um grupo.
+
+Uso básico:
+    breakdowns = validator.group_by_many({
+        "por_loja": GroupBy("Nome da loja", [Count(), Sum("Valor total da cobrança")]),
+        "por_bandeira": GroupBy("Bandeira"),
+        "por_captura_tipo": GroupBy(["Meio de captura", "Tipo de venda"]),
+    })
+    breakdowns["por_loja"]["SUB TRANSFER"]["sum[Valor total da cobrança]"]  # centavos
+"""
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+from tests.utils.csv_money import parse_cents
+
+Combination = Tuple[Optional[str], ...]
+
+# Valores convertidos guardados por agregado numérico (colunas repetitivas)
+PARSE_CACHE_SIZE = 4096
+
+
+class Aggregate:
+    """
+    Classe base dos agregados.
+
+    Cada agregado recebe os valores distintos da coluna com a quantidade de
+    linhas em que aparecem (add) e devolve o resultado final de cada grupo.
+    """
+    name = "aggregate"
+    column: Optional[str] = None  # Coluna lida pelo agregado (None para Count)
+
+    def start(self) -> Any:
+        """Estado inicial de um grupo."""
+        return None
+
+    def add(self, state: Any, value: Optional[str], count: int) -> Any:
+        """Soma count ocorrências de value ao estado do grupo e devolve o novo estado."""
+        raise NotImplementedError
+
+    def finish(self, state: Any) -> Any:
+        """Resultado final do grupo."""
+        return state
+
+
+class Count(Aggregate):
+    """Quantidade de linhas do grupo."""
+    name = "count"
+
+    def start(self):
+        return 0
+
+    def add(self, state, value, count):
+        return state + count
+
+
+class _NumericAggregate(Aggregate):
+    """
+    Agregado sobre uma coluna numérica.
+
+    Os valores são convertidos por parse (padrão: csv_money.parse_cents, que
+    devolve centavos); os primeiros PARSE_CACHE_SIZE valores distintos ficam
+    guardados e não são convertidos de novo. Vazios e valores inválidos são
+    ignorados.
+    """
+    label = "numeric"
+
+    def __init__(self, column: str, parse: Callable[[Optional[str]], Optional[int]] = parse_cents):
+        self.column = column
+        self.parse = parse
+        self.name = f"{self.label}[{column}]"
+        self._parsed: Dict[Optional[str], Optional[int]] = {}
+
+    def _number(self, value: Optional[str]) -> Optional[int]:
+        number = self._parsed.get(value, self)
+        if number is self:
+            number = self.parse(value)
+            if len(self._parsed) < PARSE_CACHE_SIZE:
+                self._parsed[value] = number
+        return number
+
+
+class Sum(_NumericAggregate):
+    """Soma da coluna no grupo (em centavos para colunas de valor)."""
+    label = "sum"
+
+    def start(self):
+        return 0
+
+    def add(self, state, value, count):
+        number = self._number(value)
+        return state if number is None else state + number * count
+
+
+class Min(_NumericAggregate):
+    """Menor valor da coluna no grupo (None se não houver valores válidos)."""
+    label = "min"
+
+    def add(self, state, value, count):
+        number = self._number(value)
+        if number is None or (state is not None and state <= number):
+            return state
+        return number
+
+
+class Max(_NumericAggregate):
+    """Maior valor da coluna no grupo (None se não houver valores válidos)."""
+    label = "max"
+
+    def add(self, state, value, count):
+        number = self._number(value)
+        if number is None or (state is not None and state >= number):
+            return state
+        return number
+
+
+class GroupBy:
+    """
+    Definição de um agrupamento: colunas-chave e agregados.
+
+    Com uma coluna-chave, as chaves do resultado são os valores da coluna.
+    Com várias, são tuplas na ordem das colunas.
+    """
+
+    def __init__(self, keys: Union[str, Sequence[str]], aggregates: Optional[Sequence[Aggregate]] = None):
+        """
+        Args:
+            keys: Coluna ou lista de colunas de agrupamento
+            aggregates: Agregados calculados por grupo (padrão: [Count()])
+        """
+        self.keys: List[str] = [keys] if isinstance(keys, str) else list(keys)
+        self.aggregates: List[Aggregate] = list(aggregates) if aggregates else [Count()]
+        if not self.keys:
+            raise ValueError("Informe pelo menos uma coluna de agrupamento")
+
+    @property
+    def columns(self) -> List[str]:
+        """Colunas lidas pelo agrupamento (chaves e colunas dos agregados)."""
+        return _unique(self.keys + [agg.column for agg in self.aggregates if agg.column is not None])
+
+
+def _unique(columns: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(columns))
+
+
+def required_columns(breakdowns: Iterable[GroupBy]) -> List[str]:
+    """Todas as colunas lidas pelos agrupamentos, sem repetição."""
+    return _unique(column for breakdown in breakdowns for column in breakdown.columns)
+
+
+class GroupAccumulator:
+    """
+    Estado de um agrupamento durante a leitura: {chave: [estado de cada agregado]}.
+
+    Recebe linhas como dicionários (add) ou tuplas de valores na ordem de
+    columns, com a quantidade de linhas que cada uma representa.
+    """
+
+    def __init__(self, breakdown: GroupBy, columns: Optional[Sequence[str]] = None):
+        """
+        Args:
+            breakdown: Agrupamento a calcular
+            columns: Colunas das tuplas recebidas (None: linhas como dicionários)
+        """
+        self.breakdown = breakdown
+        self.states: Dict[Any, List[Any]] = {}
+        position = None if columns is None else {column: index for index, column in enumerate(columns)}
+
+        def getter(names: List[str]) -> Callable[[Any], Any]:
+            # Com uma coluna o itemgetter devolve o valor; com várias, a tupla (chave do grupo)
+            return itemgetter(*(names if position is None else [position[name] for name in names]))
+
+        self._key = getter(breakdown.keys)
+        self._aggregates = [
+            (agg, None if agg.column is None else getter([agg.column])) for agg in breakdown.aggregates
+        ]
+
+    def add(self, row: Any, count: int = 1):
+        """Soma a linha (ou combinação que aparece em count linhas) ao grupo da sua chave."""
+        key = self._key(row)
+        group = self.states.get(key)
+        if group is None:
+            group = self.states[key] = [agg.start() for agg, _ in self._aggregates]
+        for index, (agg, value) in enumerate(self._aggregates):
+            group[index] = agg.add(group[index], None if value is None else value(row), count)
+
+    def result(self) -> Dict[Any, Dict[str, Any]]:
+        """Dicionário {chave do grupo: {nome do agregado: resultado}}."""
+        aggregates = [agg for agg, _ in self._aggregates]
+        return {
+            key: {agg.name: agg.finish(state) for agg, state in zip(aggregates, group)}
+            for key, group in self.states.items()
+        }
+
+
+def group_counts(columns: Sequence[str], combination_counts: Mapping[Combination, int],
+                 breakdown: GroupBy) -> Dict[Any, Dict[str, Any]]:
+    """
+    Calcula um agrupamento a partir das contagens de combinações.
+
+    Args:
+        columns: Colunas de cada combinação (na ordem das tuplas)
+        combination_counts: {tupla de valores das colunas: quantidade de linhas}
+        breakdown: Agrupamento a calcular
+
+    Returns:
+        Dicionário {chave do grupo: {nome do agregado: resultado}}
+    """
+    accumulator = GroupAccumulator(breakdown, columns)
+    for combination, count in combination_counts.items():
+        accumulator.add(combination, count)
+    return accumulator.result()
+
+
+def count_combinations(columns: Sequence[Any]) -> Counter:
+    """
+    Conta as combinações de valores de várias ColumnView pelos códigos.
+
+    Args:
+        columns: ColumnView das colunas, todas da mesma tabela
+
+    Returns:
+        Counter {tupla de valores: quantidade de linhas}
+    """
+    categories = [column.categories for column in columns]
+    code_counts = Counter(zip(*(column.codes for column in columns)))
+    return Counter({
+        tuple(names[code] for names, code in zip(categories, codes)): count
+        for codes, count in code_counts.items()
+    })
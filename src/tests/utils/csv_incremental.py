@@ -0,0 +1,203 @@
+"""
+Validação incremental de exportações CSV enquanto o download acontece.
+
+O IncrementalCSVValidator recebe pedaços de bytes (feed) conforme chegam,
+processa apenas as linhas completas e executa as regras (csv_rules.py) linha
+a linha. Quando o download termina, só falta processar o último pedaço, então
+o resultado fica pronto quase imediatamente. Um header inválido é detectado
+logo nos primeiros bytes, sem esperar a transferência inteira.
+
+tail_download acompanha o arquivo temporário do Chrome (.crdownload) no
+diretório de download, lendo apenas os bytes novos a cada verificação, até o
+arquivo final (.csv) aparecer.
+
+Uso básico:
+    validator = IncrementalCSVValidator([HeadersRule(), StatusEnumRule()])
+    file_path = tail_download(download_dir, validator, timeout=30)
+    results = validator.results
+"""
+import csv
+import logging
+import os
+import time
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+from tests.utils.csv_rules import Rule, RuleResult, log_results
+
+logger = logging.getLogger(__name__)
+
+TEMP_DOWNLOAD_SUFFIX = ".crdownload"
+
+
+class IncrementalCSVValidator:
+    """
+    Executa regras de validação sobre um CSV recebido em pedaços.
+    """
+
+    def __init__(self, rules: Sequence[Rule], encoding: str = 'iso-8859-1'):
+        """
+        Args:
+            rules: Regras de tests/utils/csv_rules.py
+            encoding: Encoding do arquivo (padrão: iso-8859-1)
+        """
+        self.rules = list(rules)
+        self.encoding = encoding
+        self.headers: Optional[List[str]] = None
+        self.row_count = 0
+        self.bytes_received = 0
+        self.results: Optional[List[RuleResult]] = None
+        self._row_rules: List[Rule] = []
+        self._pending = b""
+
+    @property
+    def header_failed(self) -> bool:
+        """True se o header já foi lido e alguma regra falhou nele (ex: coluna ausente)."""
+        return self.headers is not None and any(rule.error for rule in self.rules)
+
+    def feed(self, data: bytes):
+        """
+        Recebe um pedaço do arquivo e valida as linhas completas.
+
+        Bytes de uma linha ainda incompleta ficam guardados até o próximo pedaço.
+        """
+        if not data:
+            return
+        self.bytes_received += len(data)
+
+        data = self._pending + data
+        last_newline = data.rfind(b"\n")
+        if last_newline == -1:
+            self._pending = data
+            return
+
+        self._pending = data[last_newline + 1:]
+        # split("\n") em vez de splitlines: no ISO-8859-1 o byte 0x85 vira U+0085,
+        # que o splitlines trataria como quebra de linha
+        lines = data[:last_newline].decode(self.encoding).split("\n")
+        self._process([line + "\n" for line in lines])
+
+    def _process(self, lines: List[str]):
+        """Valida linhas completas (a primeira linha do arquivo é o header)."""
+        if self.headers is None:
+            if not lines:
+                return
+            self.headers = next(csv.reader([lines[0]], delimiter=';'), [])
+            lines = lines[1:]
+            for rule in self.rules:
+                rule.check_headers(self.headers)
+            self._row_rules = [rule for rule in self.rules if rule.needs_rows and not rule.error]
+            logger.info(f"Header recebido após {self.bytes_received} bytes")
+
+        if not self._row_rules:
+            return
+
+        reader = csv.DictReader(lines, fieldnames=self.headers, delimiter=';')
+        for row in reader:
+            self.row_count += 1
+            for rule in self._row_rules:
+                rule.check_row(self.row_count, row)
+
+    def finish(self) -> List[RuleResult]:
+        """
+        Processa o restante do arquivo (última linha sem quebra) e monta os resultados.
+
+        Returns:
+            Lista com um RuleResult por regra, na mesma ordem das regras
+        """
+        if self.results is not None:
+            return self.results
+
+        if self._pending:
+            pending, self._pending = self._pending, b""
+            self._process([pending.decode(self.encoding)])
+        if self.headers is None:
+            self._process([""])
+
+        self.results = [rule.result() for rule in self.rules]
+        log_results(self.results)
+        return self.results
+
+
+def _find_download(download_dir: str, ignore: Set[str]) -> Tuple[Optional[str], bool]:
+    """
+    Procura o arquivo sendo baixado.
+
+    Returns:
+        Tupla (caminho, finalizado). Enquanto houver um .crdownload, retorna o
+        mais recente dele com finalizado=False. Depois retorna o .csv novo mais
+        recente com finalizado=True.
+    """
+    in_progress = []
+    finished = []
+    for name in os.listdir(download_dir):
+        if name in ignore:
+            continue
+        path = os.path.join(download_dir, name)
+        if name.endswith(TEMP_DOWNLOAD_SUFFIX):
+            in_progress.append(path)
+        elif name.endswith('.csv'):
+            finished.append(path)
+
+    for paths, done in ((in_progress, False), (finished, True)):
+        if paths:
+            try:
+                return max(paths, key=os.path.getmtime), done
+            except OSError:
+                return None, False  # Arquivo renomeado durante a busca
+    return None, False
+
+
+def tail_download(download_dir: str, validator: IncrementalCSVValidator, timeout: int = 30,
+                  poll_interval: float = 0.2, fail_fast: bool = True,
+                  ignore: Iterable[str] = ()) -> str:
+    """
+    Acompanha o download no diretório e envia os bytes novos ao validador.
+
+    O arquivo é reaberto a cada verificação (e lido a partir da última posição),
+    o que permite seguir o Chrome renomeando o .crdownload para .csv.
+
+    Args:
+        download_dir: Diretório onde o arquivo está sendo baixado
+        validator: Validador que recebe os bytes
+        timeout: Tempo máximo de espera em segundos (padrão: 30)
+        poll_interval: Intervalo entre verificações em segundos
+        fail_fast: Se True, para assim que o header falhar (sem esperar o download)
+        ignore: Nomes de arquivos que já estavam no diretório antes do download
+
+    Returns:
+        Caminho do arquivo (o .csv final, ou o .crdownload se parou pelo fail_fast).
+        Os resultados ficam em validator.results.
+
+    Raises:
+        TimeoutError: Se o download não for concluído no tempo limite
+    """
+    ignore = set(ignore)
+    deadline = time.time() + timeout
+    offset = 0
+
+    while True:
+        path, finished = _find_download(download_dir, ignore)
+        if path:
+            try:
+                with open(path, 'rb') as file:
+                    file.seek(offset)
+                    data = file.read()
+            except OSError:
+                data = None  # Renomeado entre a busca e a leitura; tenta de novo
+
+            if data is not None:
+                offset += len(data)
+                validator.feed(data)
+
+                if fail_fast and validator.header_failed:
+                    logger.error(f"Header inválido detectado após {offset} bytes: {path}")
+                    validator.finish()
+                    return path
+
+                if finished:
+                    validator.finish()
+                    logger.info(f"Download concluído e validado: {path} ({validator.row_count} linhas)")
+                    return path
+
+        if time.time() > deadline:
+            raise TimeoutError(f"Download não foi condluído em {timeout} segundos.")
+        time.sleep(poll_interval)
@@ -0,0 +1,103 @@
+"""
+Índices hash sobre colunas de identificador das exportações CSV.
+
+Um HashIndex guarda, para cada valor de uma coluna (ex: "ID da cobranca",
+"TID", "NSU"), os números das linhas em que ele aparece. A busca por valor é
+O(1), sem percorrer o arquivo, e as chaves duplicadas ficam registradas na
+mesma passada que monta o índice.
+
+Para economizar memória, chaves únicas (o caso normal) guardam só o número da
+linha; a lista de linhas só é criada para as chaves repetidas.
+
+A numeração é a mesma do CSVValidator e das regras: a linha 1 é a primeira
+linha de dados após o header. Valores vazios não são indexados.
+
+Uso básico:
+    validator = CSVValidator("arquivo.csv", index_columns=CSVValidator.ID_COLUMNS)
+    validator.find_rows("TID", "1764245683564")
+    validator.get_duplicates("ID da cobranca")  # {valor: [linhas]}
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+class HashIndex:
+    """
+    Índice {valor: números das linhas} de uma coluna.
+    """
+    __slots__ = ("column", "_first", "_repeated", "_size")
+
+    def __init__(self, column: str):
+        self.column = column
+        self._first: Dict[str, int] = {}  # Valor -> primeira linha
+        self._repeated: Dict[str, List[int]] = {}  # Valor repetido -> todas as linhas
+        self._size = 0
+
+    def add(self, value: Optional[str], row_number: int):
+        """Registra o valor da coluna na linha row_number (vazios são ignorados)."""
+        if not value:
+            return
+        self._size += 1
+        first = self._first.setdefault(value, row_number)
+        if first != row_number:
+            rows = self._repeated.get(value)
+            if rows is None:
+                self._repeated[value] = [first, row_number]
+            else:
+                rows.append(row_number)
+
+    def add_column(self, values: Iterable[Optional[str]], first_row: int = 1):
+        """Registra uma coluna inteira (lista, gerador ou ColumnView), a partir da linha first_row."""
+        for row_number, value in enumerate(values, start=first_row):
+            self.add(value, row_number)
+
+    def merge(self, other: "HashIndex", row_offset: int):
+        """
+        Combina o índice de um pedaço seguinte do arquivo (ver Rule.merge).
+
+        Args:
+            other: Índice do pedaço
+            row_offset: Quantidade de linhas antes do pedaço
+        """
+        for value, row_number in other._first.items():
+            for number in other._repeated.get(value, (row_number,)):
+                self.add(value, number + row_offset)
+
+    def find(self, value: str) -> List[int]:
+        """Retorna os números das linhas com o valor (lista vazia se não existir)."""
+        rows = self._repeated.get(value)
+        if rows is not None:
+            return list(rows)
+        row_number = self._first.get(value)
+        return [] if row_number is None else [row_number]
+
+    def duplicates(self) -> Dict[str, List[int]]:
+        """Retorna as chaves que aparecem em mais de uma linha, com os números das linhas."""
+        return {value: list(rows) for value, rows in self._repeated.items()}
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self._first
+
+    def __len__(self) -> int:
+        """Quantidade de valores distintos indexados."""
+        return len(self._first)
+
+    @property
+    def indexed_rows(self) -> int:
+        """Quantidade de linhas com valor não vazio na coluna."""
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"HashIndex({self.column!r}, chaves={len(self)}, duplicadas={len(self._repeated)})"
+
+
+def indexed(rows: Iterable[Dict[str, Any]], indexes: Sequence[HashIndex]) -> Iterator[Dict[str, Any]]:
+    """
+    Repassa as linhas alimentando os índices, para montar os índices na mesma
+    passada que carrega ou percorre o arquivo.
+
+    Ex: data = list(indexed(reader, indexes))
+    """
+    for row_number, row in enumerate(rows, start=1):
+        for index in indexes:
+            index.add(row.get(index.column), row_number)
+        yield row
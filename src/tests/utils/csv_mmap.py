@@ -0,0 +1,141 @@
+"""
+Leitura de linhas específicas de uma exportação CSV via mmap.
+
+O arquivo é mapeado em memória e percorrido uma única vez para montar um índice
+compacto (array('Q')) com a posição em bytes do início de cada linha de dados.
+Depois disso, ler a linha N (ou as linhas 1.000.000 a 1.000.050) custa O(1) por
+linha: apenas os bytes dessas linhas são decodificados, sem parse do arquivo inteiro.
+
+A numeração é a mesma do CSVValidator e das regras: a linha 1 é a primeira
+linha de dados após o header, e linhas em branco são ignoradas (como no
+csv.DictReader).
+
+Uso básico:
+    with MappedCSVReader("arquivo.csv") as reader:
+        reader.get_row(1)
+        reader.get_rows(range(1_000_000, 1_000_051))
+"""
+from array import array
+import csv
+import logging
+import mmap
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def row_to_dict(headers: Sequence[str], values: Sequence[str]) -> Dict[Any, Any]:
+    """
+    Monta o dicionário de uma linha com a mesma regra do csv.DictReader.
+
+    Colunas faltando ficam como None e valores excedentes ficam em uma lista na chave None.
+    """
+    row = dict(zip(headers, values))
+    if len(values) > len(headers):
+        row[None] = list(values[len(headers):])
+    elif len(values) < len(headers):
+        for name in headers[len(values):]:
+            row[name] = None
+    return row
+
+
+class MappedCSVReader:
+    """
+    Leitor de linhas por número, baseado em mmap e em um índice de posições.
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'iso-8859-1'):
+        """
+        Mapeia o arquivo e monta o índice de linhas.
+
+        Args:
+            file_path: Caminho do arquivo CSV
+            encoding: Encoding do arquivo (padrão: iso-8859-1)
+        """
+        self.file_path = file_path
+        self.encoding = encoding
+        self.headers: List[str] = []
+        self.offsets = array("Q")
+        self._file = open(file_path, 'rb')
+        self._mm: Optional[mmap.mmap] = None
+
+        try:
+            # mmap não aceita arquivos vazios
+            if self._file.seek(0, 2) > 0:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._build_index()
+        except Exception:
+            self.close()
+            raise
+
+        logger.info(f"Índice de linhas montado para {file_path}: {len(self)} linhas")
+
+    def _build_index(self):
+        """Percorre o arquivo uma vez guardando o início de cada linha de dados."""
+        mm = self._mm
+        size = len(mm)
+        find = mm.find
+        offsets = self.offsets
+
+        header_end = find(b"\n")
+        header_end = size if header_end == -1 else header_end + 1
+        self.headers = self._parse(0, header_end)
+
+        position = header_end
+        while position < size:
+            newline = find(b"\n", position)
+            end = size if newline == -1 else newline + 1
+            content_end = end if newline == -1 else newline
+            if content_end > position and mm[content_end - 1] == 13:  # "\r\n"
+                content_end -= 1
+            # Linhas em branco são ignoradas, como no DictReader
+            if content_end > position:
+                offsets.append(position)
+            position = end
+
+    def _parse(self, start: int, end: int) -> List[str]:
+        """Decodifica e faz o parse dos bytes de uma linha."""
+        line = self._mm[start:end].decode(self.encoding)
+        return next(csv.reader([line], delimiter=';'), [])
+
+    def _line_end(self, start: int) -> int:
+        newline = self._mm.find(b"\n", start)
+        return len(self._mm) if newline == -1 else newline + 1
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get_row(self, row_number: int) -> Dict[Any, Any]:
+        """
+        Retorna a linha de dados de número row_number (1 = primeira linha após o header).
+
+        Raises:
+            IndexError: Se a linha não existir
+        """
+        if not 1 <= row_number <= len(self.offsets):
+            raise IndexError(f"Linha {row_number} fora do intervalo (1 a {len(self.offsets)})")
+        start = self.offsets[row_number - 1]
+        return row_to_dict(self.headers, self._parse(start, self._line_end(start)))
+
+    def get_rows(self, row_numbers: Iterable[int]) -> List[Dict[Any, Any]]:
+        """Retorna as linhas pedidas, na ordem pedida."""
+        return [self.get_row(row_number) for row_number in row_numbers]
+
+    def iter_range(self, first: int, last: int) -> Iterator[Dict[Any, Any]]:
+        """Percorre as linhas de first até last (inclusive)."""
+        for row_number in range(max(1, first), min(last, len(self.offsets)) + 1):
+            yield self.get_row(row_number)
+
+    def close(self):
+        """Libera o mmap e o arquivo."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "MappedCSVReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,239 @@
+"""
+Conversão e agregação em lote de colunas de valores em reais.
+
+As colunas de valor da exportação ("Valor total da cobrança", "Valor da
+transação", "Comissao", "Valor do frete") usam vírgula decimal, ex: 200,00.
+Os valores são convertidos para centavos inteiros (sem erro de arredondamento
+de float) por uma única expressão regular compilada, que também aceita
+separador de milhar (1.234,56), sinal negativo e o prefixo "R$".
+
+As agregações não percorrem as linhas em Python: primeiro os valores são
+contados (Counter, ou as contagens dos códigos no modo columnar) e a conversão
+e as somas são feitas uma vez por valor distinto. Como as colunas de valor têm
+poucos valores distintos (ex: 200,00 em quase todas as linhas), o custo fica
+proporcional aos valores distintos e não à quantidade de linhas.
+
+No modo streaming os valores não são contados antes: cada valor é somado
+conforme é lido, com a conversão guardada em um memo de até CACHE_SIZE
+valores, então a memória não cresce com os valores distintos da coluna.
+
+Uso básico:
+    validator.get_money_stats("Valor total da cobrança").total  # centavos
+    validator.get_money_stats_by("Valor total da cobrança", "Bandeira")["Visa"].total
+"""
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from tests.utils.csv_values import is_column_view, is_empty
+
+# Valor usado no array de centavos para células vazias ou inválidas
+MISSING_CENTS = -2 ** 63
+
+# Valores convertidos guardados no memo (limpo ao atingir o limite)
+CACHE_SIZE = 4096
+
+# Valores inválidos distintos guardados como amostra em MoneyStats
+MAX_INVALID_VALUES = 20
+
+_MONEY_PATTERN = re.compile(
+    r"\s*(-)?\s*(?:R\$\s*)?(-)?(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d{1,2}))?\s*"
+)
+
+
+def parse_cents(value: Optional[str]) -> Optional[int]:
+    """
+    Converte um valor em reais para centavos.
+
+    Ex: "200,00" -> 20000, "1.234,5" -> 123450, "-R$ 2,00" -> -200
+
+    Args:
+        value: Valor com vírgula decimal
+
+    Returns:
+        Valor em centavos, ou None se o valor for vazio ou inválido
+    """
+    if not value:
+        return None
+    match = _MONEY_PATTERN.fullmatch(value)
+    if match is None:
+        return None
+
+    sign, sign_after_symbol, integer, decimals = match.groups()
+    if sign and sign_after_symbol:
+        return None
+    cents = int(integer.replace(".", "")) * 100
+    if decimals:
+        cents += int(decimals.ljust(2, "0"))
+    return -cents if sign or sign_after_symbol else cents
+
+
+def format_cents(cents: int) -> str:
+    """Formata centavos no padrão da exportação com separador de milhar (ex: 1.234,56)."""
+    sign = "-" if cents < 0 else ""
+    integer, decimals = divmod(abs(cents), 100)
+    return f"{sign}{integer:,}".replace(",", ".") + f",{decimals:02d}"
+
+
+@dataclass
+class MoneyStats:
+    """
+    Agregações de uma coluna de valores (em centavos).
+
+    Atributos:
+        count: Quantidade de valores válidos (vazios são ignorados)
+        total: Soma dos valores válidos
+        minimum: Menor valor (None se não houver valores válidos)
+        maximum: Maior valor (None se não houver valores válidos)
+        invalid_count: Quantidade de valores que não estão no formato esperado
+        invalid_values: Valores inválidos distintos encontrados (até MAX_INVALID_VALUES)
+    """
+    count: int = 0
+    total: int = 0
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    invalid_count: int = 0
+    invalid_values: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.invalid_count == 0
+
+    @property
+    def average(self) -> Optional[float]:
+        """Média em centavos (None se não houver valores válidos)."""
+        return self.total / self.count if self.count else None
+
+    def _add(self, value: Optional[str], cents: Optional[int], count: int):
+        """Soma count ocorrências de um valor."""
+        if cents is None:
+            if not is_empty(value):
+                self.invalid_count += count
+                if len(self.invalid_values) < MAX_INVALID_VALUES and value not in self.invalid_values:
+                    self.invalid_values.append(value)
+            return
+        self.count += count
+        self.total += cents * count
+        if self.minimum is None or cents < self.minimum:
+            self.minimum = cents
+        if self.maximum is None or cents > self.maximum:
+            self.maximum = cents
+
+
+def _parse_cached(parsed: Dict[Optional[str], Optional[int]], value: Optional[str]) -> Optional[int]:
+    """parse_cents com memo, limpo quando chega a CACHE_SIZE valores."""
+    try:
+        return parsed[value]
+    except KeyError:
+        cents = parse_cents(value)
+        if len(parsed) >= CACHE_SIZE:
+            parsed.clear()
+        parsed[value] = cents
+        return cents
+
+
+def count_values(values: Iterable[Optional[str]]) -> Mapping[Optional[str], int]:
+    """
+    Conta as ocorrências de cada valor da coluna.
+
+    Para ColumnView usa as contagens dos códigos, sem criar strings por linha.
+    """
+    if is_column_view(values):
+        return values.value_counts()
+    return Counter(values)
+
+
+def money_stats(value_counts: Mapping[Optional[str], int]) -> MoneyStats:
+    """
+    Agrega uma coluna a partir das contagens de cada valor (ver count_values).
+
+    Returns:
+        MoneyStats da coluna
+    """
+    stats = MoneyStats()
+    for value, count in value_counts.items():
+        stats._add(value, parse_cents(value), count)
+    return stats
+
+
+def money_stats_by(pair_counts: Mapping[Tuple[Any, Optional[str]], int]) -> Dict[Any, MoneyStats]:
+    """
+    Agrega uma coluna de valores por grupo a partir das contagens de (chave, valor) (ex: CSVValidator._count_combinations).
+
+    Cada valor distinto é convertido uma única vez, mesmo aparecendo em vários grupos.
+
+    Returns:
+        Dicionário {chave do grupo: MoneyStats}
+    """
+    parsed: Dict[Optional[str], Optional[int]] = {}
+    groups: Dict[Any, MoneyStats] = {}
+    for (key, value), count in pair_counts.items():
+        if value not in parsed:
+            parsed[value] = parse_cents(value)
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = MoneyStats()
+        stats._add(value, parsed[value], count)
+    return groups
+
+
+def stream_money_stats(values: Iterable[Optional[str]]) -> MoneyStats:
+    """
+    Agrega uma coluna valor a valor, sem contar os valores antes (modo streaming).
+
+    A memória fica limitada ao memo de conversões (CACHE_SIZE), mesmo em
+    colunas com muitos valores distintos.
+
+    Returns:
+        MoneyStats da coluna
+    """
+    stats = MoneyStats()
+    parsed: Dict[Optional[str], Optional[int]] = {}
+    for value in values:
+        stats._add(value, _parse_cached(parsed, value), 1)
+    return stats
+
+
+def stream_money_stats_by(pairs: Iterable[Tuple[Any, Optional[str]]]) -> Dict[Any, MoneyStats]:
+    """
+    Agrega uma coluna de valores por grupo a partir dos pares (chave, valor) de cada linha (modo streaming).
+
+    Guarda só um MoneyStats por grupo e o memo de conversões (CACHE_SIZE).
+
+    Returns:
+        Dicionário {chave do grupo: MoneyStats}
+    """
+    parsed: Dict[Optional[str], Optional[int]] = {}
+    groups: Dict[Any, MoneyStats] = {}
+    for key, value in pairs:
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = MoneyStats()
+        stats._add(value, _parse_cached(parsed, value), 1)
+    return groups
+
+
+def to_cents(values: Iterable[Optional[str]]) -> array:
+    """
+    Converte uma coluna de valores em um array('q') de centavos.
+
+    Valores vazios ou inválidos viram MISSING_CENTS.
+
+    Args:
+        values: Valores da coluna (lista, gerador ou ColumnView)
+
+    Returns:
+        array('q') com um valor por linha
+    """
+    if is_column_view(values):
+        converted = [parse_cents(value) for value in values.categories]
+        converted = [MISSING_CENTS if cents is None else cents for cents in converted]
+        return array("q", map(converted.__getitem__, values.codes))
+
+    parsed: Dict[Optional[str], Optional[int]] = {}
+    cents = array("q")
+    for value in values:
+        converted = _parse_cached(parsed, value)
+        cents.append(MISSING_CENTS if converted is None else converted)
+    return cents
@@ -0,0 +1,159 @@
+"""
+Validação paralela de exportações CSV muito grandes.
+
+O arquivo é dividido em faixas de bytes alinhadas no início de uma linha. O
+header é lido uma única vez no processo principal e cada faixa é validada por
+um processo do pool com cópias das regras (csv_rules.py). As cópias voltam na
+ordem do arquivo e são combinadas com Rule.merge, ajustando os números das
+linhas. O resultado é idêntico ao da validação serial (CSVValidator.validate_rules).
+
+Limitação: campos entre aspas com quebra de linha não são suportados, pois as
+faixas são cortadas em qualquer quebra de linha. A exportação do portal não
+usa esse tipo de campo. Arquivos compactados (.csv.gz, .zip) não podem ser
+divididos em faixas de bytes e são validados em uma única passada.
+
+Uso básico:
+    results = validate_rules_parallel("arquivo.csv", [StatusEnumRule(), ValueCountsRule()], workers=8)
+"""
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import csv
+import logging
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+from tests.utils.csv_compression import is_compressed, open_text
+from tests.utils.csv_rules import Rule, RuleResult, log_results, run_rules
+
+logger = logging.getLogger(__name__)
+
+
+def read_header(file_path: str, encoding: str = 'iso-8859-1') -> Tuple[List[str], int]:
+    """
+    Lê o header do CSV.
+
+    Returns:
+        Tupla (headers, posição em bytes do início da primeira linha de dados)
+    """
+    with open(file_path, 'rb') as file:
+        first_line = file.readline()
+        data_start = file.tell()
+
+    headers = next(csv.reader([first_line.decode(encoding)], delimiter=';'), []) if first_line else []
+    return headers, data_start
+
+
+def split_byte_ranges(file_path: str, data_start: int, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Divide a área de dados do arquivo em faixas de bytes [início, fim).
+
+    Cada faixa começa no início de uma linha e termina logo após uma quebra de
+    linha (ou no fim do arquivo).
+
+    Args:
+        file_path: Caminho do arquivo
+        data_start: Posição da primeira linha de dados (após o header)
+        chunks: Quantidade desejada de faixas
+
+    Returns:
+        Lista de faixas (pode ter menos faixas que o pedido em arquivos pequenos)
+    """
+    size = os.path.getsize(file_path)
+    if size <= data_start:
+        return []
+
+    step = max(1, (size - data_start) // max(1, chunks))
+    bounds = [data_start]
+    with open(file_path, 'rb') as file:
+        for index in range(1, chunks):
+            position = data_start + index * step
+            if position <= bounds[-1]:
+                continue
+            # Volta um byte: se ele for '\n', a posição já é início de linha
+            file.seek(position - 1)
+            file.readline()
+            boundary = file.tell()
+            if boundary >= size:
+                break
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _iter_lines(file_path: str, start: int, end: int, encoding: str) -> Iterator[str]:
+    """Lê as linhas da faixa [start, end) sem carregar a faixa inteira em memória."""
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode(encoding)
+
+
+def _validate_chunk(task) -> Tuple[int, List[Rule]]:
+    """
+    Valida uma faixa do arquivo (executado dentro do processo do pool).
+
+    Returns:
+        Tupla (quantidade de linhas da faixa, regras com o estado da faixa)
+    """
+    file_path, encoding, headers, start, end, rules = task
+    reader = csv.DictReader(_iter_lines(file_path, start, end, encoding), fieldnames=headers, delimiter=';')
+
+    row_count = 0
+    for row_number, row in enumerate(reader, start=1):
+        for rule in rules:
+            rule.check_row(row_number, row)
+        row_count = row_number
+    return row_count, rules
+
+
+def validate_rules_parallel(file_path: str, rules: Sequence[Rule], workers: Optional[int] = None,
+                            encoding: str = 'iso-8859-1', chunks: Optional[int] = None) -> List[RuleResult]:
+    """
+    Executa as regras sobre o arquivo usando vários processos.
+
+    Args:
+        file_path: Caminho do arquivo CSV
+        rules: Regras de tests/utils/csv_rules.py
+        workers: Quantidade de processos (padrão: os.cpu_count())
+        encoding: Encoding do arquivo (padrão: iso-8859-1)
+        chunks: Quantidade de faixas (padrão: 4 por processo, para equilibrar a carga)
+
+    Returns:
+        Lista com um RuleResult por regra, igual à da validação serial
+    """
+    if is_compressed(file_path):
+        logger.info(f"{file_path} é compactado: validando em uma única passada")
+        with open_text(file_path, encoding) as file:
+            reader = csv.DictReader(file, delimiter=';')
+            return run_rules(reader.fieldnames or [], reader, rules)
+
+    workers = workers or os.cpu_count() or 1
+    headers, data_start = read_header(file_path, encoding)
+
+    for rule in rules:
+        rule.check_headers(headers)
+
+    row_rules = [rule for rule in rules if rule.needs_rows and not rule.error]
+    ranges = split_byte_ranges(file_path, data_start, chunks or workers * 4) if row_rules else []
+
+    if ranges:
+        logger.info(f"Validando {file_path} em {len(ranges)} faixas com {workers} processos")
+        # Cada tarefa leva sua própria cópia das regras ainda sem linhas validadas.
+        # A cópia é feita antes de enviar, pois o envio ao pool é assíncrono e o
+        # merge altera as regras originais.
+        tasks = [(file_path, encoding, headers, start, end, copy.deepcopy(row_rules)) for start, end in ranges]
+        row_offset = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for row_count, chunk_rules in executor.map(_validate_chunk, tasks):
+                for rule, chunk_rule in zip(row_rules, chunk_rules):
+                    rule.merge(chunk_rule, row_offset)
+                row_offset += row_count
+
+    results = [rule.result() for rule in rules]
+    log_results(results)
+    return results
@@ -0,0 +1,67 @@
+"""
+Projeção de colunas na leitura de exportações CSV.
+
+A maioria das verificações usa três ou quatro das 45 colunas da exportação.
+Com a projeção, cada linha lida pelo csv.reader vira apenas a tupla com os
+valores das colunas pedidas (itemgetter, sem laço em Python por coluna); as
+demais colunas não entram em dicionários nem em listas por coluna. Isso evita
+guardar as colunas de texto livre (ex: "Informacoes Adicionais",
+"Mensagem de erro") quando elas não são usadas.
+
+Usado por CSVValidator(columns=...) e ColumnarTable.from_csv(columns=...).
+
+Uso básico:
+    names, rows = project_rows(reader, headers, ["Status da cobranca", "Bandeira"])
+    for values in rows:
+        dict(zip(names, values))
+"""
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def projected_columns(headers: Sequence[str], columns: Iterable[str]) -> List[str]:
+    """
+    Colunas da projeção que existem no header, sem repetição e na ordem pedida.
+
+    Colunas ausentes no arquivo são ignoradas (a falta delas é reportada pelas
+    validações de header, não pela leitura).
+    """
+    available = set(headers)
+    return [name for name in dict.fromkeys(columns) if name in available]
+
+
+def _iter_projected(rows: Iterable[List[str]], positions: List[int]) -> Iterator[Tuple[Optional[str], ...]]:
+    if not positions:
+        for row in rows:
+            if row:
+                yield ()
+        return
+
+    getter = itemgetter(*positions)
+    needed = max(positions) + 1
+    single = len(positions) == 1
+    for row in rows:
+        if not row:
+            continue  # Linhas em branco são ignoradas, como no DictReader
+        if len(row) < needed:
+            row = row + [None] * (needed - len(row))  # Colunas faltando ficam como None
+        yield (getter(row),) if single else getter(row)
+
+
+def project_rows(rows: Iterable[List[str]], headers: Sequence[str],
+                 columns: Iterable[str]) -> Tuple[List[str], Iterator[Tuple[Optional[str], ...]]]:
+    """
+    Reduz as linhas de um csv.reader às colunas pedidas.
+
+    Args:
+        rows: Linhas como listas de valores (csv.reader, já sem o header)
+        headers: Header do arquivo
+        columns: Colunas desejadas
+
+    Returns:
+        Tupla (nomes das colunas projetadas, gerador de tuplas com os valores na ordem dos nomes)
+    """
+    names = projected_columns(headers, columns)
+    # Com colunas repetidas no header vale a última ocorrência, como no DictReader
+    position = {name: index for index, name in enumerate(headers)}
+    return names, _iter_projected(rows, [position[name] for name in names])
@@ -0,0 +1,410 @@
+"""
+Motor de regras para validação de exportações CSV em uma única passada.
+
+Cada regra recebe os headers uma vez e depois cada linha do arquivo. O motor
+percorre as linhas apenas uma vez, independente de quantas regras forem
+usadas, e devolve um RuleResult por regra.
+
+Uso básico:
+    rules = [
+        HeadersRule(),
+        HasRowsRule(),
+        StatusEnumRule(),
+        DateFormatRule("Data da cobranca"),
+        ExpectedStatusRule("Pendente"),
+    ]
+    results = CSVValidator("arquivo.csv").validate_rules(rules)
+    assert all(result.passed for result in results)
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from tests.utils.csv_dates import is_valid_date
+from tests.utils.csv_index import HashIndex
+from tests.utils.csv_values import is_empty
+
+logger = logging.getLogger(__name__)
+
+STATUS_COLUMN = "Status da cobranca"
+
+# Status de cobrança aceitos pelo portal
+VALID_STATUSES = [
+    "Pendente",
+    "Paga",
+    "Cancelada",
+    "Estornada",
+    "Negada",
+    "Expirada",
+    "Em processamento",
+    "Autorizada",
+    "Não Autorizada",
+    "Tempo expirado"
+]
+
+
+@dataclass
+class RuleResult:
+    """
+    Resultado estruturado de uma regra.
+
+    Atributos:
+        rule: Nome da regra
+        passed: True se a regra passou
+        message: Descrição do resultado
+        checked_rows: Quantidade de linhas verificadas
+        failed_rows: Quantidade de linhas que falharam
+        samples: Primeiras falhas encontradas como (número da linha, valor).
+                 A linha 1 é a primeira linha de dados (após o header).
+        details: Informações extras específicas de cada regra
+    """
+    rule: str
+    passed: bool
+    message: str
+    checked_rows: int = 0
+    failed_rows: int = 0
+    samples: List[Tuple[int, Any]] = field(default_factory=list)
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+class Rule:
+    """
+    Classe base das regras.
+
+    Subclasses implementam check_headers e/ou check_row e registram as falhas
+    com _fail. As regras guardam estado, então cada instância deve ser usada
+    em apenas uma validação.
+
+    Para a validação paralela (csv_parallel.py), cada pedaço do arquivo é
+    validado por uma cópia da regra e as cópias são combinadas com merge,
+    na ordem do arquivo. Subclasses com estado extra devem estender merge.
+    """
+    name = "rule"
+    needs_rows = True  # False para regras que só dependem dos headers
+    max_samples = 5
+
+    def __init__(self):
+        self.checked_rows = 0
+        self.failed_rows = 0
+        self.samples: List[Tuple[int, Any]] = []
+        self.error: Optional[str] = None  # Falha estrutural (ex: coluna ausente)
+
+    def check_headers(self, headers: Sequence[str]):
+        """Recebe os headers do arquivo antes das linhas."""
+
+    def check_row(self, row_number: int, row: Dict[str, Any]):
+        """Recebe cada linha de dados do arquivo."""
+
+    def _require_column(self, headers: Sequence[str], column: str):
+        """Registra falha estrutural se a coluna não existir no CSV."""
+        if column not in headers:
+            self.error = f"Coluna '{column}' não encontrada no CSV"
+
+    def _fail(self, row_number: int, value: Any):
+        """Registra uma linha com falha, guardando as primeiras amostras."""
+        self.failed_rows += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((row_number, value))
+
+    def merge(self, other: "Rule", row_offset: int):
+        """
+        Combina o estado de uma cópia desta regra que validou o pedaço seguinte do arquivo.
+
+        Args:
+            other: Cópia da regra que validou o pedaço
+            row_offset: Quantidade de linhas antes do pedaço (ajusta os números das linhas)
+        """
+        self.checked_rows += other.checked_rows
+        self.failed_rows += other.failed_rows
+        for row_number, value in other.samples:
+            if len(self.samples) >= self.max_samples:
+                break
+            self.samples.append((row_number + row_offset, value))
+
+    def _details(self) -> Dict[str, Any]:
+        """Informações extras do resultado (sobrescrever se necessário)."""
+        return {}
+
+    def _message(self) -> str:
+        """Mensagem do resultado (sobrescrever se necessário)."""
+        if self.failed_rows:
+            return f"{self.failed_rows} linhas com falha"
+        return "OK"
+
+    def result(self) -> RuleResult:
+        """Monta o resultado final da regra."""
+        if self.error:
+            return RuleResult(self.name, False, self.error, self.checked_rows,
+                              self.failed_rows, list(self.samples), self._details())
+        return RuleResult(self.name, self.failed_rows == 0, self._message(), self.checked_rows,
+                          self.failed_rows, list(self.samples), self._details())
+
+
+class HeadersRule(Rule):
+    """Valida se o CSV contém todas as colunas esperadas."""
+    name = "headers"
+    needs_rows = False
+
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        super().__init__()
+        if columns is None:
+            from tests.utils.csv_validator import CSVValidator
+            columns = CSVValidator.EXPECTED_COLUMNS
+        self.columns = list(columns)
+        self.missing: List[str] = []
+
+    def check_headers(self, headers):
+        self.missing = [column for column in self.columns if column not in headers]
+        if self.missing:
+            self.error = f"Colunas faltando no CSV: {self.missing}"
+
+    def _details(self):
+        return {"missing_columns": self.missing}
+
+
+class HasRowsRule(Rule):
+    """Valida se o CSV contém pelo menos uma linha de dados."""
+    name = "has_rows"
+
+    def check_row(self, row_number, row):
+        self.checked_rows += 1
+
+    def _message(self):
+        return f"CSV contém {self.checked_rows} linhas de dados"
+
+    def result(self):
+        result = super().result()
+        if self.checked_rows == 0:
+            result.passed = False
+            result.message = "CSV está vazio (sem dados)"
+        return result
+
+
+class NotEmptyColumnsRule(Rule):
+    """Valida se as colunas informadas não têm valores vazios."""
+    name = "not_empty_columns"
+
+    def __init__(self, columns: Sequence[str]):
+        super().__init__()
+        self.columns = list(columns)
+        self.empty_counts: Dict[str, int] = {column: 0 for column in self.columns}
+
+    def check_headers(self, headers):
+        for column in self.columns:
+            self._require_column(headers, column)
+
+    def check_row(self, row_number, row):
+        self.checked_rows += 1
+        for column in self.columns:
+            if is_empty(row.get(column, '')):
+                self.empty_counts[column] += 1
+                self._fail(row_number, column)
+
+    def merge(self, other, row_offset):
+        super().merge(other, row_offset)
+        for column, count in other.empty_counts.items():
+            self.empty_counts[column] += count
+
+    def _details(self):
+        return {"empty_counts": {k: v for k, v in self.empty_counts.items() if v}}
+
+
+class StatusEnumRule(Rule):
+    """Valida se os status pertencem à lista de status válidos."""
+    name = "status_enum"
+
+    def __init__(self, valid_statuses: Iterable[str] = VALID_STATUSES, column: str = STATUS_COLUMN):
+        super().__init__()
+        self.valid_statuses = frozenset(valid_statuses)
+        self.column = column
+        self.invalid_values = set()
+
+    def check_headers(self, headers):
+        self._require_column(headers, self.column)
+
+    def check_row(self, row_number, row):
+        self.checked_rows += 1
+        status = row.get(self.column, '')
+        if status not in self.valid_statuses:
+            self.invalid_values.add(status)
+            self._fail(row_number, status)
+
+    def merge(self, other, row_offset):
+        super().merge(other, row_offset)
+        self.invalid_values |= other.invalid_values
+
+    def _message(self):
+        if self.failed_rows:
+            return f"Status inválidos encontrados: {self.invalid_values}"
+        return f"Todos os status são válidos. Total: {self.checked_rows}"
+
+    def _details(self):
+        return {"invalid_values": sorted(self.invalid_values, key=str)}
+
+
+class ExpectedStatusRule(Rule):
+    """Valida se TODOS os registros têm o status esperado."""
+    name = "expected_status"
+
+    def __init__(self, expected_status: str, column: str = STATUS_COLUMN):
+        super().__init__()
+        self.expected_status = expected_status
+        self.column = column
+        self.found_values = set()
+
+    def check_headers(self, headers):
+        self._require_column(headers, self.column)
+
+    def check_row(self, row_number, row):
+        self.checked_rows += 1
+        status = row.get(self.column, '')
+        if status != self.expected_status:
+            self.found_values.add(status)
+            self._fail(row_number, status)
+
+    def merge(self, other, row_offset):
+        super().merge(other, row_offset)
+        self.found_values |= other.found_values
+
+    def _message(self):
+        if self.failed_rows:
+            return f"Esperado status '{self.expected_status}', mas encontrados: {self.found_values}"
+        return f"Todos os {self.checked_rows} registros têm status '{self.expected_status}'"
+
+    def _details(self):
+        return {"unexpected_values": sorted(self.found_values, key=str)}
+
+
+class DateFormatRule(Rule):
+    """Valida se a coluna de data está em um dos formatos aceitos. Vazios são ignorados."""
+    name = "date_format"
+
+    def __init__(self, column: str):
+        super().__init__()
+        self.column = column
+        self.name = f"date_format[{column}]"
+
+    def check_headers(self, headers):
+        self._require_column(headers, self.column)
+
+    def check_row(self, row_number, row):
+        value = row.get(self.column, '')
+        if is_empty(value):
+            return
+        self.checked_rows += 1
+        if not is_valid_date(value):
+            self._fail(row_number, value)
+
+
+class ValueCountsRule(Rule):
+    """
+    Conta os valores de uma coluna (ex: distribuição de status).
+
+    Não falha por conteúdo; a contagem fica em details["counts"].
+    """
+    name = "value_counts"
+
+    def __init__(self, column: str = STATUS_COLUMN):
+        super().__init__()
+        self.column = column
+        self.name = f"value_counts[{column}]"
+        self.counts = Counter()
+
+    def check_headers(self, headers):
+        self._require_column(headers, self.column)
+
+    def check_row(self, row_number, row):
+        self.checked_rows += 1
+        self.counts[row.get(self.column, '')] += 1
+
+    def merge(self, other, row_offset):
+        super().merge(other, row_offset)
+        self.counts.update(other.counts)
+
+    def _message(self):
+        return f"{len(self.counts)} valores distintos em {self.checked_rows} linhas"
+
+    def _details(self):
+        return {"counts": dict(self.counts)}
+
+
+class UniqueColumnRule(Rule):
+    """
+    Valida se os valores de uma coluna de identificador não se repetem (ex: "ID da cobranca").
+
+    Vazios são ignorados. As amostras são as ocorrências repetidas (a partir da
+    segunda) e details["duplicates"] traz as primeiras chaves com todas as linhas.
+    """
+    name = "unique"
+
+    def __init__(self, column: str):
+        super().__init__()
+        self.column = column
+        self.name = f"unique[{column}]"
+        self.index = HashIndex(column)
+
+    def check_headers(self, headers):
+        self._require_column(headers, self.column)
+
+    def check_row(self, row_number, row):
+        self.checked_rows += 1
+        self.index.add(row.get(self.column), row_number)
+
+    def merge(self, other, row_offset):
+        super().merge(other, row_offset)
+        self.index.merge(other.index, row_offset)
+
+    def _message(self):
+        if self.failed_rows:
+            return f"{len(self.index.duplicates())} valores repetidos em {self.failed_rows} linhas"
+        return f"Todos os {self.index.indexed_rows} valores são únicos"
+
+    def _details(self):
+        duplicates = self.index.duplicates()
+        return {"duplicate_keys": len(duplicates), "duplicates": dict(list(duplicates.items())[:self.max_samples])}
+
+    def result(self):
+        duplicates = self.index.duplicates()
+        repeated = sorted((row_number, value) for value, rows in duplicates.items() for row_number in rows[1:])
+        self.failed_rows = len(repeated)
+        self.samples = repeated[:self.max_samples]
+        return super().result()
+
+
+def log_results(results: Sequence[RuleResult]):
+    """Registra no log o resultado de cada regra."""
+    for result in results:
+        if result.passed:
+            logger.info(f"Regra '{result.rule}' OK: {result.message}")
+        else:
+            logger.error(f"Regra '{result.rule}' falhou: {result.message}. Amostras: {result.samples}")
+
+
+def run_rules(headers: Sequence[str], rows: Iterable[Dict[str, Any]], rules: Sequence[Rule]) -> List[RuleResult]:
+    """
+    Executa todas as regras em uma única passada pelas linhas.
+
+    Regras com falha estrutural (ex: coluna ausente) e regras que só dependem
+    dos headers não recebem as linhas. Se nenhuma regra precisar das linhas,
+    o arquivo não é percorrido.
+
+    Args:
+        headers: Nomes das colunas do CSV
+        rows: Linhas do CSV (lista ou gerador de dicionários)
+        rules: Regras a serem executadas
+
+    Returns:
+        Lista com um RuleResult por regra, na mesma ordem das regras
+    """
+    for rule in rules:
+        rule.check_headers(headers)
+
+    row_rules = [rule for rule in rules if rule.needs_rows and not rule.error]
+    if row_rules:
+        for row_number, row in enumerate(rows, start=1):
+            for rule in row_rules:
+                rule.check_row(row_number, row)
+
+    results = [rule.result() for rule in rules]
+    log_results(results)
+    return results
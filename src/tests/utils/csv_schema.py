@@ -0,0 +1,310 @@
+"""
+Schema declarativo da exportação de transações.
+
+Cada uma das 45 colunas da exportação é descrita por um ColumnSpec (tipo,
+se aceita vazio, valores permitidos e expressão regular). O schema é compilado
+uma única vez em uma função de verificação por coluna:
+
+- as regras da coluna (enum, regex do tipo, data) viram uma única função;
+- colunas sem regra e que aceitam vazio não são verificadas;
+- cada coluna guarda o resultado dos valores já vistos (até CACHE_SIZE valores),
+  então colunas repetitivas (status, Bandeira, valores) custam uma consulta a
+  um dicionário por célula, sem regex.
+
+Para incluir uma coluna ou um valor de enum basta alterar uma linha do schema.
+
+Uso básico:
+    result = CSVValidator("arquivo.csv").validate_schema()
+    result = CSVValidator("arquivo.csv").validate_rules([SchemaRule(), HasRowsRule()])
+"""
+from collections import Counter
+from dataclasses import dataclass
+import csv
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from tests.utils.csv_compression import open_text
+from tests.utils.csv_dates import is_valid_date
+from tests.utils.csv_rules import VALID_STATUSES, Rule, RuleResult
+
+# Tipos de coluna
+TEXT = "text"
+INTEGER = "integer"
+MONEY = "money"
+DATE = "date"
+UUID = "uuid"
+
+_TYPE_PATTERNS = {
+    INTEGER: r"\d+",
+    MONEY: r"-?\d+,\d{2}",  # Formato da exportação, ex: 200,00 (sem separador de milhar)
+    UUID: r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+}
+
+# Quantidade máxima de valores com resultado guardado por coluna
+CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    Descrição de uma coluna da exportação.
+
+    Atributos:
+        name: Nome da coluna (como no header)
+        type: TEXT, INTEGER, MONEY, DATE ou UUID
+        nullable: Se aceita valor vazio
+        enum: Valores permitidos (None = qualquer valor)
+        pattern: Expressão regular que o valor inteiro deve casar (além do tipo)
+    """
+    name: str
+    type: str = TEXT
+    nullable: bool = True
+    enum: Optional[Tuple[str, ...]] = None
+    pattern: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Schema:
+    """
+    Lista de colunas da exportação.
+
+    Atributos:
+        columns: ColumnSpec de cada coluna, na ordem do arquivo
+        allow_extra_columns: Se False, colunas fora do schema são falha estrutural
+    """
+    columns: Tuple[ColumnSpec, ...]
+    allow_extra_columns: bool = False
+
+    def __post_init__(self):
+        object.__setattr__(self, "columns", tuple(self.columns))
+
+    @property
+    def names(self) -> List[str]:
+        return [spec.name for spec in self.columns]
+
+
+def compile_column(spec: ColumnSpec) -> Optional[Callable[[Optional[str]], bool]]:
+    """
+    Compila as regras de uma coluna em uma única função valor -> válido.
+
+    Returns:
+        Função de verificação, ou None se a coluna aceitar qualquer valor
+    """
+    checks = []
+    if spec.enum is not None:
+        checks.append(frozenset(spec.enum).__contains__)
+    for pattern in (_TYPE_PATTERNS.get(spec.type), spec.pattern):
+        if pattern:
+            checks.append(re.compile(pattern).fullmatch)
+    if spec.type == DATE:
+        checks.append(is_valid_date)
+
+    if not checks and spec.nullable:
+        return None
+
+    nullable = spec.nullable
+    cache: Dict[Optional[str], bool] = {}
+
+    def is_valid(value: Optional[str]) -> bool:
+        result = cache.get(value)
+        if result is None:
+            result = all(check(value) for check in checks) if value else nullable
+            if len(cache) < CACHE_SIZE:
+                cache[value] = result
+        return result
+
+    return is_valid
+
+
+_UUID_OR_NA = "N/A|" + _TYPE_PATTERNS[UUID]
+
+# Schema das 45 colunas da exportação de transações (TRANSAÇÕES_<início>_<fim>.csv)
+TRANSACTION_EXPORT_SCHEMA = Schema((
+    ColumnSpec("Data da cobranca", DATE, nullable=False),
+    ColumnSpec("Data da Captura/Pagamento", DATE),
+    ColumnSpec("Status da cobranca", nullable=False, enum=tuple(VALID_STATUSES)),
+    ColumnSpec("ID da cobranca", UUID, nullable=False),
+    ColumnSpec("ID definido pela Loja"),
+    ColumnSpec("Nome da loja", nullable=False),
+    ColumnSpec("Código da Loja", nullable=False, pattern=r"\d{11}|\d{14}"),
+    ColumnSpec("ID do estabelecimento", UUID, nullable=False),
+    ColumnSpec("Nome do cliente", nullable=False),
+    ColumnSpec("Documento do cliente", nullable=False, pattern=r"N/A|\d{11}|\d{14}"),
+    ColumnSpec("TID", INTEGER, nullable=False),
+    ColumnSpec("NSU", INTEGER),
+    ColumnSpec("Status da transação", nullable=False),
+    ColumnSpec("Meio de captura", nullable=False, enum=(
+        "Gateway", "ThirdPartyEcommerce", "PaymentLink", "Checkout", "Pinpad", "SmartPos", "Pos", "Tef",
+    )),
+    ColumnSpec("Tipo de venda", nullable=False, enum=("Crédito", "Débito", "Boleto", "Pix", "Voucher")),
+    ColumnSpec("Valor total da cobrança", MONEY, nullable=False),
+    ColumnSpec("Valor da transação", MONEY, nullable=False),
+    ColumnSpec("Número de parcelas", INTEGER, nullable=False),
+    ColumnSpec("Número de Série"),
+    ColumnSpec("Portador do cartao"),
+    ColumnSpec("Bandeira", enum=(
+        "MasterCard", "Visa", "Elo", "Amex", "Hipercard", "Hiper", "Diners", "Discover", "JCB", "Cabal",
+    )),
+    ColumnSpec("Numero do cartao", pattern=r"\d{6}\*{6}\d{4}"),
+    ColumnSpec("Bin", pattern=r"\d{6}"),
+    ColumnSpec("Modo de entrada do cartao", enum=("Contactless", "Chip", "Tarja", "Digitado", "Fallback")),
+    ColumnSpec("Adquirente", nullable=False),
+    ColumnSpec("Processado Por", nullable=False),
+    ColumnSpec("Estabelecimento Comercial"),
+    ColumnSpec("Estabelecimento pai", nullable=False),
+    ColumnSpec("Parceiro", nullable=False),
+    ColumnSpec("ID do vendedor", nullable=False, pattern=_UUID_OR_NA),
+    ColumnSpec("Vendedor"),
+    ColumnSpec("Acordo", nullable=False),
+    ColumnSpec("Comissao", MONEY, nullable=False),
+    ColumnSpec("Valor do frete", MONEY),
+    ColumnSpec("Plano de parcelamento", nullable=False, enum=("À vista", "Parcelado")),
+    ColumnSpec("Código de autorização", pattern=r"[0-9A-Za-z]+"),
+    ColumnSpec("ID do SmartCheckout", UUID),
+    ColumnSpec("Código de barras", pattern=r"\d{44,48}"),
+    ColumnSpec("Data de vencimento", DATE),
+    ColumnSpec("Informacoes Adicionais"),
+    ColumnSpec("Mensagem de erro"),
+    ColumnSpec("Codigo de erro"),
+    ColumnSpec("Negada"),
+    ColumnSpec("Cnpj da Fonte Pagadora"),
+    ColumnSpec("Ordens de Transferencia"),
+))
+
+
+class SchemaRule(Rule):
+    """
+    Valida todas as colunas de acordo com o schema (padrão: TRANSACTION_EXPORT_SCHEMA).
+
+    Colunas do schema ausentes no CSV (ou colunas fora do schema, se
+    allow_extra_columns for False) são falha estrutural. As amostras trazem
+    (linha, {coluna: valor}) e details["failures_by_column"] a contagem por coluna.
+
+    Além do check_row usado pelo motor de regras, aceita linhas como listas
+    (check_values / validate_file) e a ColumnarTable (validate_table), onde
+    cada valor distinto é verificado uma única vez.
+    """
+    name = "schema"
+
+    def __init__(self, schema: Schema = TRANSACTION_EXPORT_SCHEMA):
+        super().__init__()
+        self.schema = schema
+        self.headers: List[str] = []
+        self.failures_by_column = Counter()
+        self._checks: List[Tuple[int, str, Callable]] = []
+
+    def check_headers(self, headers):
+        self.headers = list(headers)
+        missing = [name for name in self.schema.names if name not in self.headers]
+        extra = [name for name in self.headers if name not in self.schema.names]
+        if missing:
+            self.error = f"Colunas do schema ausentes no CSV: {missing}"
+        elif extra and not self.schema.allow_extra_columns:
+            self.error = f"Colunas fora do schema: {extra}"
+        self._compile()
+
+    def _compile(self):
+        """Compila as verificações das colunas presentes, com a posição de cada uma no header."""
+        position = {name: index for index, name in enumerate(self.headers)}
+        self._checks = []
+        for spec in self.schema.columns:
+            is_valid = compile_column(spec)
+            if is_valid is not None and spec.name in position:
+                self._checks.append((position[spec.name], spec.name, is_valid))
+
+    def __getstate__(self):
+        # As funções compiladas não são serializáveis (validação paralela); são recompiladas na cópia
+        state = self.__dict__.copy()
+        state["_checks"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def _record(self, row_number: int, failed: Dict[str, Any]):
+        self.failures_by_column.update(failed.keys())
+        self._fail(row_number, failed)
+
+    def check_row(self, row_number, row):
+        self.checked_rows += 1
+        failed = {name: row.get(name) for _, name, is_valid in self._checks if not is_valid(row.get(name))}
+        if None in row:
+            failed[None] = row[None]  # Valores além das colunas do header
+        if failed:
+            self._record(row_number, failed)
+
+    def check_values(self, row_number: int, values: Sequence[str]):
+        """Mesmo que check_row, para a linha como lista de valores (csv.reader)."""
+        self.checked_rows += 1
+        width = len(values)
+        failed = {
+            name: values[index] if index < width else None
+            for index, name, is_valid in self._checks
+            if not is_valid(values[index] if index < width else None)
+        }
+        if width > len(self.headers):
+            failed[None] = list(values[len(self.headers):])
+        if failed:
+            self._record(row_number, failed)
+
+    def validate_file(self, file_path: str, encoding: str = 'iso-8859-1') -> RuleResult:
+        """
+        Valida o arquivo lendo as linhas como listas (sem montar dicionários).
+
+        Aceita também exportações compactadas (.csv.gz e .zip).
+
+        Returns:
+            RuleResult da regra
+        """
+        with open_text(file_path, encoding) as file:
+            reader = csv.reader(file, delimiter=';')
+            self.check_headers(next(reader, []))
+            if not self.error:
+                row_number = 0
+                for values in reader:
+                    if values:  # Linhas em branco são ignoradas, como no DictReader
+                        row_number += 1
+                        self.check_values(row_number, values)
+        return self.result()
+
+    def validate_table(self, table: Any) -> RuleResult:
+        """
+        Valida uma ColumnarTable verificando cada valor distinto de cada coluna uma única vez.
+
+        Returns:
+            RuleResult da regra (mesmo resultado da validação linha a linha)
+        """
+        self.check_headers(table.headers)
+        if self.error:
+            return self.result()
+
+        self.checked_rows = len(table)
+        bad_columns = []
+        for _, name, is_valid in self._checks:
+            view = table.column(name)
+            bad_codes = {code for code, value in enumerate(view.categories) if not is_valid(value)}
+            if bad_codes:
+                bad_columns.append((name, view, bad_codes))
+
+        failures: Dict[int, Dict[str, Any]] = {}
+        for name, view, bad_codes in bad_columns:
+            for position, code in enumerate(view.codes):
+                if code in bad_codes:
+                    failures.setdefault(position, {})[name] = view.categories[code]
+        for position, extra in table.extra_fields.items():
+            failures.setdefault(position, {})[None] = extra  # Valores além das colunas do header
+        for position in sorted(failures):
+            self._record(position + 1, failures[position])
+        return self.result()
+
+    def merge(self, other, row_offset):
+        super().merge(other, row_offset)
+        self.failures_by_column.update(other.failures_by_column)
+
+    def _message(self):
+        if self.failed_rows:
+            return f"{self.failed_rows} linhas fora do schema. Colunas: {dict(self.failures_by_column)}"
+        return f"Todas as {self.checked_rows} linhas seguem o schema"
+
+    def _details(self):
+        return {"failures_by_column": dict(self.failures_by_column)}
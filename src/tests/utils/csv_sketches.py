@@ -0,0 +1,360 @@
+"""
+Sketches de memória limitada para o resumo de exportações grandes.
+
+- KLLSketch: quantis aproximados (ex: p50/p95/p99 do valor da transação).
+  Guarda no máximo ~3k valores (k = 200), independente da quantidade de
+  linhas. Erro de posto (rank) da ordem de 1,7/k (k = 200 -> ~1%).
+- HyperLogLog: quantidade aproximada de valores distintos (lojas, clientes,
+  cartões). Usa 2^precision registradores de 1 byte (precision = 14 -> 16 KB)
+  com erro relativo típico de 1,04/sqrt(2^precision) (~0,8%). Até algumas
+  centenas de valores distintos a estimativa é praticamente exata.
+- ExportSketches: reúne os sketches das colunas da exportação e é alimentado
+  com as linhas em uma única passada (ou com os valores distintos e suas
+  contagens, no modo columnar).
+
+Os sketches são determinísticos: a mesma sequência de valores e o mesmo seed
+geram sempre o mesmo resultado. Dois sketches podem ser combinados com merge
+(ex: resultados de partes do arquivo).
+
+Uso básico:
+    summary = CSVValidator("arquivo.csv", mode=CSVValidator.MODE_STREAMING).get_summary(include_sketches=True)
+    summary["sketches"]["value_quantiles"]  # {"p50": 20000, "p95": 180411, "p99": 355500} (centavos)
+"""
+import hashlib
+import math
+import random
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+from tests.utils.csv_dates import parse_timestamp
+from tests.utils.csv_money import parse_cents
+
+DEFAULT_K = 200
+DEFAULT_PRECISION = 14
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Colunas usadas no resumo
+VALUE_COLUMN = "Valor da transação"
+DATE_COLUMN = "Data da cobranca"
+DISTINCT_COLUMNS = {
+    "merchants": "ID do estabelecimento",
+    "customers": "Documento do cliente",
+    "cards": "Numero do cartao",
+}
+# Valores que não identificam um cliente/cartão e não entram nas contagens de distintos
+_NOT_A_VALUE = frozenset(("", "N/A", None))
+
+# Quantidade máxima de valores com conversão ou hash guardados (valores repetem muito)
+_MEMO_SIZE = 4096
+
+
+class KLLSketch:
+    """
+    Sketch KLL (Karnin, Lang e Liberty) para quantis aproximados.
+
+    Cada nível h guarda itens que representam 2^h valores. Quando o sketch
+    passa da capacidade, um nível é ordenado e metade dos itens (posições
+    pares ou ímpares, por sorteio) sobe para o nível seguinte.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = 0):
+        """
+        Args:
+            k: Parâmetro de precisão (maior = mais preciso e mais memória)
+            seed: Semente do sorteio das compactações
+
+        Raises:
+            ValueError: Se k < 8
+        """
+        if k < 8:
+            raise ValueError(f"k deve ser pelo menos 8: {k}")
+        self.k = k
+        self.count = 0
+        self._compactors: List[list] = []
+        self._size = 0
+        self._max_size = 0
+        self._random = random.Random(seed).random
+        self._grow()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self):
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def add(self, value: Any, count: int = 1):
+        """
+        Adiciona um valor (com peso count, ex: contagem de um valor distinto).
+
+        O peso é decomposto em potências de 2: cada bit ligado vira um item no
+        nível correspondente, então um valor com contagem n custa O(log n).
+        """
+        self.count += count
+        level = 0
+        while count:
+            if count & 1:
+                while level >= len(self._compactors):
+                    self._grow()
+                self._compactors[level].append(value)
+                self._size += 1
+            count >>= 1
+            level += 1
+        while self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        for level, items in enumerate(self._compactors):
+            if len(items) >= self._capacity(level):
+                if level + 1 >= len(self._compactors):
+                    self._grow()
+                items.sort()
+                offset = 1 if self._random() < 0.5 else 0
+                # Com quantidade ímpar, o último item fica no nível
+                last = items.pop() if len(items) % 2 else None
+                self._compactors[level + 1].extend(items[offset::2])
+                items.clear()
+                if last is not None:
+                    items.append(last)
+                self._size = sum(len(level_items) for level_items in self._compactors)
+                if self._size < self._max_size:
+                    return
+        if self._size >= self._max_size:
+            self._grow()  # Todos os níveis abaixo da capacidade: aumenta a capacidade total
+
+    def merge(self, other: "KLLSketch"):
+        """Combina outro sketch (mesmo k) neste."""
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for level, items in enumerate(other._compactors):
+            self._compactors[level].extend(items)
+        self.count += other.count
+        self._size = sum(len(items) for items in self._compactors)
+        while self._size >= self._max_size:
+            self._compress()
+
+    def _weighted_items(self) -> List[Tuple[Any, int]]:
+        return sorted((item, 1 << level) for level, items in enumerate(self._compactors) for item in items)
+
+    def quantiles(self, fractions: Sequence[float] = DEFAULT_QUANTILES) -> List[Any]:
+        """
+        Quantis aproximados.
+
+        Args:
+            fractions: Frações entre 0 e 1 (ex: 0.95 = p95)
+
+        Returns:
+            Valor de cada quantil (None se o sketch estiver vazio)
+        """
+        items = self._weighted_items()
+        total = sum(weight for _, weight in items)
+        results = []
+        for fraction in fractions:
+            if not items:
+                results.append(None)
+                continue
+            target = fraction * total
+            cumulative = 0
+            chosen = items[-1][0]
+            for item, weight in items:
+                cumulative += weight
+                if cumulative >= target:
+                    chosen = item
+                    break
+            results.append(chosen)
+        return results
+
+    def __len__(self) -> int:
+        """Itens guardados (memória usada), não a quantidade de valores adicionados."""
+        return self._size
+
+
+def _hash64(value: Hashable) -> int:
+    """Hash estável de 64 bits (o hash() do Python muda a cada processo)."""
+    data = value.encode("utf-8") if isinstance(value, str) else repr(value).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    Contagem aproximada de valores distintos (Flajolet et al.).
+
+    Os primeiros `precision` bits do hash escolhem o registrador e o registrador
+    guarda a maior posição do primeiro bit 1 no restante do hash.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        """
+        Args:
+            precision: Bits de endereçamento (4 a 18); usa 2^precision bytes
+
+        Raises:
+            ValueError: Se a precisão estiver fora do intervalo
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision deve estar entre 4 e 18: {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        # Valores vistos recentemente não mudam os registradores; evita recalcular o hash
+        self._recent = set()
+
+    def add(self, value: Hashable):
+        """Adiciona um valor."""
+        if value in self._recent:
+            return
+        if len(self._recent) >= _MEMO_SIZE:
+            self._recent.clear()
+        self._recent.add(value)
+
+        hashed = _hash64(value)
+        bits = 64 - self.precision
+        index = hashed >> bits
+        remainder = hashed & ((1 << bits) - 1)
+        rank = bits - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        """Combina outro HyperLogLog (mesma precisão) neste."""
+        if other.precision != self.precision:
+            raise ValueError("Só é possível combinar HyperLogLog com a mesma precisão")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Estimativa da quantidade de valores distintos."""
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)  # Correção para poucos valores (linear counting)
+        return int(round(estimate))
+
+
+class ExportSketches:
+    """
+    Sketches das colunas da exportação, alimentados em uma única passada.
+
+    Calcula os quantis da coluna de valor (em centavos), a quantidade
+    aproximada de valores distintos das colunas de DISTINCT_COLUMNS e a menor
+    e a maior data da coluna de data. Colunas ausentes no arquivo são ignoradas.
+    """
+
+    def __init__(self, headers: Sequence[str], k: int = DEFAULT_K, precision: int = DEFAULT_PRECISION,
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES, value_column: str = VALUE_COLUMN,
+                 date_column: str = DATE_COLUMN, distinct_columns: Optional[Dict[str, str]] = None, seed: int = 0):
+        """
+        Args:
+            headers: Colunas do arquivo
+            k: Precisão dos quantis (KLLSketch)
+            precision: Precisão das contagens de distintos (HyperLogLog)
+            quantiles: Frações reportadas (padrão: p50, p95, p99)
+            value_column: Coluna de valor em reais
+            date_column: Coluna de data
+            distinct_columns: {nome no resumo: coluna} (padrão: DISTINCT_COLUMNS)
+            seed: Semente das compactações do KLLSketch
+        """
+        distinct_columns = DISTINCT_COLUMNS if distinct_columns is None else distinct_columns
+        self.quantile_fractions = tuple(quantiles)
+        self.value_column = value_column if value_column in headers else None
+        self.date_column = date_column if date_column in headers else None
+        self.distinct_columns = {name: column for name, column in distinct_columns.items() if column in headers}
+        self.values = KLLSketch(k, seed)
+        self.distinct = {name: HyperLogLog(precision) for name in self.distinct_columns}
+        self.invalid_values = 0
+        self.first_timestamp: Optional[int] = None
+        self.last_timestamp: Optional[int] = None
+        self._cents: Dict[Optional[str], Optional[int]] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        """Colunas lidas, na ordem esperada por add_row."""
+        columns = [self.value_column, self.date_column, *self.distinct_columns.values()]
+        return [column for column in columns if column is not None]
+
+    def add_value(self, value: Optional[str], count: int = 1):
+        """Adiciona um valor da coluna de valor (ex: "200,00")."""
+        if value in self._cents:
+            cents = self._cents[value]
+        else:
+            cents = parse_cents(value)
+            if len(self._cents) >= _MEMO_SIZE:
+                self._cents.clear()
+            self._cents[value] = cents
+        if cents is not None:
+            self.values.add(cents, count)
+        elif value:
+            self.invalid_values += count
+
+    def add_date(self, value: Optional[str]):
+        """Adiciona uma data da coluna de data (datas inválidas ou vazias são ignoradas)."""
+        timestamp = parse_timestamp(value)
+        if timestamp is None:
+            return
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+    def add_distinct(self, name: str, value: Optional[str]):
+        """Adiciona um valor de uma coluna de distintos (vazio e N/A são ignorados)."""
+        if value not in _NOT_A_VALUE:
+            self.distinct[name].add(value)
+
+    def add_row(self, values: Sequence[Optional[str]]):
+        """Adiciona uma linha com os valores na ordem de self.columns."""
+        position = 0
+        if self.value_column is not None:
+            self.add_value(values[0])
+            position = 1
+        if self.date_column is not None:
+            self.add_date(values[position])
+            position += 1
+        for name, value in zip(self.distinct_columns, values[position:]):
+            self.add_distinct(name, value)
+
+    def add_value_counts(self, column: str, counts: Iterable[Tuple[Optional[str], int]]):
+        """
+        Adiciona os valores distintos de uma coluna com as suas contagens (modo columnar).
+
+        Equivale a chamar add_row para cada linha, olhando cada valor distinto uma vez.
+        """
+        names = [name for name, distinct_column in self.distinct_columns.items() if distinct_column == column]
+        for value, count in counts:
+            if column == self.value_column:
+                self.add_value(value, count)
+            if column == self.date_column:
+                self.add_date(value)
+            for name in names:
+                self.add_distinct(name, value)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Resumo dos sketches.
+
+        Returns:
+            Dicionário com:
+            - value_column / value_quantiles: quantis em centavos ({"p50": ..., "p95": ..., "p99": ...})
+            - invalid_values: valores fora do formato na coluna de valor
+            - distinct: quantidade aproximada de distintos por nome de DISTINCT_COLUMNS
+            - first_date / last_date: menor e maior data (DD/MM/YYYY HH:MM:SS) e os timestamps
+        """
+        quantiles = self.values.quantiles(self.quantile_fractions)
+        return {
+            "value_column": self.value_column,
+            "value_quantiles": {
+                f"p{fraction * 100:g}": value for fraction, value in zip(self.quantile_fractions, quantiles)
+            },
+            "invalid_values": self.invalid_values,
+            "distinct": {name: sketch.count() for name, sketch in self.distinct.items()},
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "first_date": _format_timestamp(self.first_timestamp),
+            "last_date": _format_timestamp(self.last_timestamp),
+        }
+
+
+def _format_timestamp(timestamp: Optional[int]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return time.strftime("%d/%m/%Y %H:%M:%S", time.gmtime(timestamp))
@@ -7,14 +7,55 @@ Este módulo fornece a classe CSVValidator que permite:
 - Validar conteúdo (status, datas, valores não vazios)
 - Extrair dados específicos (valores de colunas)
 - Gerar resumos estatísticos
+- Processar arquivos grandes em modo streaming (memória constante)
+- Executar várias regras de validação em uma única passada (validate_rules)
+- Guardar os dados em formato colunar compacto (modo columnar)
+- Converter e agregar colunas de valores em reais (centavos inteiros)
+- Agrupar por uma ou mais colunas com vários agregados em uma única passada (group_by)
+- Buscar linhas por identificador em O(1) com índices hash e detectar chaves duplicadas
+- Validar todas as colunas contra o schema declarativo da exportação (validate_schema)
+- Verificar a consistência de Bandeira, número mascarado e Bin (validate_cards)
+- Carregar apenas as colunas usadas pelas verificações (projeção de colunas)
+- Ler exportações compactadas (.csv.gz e .zip) sem descompactar em disco
+- Resumir quantis de valor, distintos e período com sketches de memória limitada
 """
 import csv
-from datetime import date
-from nt import device_encoding
+from collections import Counter, deque
+from contextlib import closing
+from operator import itemgetter
 import os
 import logging
-import re
-from typing import List, Dict, Any, ValuesView
+from array import array
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
+from tests.utils.csv_cache import ParseCache
+from tests.utils.csv_cards import CARD_COLUMNS, CardConsistencyRule
+from tests.utils.csv_columnar import ColumnarTable
+from tests.utils.csv_compression import is_compressed, open_text
+from tests.utils.csv_mmap import MappedCSVReader
+from tests.utils.csv_parallel import read_header, validate_rules_parallel
+from tests.utils.csv_projection import project_rows
+from tests.utils.csv_dates import check_date_range, parse_file_date_range, to_timestamps, validate_dates
+from tests.utils.csv_groupby import (
+    Aggregate,
+    GroupAccumulator,
+    GroupBy,
+    count_combinations,
+    group_counts,
+    required_columns,
+)
+from tests.utils.csv_index import HashIndex, indexed
+from tests.utils.csv_money import (
+    MoneyStats,
+    count_values,
+    money_stats,
+    money_stats_by,
+    stream_money_stats,
+    stream_money_stats_by,
+    to_cents,
+)
+from tests.utils.csv_rules import Rule, RuleResult, VALID_STATUSES, is_empty, run_rules
+from tests.utils.csv_sketches import DEFAULT_K, DEFAULT_PRECISION, ExportSketches
+from tests.utils.csv_schema import TRANSACTION_EXPORT_SCHEMA, Schema, SchemaRule
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +68,34 @@ class CSVValidator:
         validator.validate_headers()  # Valida se tem as colunas esperadas
         validator.validate_not_empty()  # Valida se tem dados
         validator.validate_status_values()  # Valida se os status são válidos
+
+    Para exportações muito grandes, use o modo streaming. Nele as linhas não
+    são guardadas em memória: cada validação percorre o arquivo com um gerador.
+        validator = CSVValidator("caminho/do/arquivo.csv", mode=CSVValidator.MODE_STREAMING)
+
+    Para várias verificações sobre o mesmo arquivo, o modo columnar guarda uma
+    lista por coluna com os valores repetidos compartilhados (ver csv_columnar.py).
+    Contagens e validações por coluna passam a olhar apenas os valores distintos.
+        validator = CSVValidator("caminho/do/arquivo.csv", mode=CSVValidator.MODE_COLUMNAR)
+
+    Com cache=True a tabela colunar é gravada em disco (ver csv_cache.py) e as
+    próximas aberturas do mesmo arquivo não precisam ler o CSV de novo.
+
+    Quando as verificações usam poucas colunas, declare-as em columns: as linhas
+    (e a tabela colunar) guardam só essas colunas, sem montar dicionários com as
+    demais (ver csv_projection.py). headers continua com todas as colunas do arquivo.
+        validator = CSVValidator("caminho/do/arquivo.csv", columns=["Status da cobranca", "Data da cobranca"])
+
+    Exportações arquivadas podem ser validadas direto do .csv.gz ou .zip: a
+    descompactação é feita aos poucos durante a leitura (ver csv_compression.py).
+        validator = CSVValidator("TRANSAÇÕES_2025-11-20_2025-11-27.csv.gz")
     """
+    # Modos de leitura
+    MODE_MEMORY = "memory"  # Carrega todas as linhas em self.data (padrão)
+    MODE_STREAMING = "streaming"  # Percorre o arquivo a cada validação, sem guardar linhas
+    MODE_COLUMNAR = "columnar"  # Carrega os dados em self.table (ColumnarTable)
+    MODES = (MODE_MEMORY, MODE_STREAMING, MODE_COLUMNAR)
+
     EXPECTED_COLUMNS = [
         "Data da cobranca",
         "Data da Captura/Pagamento",
@@ -48,28 +116,70 @@ class CSVValidator:
         "Valor da transação",
         "Número de parcelas",        
     ]
+
+    # Status de cobrança aceitos (ver tests/utils/csv_rules.py)
+    VALID_STATUSES = VALID_STATUSES
+
+    # Colunas de valores em reais com vírgula decimal (ver tests/utils/csv_money.py)
+    MONEY_COLUMNS = [
+        "Valor total da cobrança",
+        "Valor da transação",
+        "Comissao",
+        "Valor do frete",
+    ]
     
-    def __init__(self, file_path: str, encoding: str = 'iso-8859-1'):
+    # Colunas de identificador usadas em buscas e na detecção de duplicados (ver tests/utils/csv_index.py)
+    ID_COLUMNS = [
+        "ID da cobranca",
+        "TID",
+        "NSU",
+        "ID definido pela Loja",
+    ]
+
+    def __init__(self, file_path: str, encoding: str = 'iso-8859-1', mode: str = MODE_MEMORY,
+                 cache: Union[bool, ParseCache] = False, index_columns: Sequence[str] = (),
+                 columns: Optional[Sequence[str]] = None):
         """
         Inicializa o validador com o caminho do arquivo CSV.
         
         Args:
-            file_path: Caminho completo do arquivo CSV a ser validado
+            file_path: Caminho completo do arquivo CSV a ser validado (.csv, .csv.gz ou .zip)
             encoding: Encoding do arquivo (padrão: iso-8859-1, usado pelo sistema)
+            mode: Modo de leitura (MODE_MEMORY, MODE_STREAMING ou MODE_COLUMNAR)
+            cache: Cache em disco da tabela colunar (True para o cache padrão ou um ParseCache).
+                   Usado no modo columnar.
+            index_columns: Colunas com índice hash montado durante a carga (ex: ID_COLUMNS).
+                   No modo streaming o índice é montado na primeira busca.
+            columns: Colunas carregadas nas linhas e na tabela colunar (padrão: todas).
+                   As colunas de index_columns são incluídas automaticamente.
         
         Raises:
             FileNotFoundError: Se o arquivo não existir
+            ValueError: Se o modo de leitura for inválido
         """
         self.file_path = file_path
         self.encoding = encoding
+        self.mode = mode
         self.data: List[Dict[str, Any]] = [] # Lista de dicionários com os dados
         self.headers: List[str] = [] # Lista com o nome das colunas
+        self.table: Optional[ColumnarTable] = None # Dados no modo columnar
+        self._mapped: Optional[MappedCSVReader] = None # Índice de linhas (get_rows)
+        self.cache: Optional[ParseCache] = ParseCache() if cache is True else (cache or None)
+        self.index_columns: List[str] = list(index_columns)
+        self.indexes: Dict[str, HashIndex] = {} # Índices hash por coluna (find_rows)
+        # Projeção de colunas (None = todas as colunas)
+        self.columns: Optional[List[str]] = (
+            None if columns is None else list(dict.fromkeys([*columns, *self.index_columns]))
+        )
+
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de leitura inválido: '{mode}'. Use um de {self.MODES}")
         
         #Valida se o arquivo existe
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
         
-        logger.info(f"CSVValidator incializado para: {file_path}")
+        logger.info(f"CSVValidator incializado para: {file_path} (modo: {mode})")
         
     def read_csv(self) -> List[Dict[str, Any]]:
         """
@@ -79,6 +189,8 @@ class CSVValidator:
         - Chave = nome da coluna
         - Valor = valor da célula
         
+        Com columns, os dicionários têm apenas as colunas da projeção.
+        
         Returns:
             Lista de dicionários com os dados do CSV
             
@@ -86,14 +198,20 @@ class CSVValidator:
             Exception: Se houver erro ao ler o arquivo
         """
         try:
-            with open(self.file_path, 'r', encoding=self.encoding) as file:
+            with open_text(self.file_path, self.encoding) as file:
                 # Dictreader transformará cada linha em um dicionário
                 # delimiter=';' porque o CSV usa poto-e-virgula como separador
-                reader = csv.DictReader(file, delimiter=';')
+                if self.columns is None:
+                    reader = csv.DictReader(file, delimiter=';')
                 
-                # Guardando os nomes das colunas
-                self.headers = reader.fieldnames
-                self.data = list(reader)
+                    # Guardando os nomes das colunas
+                    self.headers = reader.fieldnames
+                else:
+                    reader = self._projected_rows(file)
+                indexes = self._new_indexes(self.index_columns)
+                # Os índices são montados na mesma passada da leitura
+                self.data = list(indexed(reader, indexes) if indexes else reader)
+                self.indexes.update({index.column: index for index in indexes})
                 
                 logger.info(f"CSV lido com sucesso. Total de linhas: {len(self.data)}")
                 return self.data
@@ -101,6 +219,119 @@ class CSVValidator:
             logger.error(f"Erro ao ler CSV: {str(e)}")
             raise
         
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre o arquivo CSV linha a linha, sem guardar as linhas em memória.
+
+        Cada chamada abre o arquivo novamente, então o gerador pode ser
+        consumido quantas vezes for necessário. Os headers são atualizados
+        na primeira leitura.
+
+        Yields:
+            Dicionário com os dados de cada linha (mesmo formato do read_csv)
+        """
+        if self.columns is None:
+            yield from self._iter_all_rows()
+            return
+
+        with open_text(self.file_path, self.encoding) as file:
+            yield from self._projected_rows(file)
+
+    def _iter_all_rows(self) -> Iterator[Dict[str, Any]]:
+        """Percorre o arquivo com todas as colunas, independente da projeção."""
+        with open_text(self.file_path, self.encoding) as file:
+            reader = csv.DictReader(file, delimiter=';')
+            self.headers = reader.fieldnames or []
+            yield from reader
+
+    def _projected_rows(self, file) -> Iterator[Dict[str, Any]]:
+        """
+        Lê as linhas do arquivo aberto montando dicionários só com as colunas da projeção.
+
+        Os headers (todas as colunas do arquivo) são atualizados antes da primeira linha.
+        """
+        reader = csv.reader(file, delimiter=';')
+        self.headers = next(reader, [])
+        names, rows = project_rows(reader, self.headers, self.columns)
+        return (dict(zip(names, values)) for values in rows)
+
+    def load_table(self) -> ColumnarTable:
+        """
+        Carrega o CSV no formato colunar (ColumnarTable), caso ainda não tenha sido carregado.
+
+        Se houver cache, tenta carregar a tabela dele antes de ler o CSV e grava
+        a tabela no cache depois de ler. Com columns, a tabela tem só as colunas
+        da projeção (e o cache guarda uma entrada por projeção).
+
+        Returns:
+            ColumnarTable com os dados do CSV
+        """
+        if self.table is None:
+            table = self.cache.load(self.file_path, self.encoding, self.columns) if self.cache else None
+            if table is None:
+                table = ColumnarTable.from_csv(self.file_path, self.encoding, self.columns)
+                if self.cache:
+                    self.cache.store(self.file_path, table, self.encoding, self.columns)
+            self.table = table
+            # Com projeção a tabela só tem as colunas carregadas; headers continua com as do arquivo
+            self.headers = table.headers if self.columns is None else self._read_headers()
+            for index in self._new_indexes(self.index_columns):
+                index.add_column(table.column(index.column))
+                self.indexes[index.column] = index
+        return self.table
+
+    def _load_headers(self):
+        """
+        Carrega os headers do CSV caso ainda não tenham sido lidos.
+
+        No modo streaming lê apenas a primeira linha do arquivo.
+        """
+        if self.headers:
+            return
+
+        if self.mode == self.MODE_STREAMING:
+            self.headers = self._read_headers()
+        elif self.mode == self.MODE_COLUMNAR:
+            self.load_table()
+        else:
+            self.read_csv()
+
+    def _read_headers(self) -> List[str]:
+        """Lê apenas a primeira linha do arquivo (header)."""
+        with open_text(self.file_path, self.encoding) as file:
+            return next(csv.reader(file, delimiter=';'), [])
+
+    def _check_column(self, column_name: str):
+        """
+        Verifica se a coluna existe no CSV e foi carregada (projeção de colunas).
+
+        Raises:
+            ValueError: Se a coluna não existir no CSV ou não estiver em columns
+        """
+        self._load_headers()
+        if column_name not in self.headers:
+            raise ValueError(f"Coluna '{column_name}' não encontrada no CSV")
+        if self.columns is not None and column_name not in self.columns:
+            raise ValueError(f"Coluna '{column_name}' não foi carregada. Inclua a coluna em columns: {self.columns}")
+
+    def _rows(self) -> Iterable[Dict[str, Any]]:
+        """
+        Retorna a fonte de linhas de acordo com o modo de leitura.
+
+        - MODE_MEMORY: lista self.data (lendo o arquivo se necessário)
+        - MODE_STREAMING: gerador sobre o arquivo (memória constante)
+        - MODE_COLUMNAR: dicionários montados sob demanda a partir de self.table
+        """
+        if self.mode == self.MODE_STREAMING:
+            return self.iter_rows()
+
+        if self.mode == self.MODE_COLUMNAR:
+            return self.load_table().iter_rows()
+
+        if not self.data:
+            self.read_csv()
+        return self.data
+
     def validate_headers(self) -> bool:
         """
         Valida se o CSV contém todas as colunas esperadas.
@@ -112,8 +343,7 @@ class CSVValidator:
             True se todas as colunas esperadas estão presentes, False caso contrário
         """
         # Caso ainda não tenha sido lido o CSV, ele lerá agora
-        if not self.headers:
-            self.read_csv()
+        self._load_headers()
             
         # Verifica quais colunas esperadas estão faltando
         missing_columns = []
@@ -133,21 +363,80 @@ class CSVValidator:
         """
         Valida se o CSV contém dados (não está vazio).
         
+        No modo streaming basta ler a primeira linha de dados.
+
         Returns:
             True se o CSV contém pelo menos uma linha de dados, False se vazio
         """
-        # Caso ainda não tenha sido lido o CSV, ele lerá agora
-        if not self.data:
-            self.read_csv()
-            
-        has_data = len(self.data) > 0
+        if self.mode == self.MODE_STREAMING:
+            with closing(self.iter_rows()) as rows:
+                has_data = next(rows, None) is not None
+
+            if has_data:
+                logger.info("CSV contém dados")
+            else:
+                logger.warning("CSV está vazio (sem dados)")
+            return has_data
+
+        row_count = self.get_row_count()
+        has_data = row_count > 0
             
         if has_data:
-            logger.info(f"CSV contém {len(self.data)} linhas de dados")
+            logger.info(f"CSV contém {row_count} linhas de dados")
         else:
             logger.warning("CSV está vazio (sem dados)")
         
         return has_data
+
+    def iter_column_values(self, column_name: str) -> Iterator[str]:
+        """
+        Percorre os valores de uma coluna sem criar uma lista intermediária.
+
+        Args:
+            column_name: Nome da coluna (ex: "Status da cobranca")
+
+        Yields:
+            Valor da coluna em cada linha
+
+        Raises:
+            ValueError: Se a coluna não existir no CSV (ou não estiver em columns)
+        """
+        # Validando se a coluna existe
+        self._check_column(column_name)
+
+        if self.mode == self.MODE_COLUMNAR:
+            yield from self.load_table().column(column_name)
+            return
+
+        for row in self._rows():
+            yield row.get(column_name, '')
+
+    def _column_source(self, column_name: str) -> Iterable[str]:
+        """
+        Retorna os valores de uma coluna para as validações em lote.
+
+        No modo columnar é a ColumnView (as validações olham só os valores
+        distintos). Nos demais modos é um gerador, sem lista intermediária.
+        """
+        if self.mode == self.MODE_COLUMNAR:
+            return self.get_column_values(column_name)
+        return self.iter_column_values(column_name)
+
+    def _iter_value_counts(self, column_name: str) -> Iterator[Tuple[str, int]]:
+        """
+        Percorre os valores de uma coluna como pares (valor, quantidade).
+
+        No modo columnar cada valor distinto aparece uma única vez, então as
+        validações por coluna só precisam olhar os valores distintos. Nos
+        demais modos cada linha gera um par (valor, 1).
+        """
+        if self.mode == self.MODE_COLUMNAR:
+            self._check_column(column_name)
+            yield from self.load_table().column(column_name).value_counts().items()
+            return
+
+        for value in self.iter_column_values(column_name):
+            yield value, 1
     
     def get_column_values(self, column_name: str) -> List[str]:
         """
@@ -156,22 +445,22 @@ class CSVValidator:
         Args:
             column_name: Nome da coluna (ex: "Status da cobranca")
             
+        No modo columnar retorna uma ColumnView (somente leitura, sem cópia).
+
         Returns:
             Lista com todos os valores da coluna
             
         Raises:
-            ValueError: Se a coluna não existir no CSV
+            ValueError: Se a coluna não existir no CSV (ou não estiver em columns)
         """
-        # Caso ainda não tenha sido lido o CSV, ele lerá agora
-        if not self.data:
-            self.read_csv()
-        
-        # Validando se a colna existe
-        if column_name not in self.headers:
-            raise ValueError(f"Coluna '{column_name}' não encontrada no CSV")
-        
+        if self.mode == self.MODE_COLUMNAR:
+            self._check_column(column_name)
+            values = self.load_table().column(column_name)
+            logger.info(f"Visão da coluna '{column_name}' com {len(values)} valores")
+            return values
+
         # Extrai o valor da coluna de cada linha
-        values = [row.get(column_name, '') for row in self.data]
+        values = list(self.iter_column_values(column_name))
         
         logger.info(f"Extraídos {len(values)} valores da coluna '{column_name}'")
         return values
@@ -186,10 +475,8 @@ class CSVValidator:
         Returns:
             True se a coluna não está vazia em nenhuma linha, False caso contrário
         """
-        values = self.get_column_values(column_name)
-        
         # Conta quantos valores estão vazios
-        empty_count = sum(1 for v in values if not v or v.strip() == '')
+        empty_count = sum(count for v, count in self._iter_value_counts(column_name) if is_empty(v))
         
         if empty_count > 0:
             logger.warning(f"Coluna '{column_name}' tem {empty_count} valores vazios.")
@@ -211,38 +498,32 @@ class CSVValidator:
         Returns:
             True se os status são válidos, False caso contrário
         """
-        # Extrai todos os status do CSV
-        statuses = self.get_column_values("Status da cobranca")
-        
-        valid_statuses = [
-            "Pendente", 
-            "Paga", 
-            "Cancelada", 
-            "Estornada", 
-            "Negada", 
-            "Expirada", 
-            "Em processamento",
-            "Autorizada",
-            "Não Autorizada",
-            "Tempo expirado"
-        ]
+        valid_statuses = self.VALID_STATUSES
         
+        # Percorre os status uma única vez, guardando apenas os valores distintos com problema
+        total = 0
+        invalid_statuses = set()
+        wrong_statuses = set()
+        for status, count in self._iter_value_counts("Status da cobranca"):
+            total += count
+            if status not in valid_statuses:
+                invalid_statuses.add(status)
+            if expected_status and status != expected_status:
+                wrong_statuses.add(status)
+
         # Verifica se há algum status inválido
-        invalid_statuses = [s for s in statuses if s not in valid_statuses]
-        
         if invalid_statuses:
-            logger.error(f"Status inválidos encontrados: {set(invalid_statuses)}")
+            logger.error(f"Status inválidos encontrados: {invalid_statuses}")
             return False
         
         # Se foi passado um status esperado, valida se TODOS são iguais a ele
         if expected_status:
-            wrong_statuses = [s for s in statuses if s != expected_status]
             if wrong_statuses:
-                logger.error(f"Esperado status '{expected_status}', mas encontrados: {set(wrong_statuses)}")
+                logger.error(f"Esperado status '{expected_status}', mas encontrados: {wrong_statuses}")
                 return False
-            logger.info(f"Todos os {set(statuses)} registros têm status '{expected_status}'.")
+            logger.info(f"Todos os {total} registros têm status '{expected_status}'.")
         else:
-            logger.info(f"Todos os status são válidos. Total: {len(statuses)}")
+            logger.info(f"Todos os status são válidos. Total: {total}")
         return True
     
     def get_row_count(self) -> int:
@@ -252,6 +533,12 @@ class CSVValidator:
         Returns:
             Número de linhas (excluindo o header)
         """
+        if self.mode == self.MODE_STREAMING:
+            return sum(1 for _ in self.iter_rows())
+
+        if self.mode == self.MODE_COLUMNAR:
+            return len(self.load_table())
+
         if not self.data:
             self.read_csv()
             
@@ -265,44 +552,501 @@ class CSVValidator:
         - DD/MM/YYYY HH:MM:SS
         - DD/MM/YYYY
         
+        A coluna é validada em lote com uma expressão regular compilada
+        (ver tests/utils/csv_dates.py). Valores vazios são ignorados.
+
         Args:
             column_name: Nome da coluna de data (ex: "Data da cobranca")
             
         Returns:
             True se todas as datas estão no formato correto, False caso contrário
         """
-        from datetime import datetime
-        
-        dates = self.get_column_values(column_name)
-        invalid_dates = []
-        
-        for date_str in dates:
-            #Ignora valores vazios
-            if not date_str or date_str.strip() == '':
-                continue
-            
-            try:
-                # tenta parsear no formato DD/MM/YYYY HH:MM:SS
-                datetime.strptime(date_str, '%d/%m/%Y %H:%M:%S')
-            except ValueError:
-                try:
-                    # Tenta formato alternativo DD/MM/YYYY
-                    datetime.strptime(date_str, '%d/%m/%Y')
-                except ValueError:
-                    # Se nenhum formato funcionou, é inválido
-                    invalid_dates.append(date_str)
+        result = validate_dates(self._column_source(column_name))
         
-        if invalid_dates:
-            logger.error(f"Datas inválidas na coluna '{column_name}': {invalid_dates[:5]}")
+        if not result.passed:
+            logger.error(f"Datas inválidas na coluna '{column_name}' ({result.invalid_count}): {result.samples}")
             return False
         
         logger.info(f"Todas as datas na coluna '{column_name}' estão no formato correto.")
         return True
+
+    def validate_date_range(self, column_name: str = "Data da cobranca", start: int = None, end: int = None) -> bool:
+        """
+        Valida se todas as datas de uma coluna estão dentro de um período.
+
+        Se start/end não forem informados, usa o período do nome do arquivo
+        (ex: TRANSAÇÕES_2025-11-20_2025-11-27.csv). Valores vazios são ignorados
+        e datas inválidas contam como fora do período.
+
+        Args:
+            column_name: Nome da coluna de data
+            start: Início do período (timestamp em segundos, inclusivo)
+            end: Fim do período (timestamp em segundos, inclusivo)
+
+        Returns:
+            True se todas as datas estão no período, False caso contrário
+
+        Raises:
+            ValueError: Se o período não foi informado e não está no nome do arquivo
+        """
+        if start is None or end is None:
+            file_range = parse_file_date_range(self.file_path)
+            if file_range is None:
+                raise ValueError(f"Período não informado e não encontrado no nome do arquivo: {self.file_path}")
+            start = file_range[0] if start is None else start
+            end = file_range[1] if end is None else end
+
+        result = check_date_range(self._column_source(column_name), start, end)
+
+        if not result.passed:
+            logger.error(f"Datas fora do período na coluna '{column_name}' ({result.invalid_count}): {result.samples}")
+            return False
+
+        logger.info(f"Todas as {result.checked} datas da coluna '{column_name}' estão dentro do período.")
+        return True
+
+    def get_timestamps(self, column_name: str) -> array:
+        """
+        Converte uma coluna de datas em um array('q') de timestamps (segundos, sem fuso).
+
+        Valores vazios ou inválidos viram csv_dates.MISSING_TIMESTAMP.
+
+        Args:
+            column_name: Nome da coluna de data
+
+        Returns:
+            array('q') com um timestamp por linha
+        """
+        return to_timestamps(self._column_source(column_name))
+
+    def get_cents(self, column_name: str) -> array:
+        """
+        Converte uma coluna de valores (ex: "200,00") em um array('q') de centavos.
+
+        Valores vazios ou inválidos viram csv_money.MISSING_CENTS.
+
+        Args:
+            column_name: Nome da coluna de valor (ex: "Valor total da cobrança")
+
+        Returns:
+            array('q') com um valor por linha
+        """
+        return to_cents(self._column_source(column_name))
+
+    def get_money_stats(self, column_name: str) -> MoneyStats:
+        """
+        Soma, mínimo, máximo e quantidade de uma coluna de valores, em centavos.
+
+        A conversão é feita uma vez por valor distinto (ver tests/utils/csv_money.py).
+        No modo streaming os valores são somados conforme são lidos, sem contar
+        os valores distintos, e o memo de conversões tem tamanho limitado.
+        Valores vazios são ignorados e valores fora do formato ficam em invalid_count.
+
+        Args:
+            column_name: Nome da coluna de valor (ex: "Valor total da cobrança")
+
+        Returns:
+            MoneyStats da coluna
+        """
+        if self.mode == self.MODE_STREAMING:
+            stats = stream_money_stats(self._column_source(column_name))
+        else:
+            stats = money_stats(count_values(self._column_source(column_name)))
+        if not stats.passed:
+            logger.error(f"Valores inválidos na coluna '{column_name}' ({stats.invalid_count}): {stats.invalid_values[:5]}")
+        logger.info(f"Coluna '{column_name}': {stats.count} valores, total de {stats.total} centavos")
+        return stats
+
+    def get_money_stats_by(self, column_name: str, by: str) -> Dict[str, MoneyStats]:
+        """
+        Agrega uma coluna de valores por grupo (ex: por status, loja ou Bandeira).
+
+        As duas colunas são lidas em uma única passada e os pares (grupo, valor)
+        são contados antes da conversão, então cada valor distinto é convertido
+        uma única vez. No modo streaming os pares não são contados: cada linha
+        é somada ao seu grupo, guardando só um MoneyStats por grupo.
+
+        Args:
+            column_name: Nome da coluna de valor (ex: "Valor total da cobrança")
+            by: Coluna de agrupamento (ex: "Bandeira")
+
+        Returns:
+            Dicionário {valor do grupo: MoneyStats}
+
+        Raises:
+            ValueError: Se alguma das colunas não existir no CSV
+        """
+        if self.mode == self.MODE_STREAMING:
+            self._check_column(by)
+            self._check_column(column_name)
+            groups = stream_money_stats_by(map(itemgetter(by, column_name), self._rows()))
+        else:
+            groups = money_stats_by(self._count_combinations([by, column_name]))
+        logger.info(f"Coluna '{column_name}' agregada por '{by}': {len(groups)} grupos")
+        return groups
+
+    def _count_combinations(self, columns: Sequence[str]) -> Counter:
+        """
+        Conta as combinações distintas de valores das colunas em uma única passada.
+
+        No modo columnar conta os códigos das colunas, sem montar as linhas.
+        Nos demais modos usa map(itemgetter) sobre as linhas, sem laço em Python.
+
+        Returns:
+            Counter {tupla de valores na ordem das colunas: quantidade de linhas}
+
+        Raises:
+            ValueError: Se alguma coluna não existir no CSV (ou não estiver em columns)
+        """
+        for name in columns:
+            self._check_column(name)
+
+        if self.mode == self.MODE_COLUMNAR:
+            table = self.load_table()
+            return count_combinations([table.column(name) for name in columns])
+
+        counts = Counter(map(itemgetter(*columns), self._rows()))
+        if len(columns) == 1:
+            # itemgetter com uma coluna devolve o valor e não uma tupla
+            counts = Counter({(value,): count for value, count in counts.items()})
+        return counts
+
+    def group_by(self, keys: Union[str, Sequence[str]],
+                 aggregates: Optional[Sequence[Aggregate]] = None) -> Dict[Any, Dict[str, Any]]:
+        """
+        Agrupa as linhas por uma ou mais colunas e calcula os agregados de cada grupo.
+
+        Ex: validator.group_by("Bandeira", [Count(), Sum("Valor total da cobrança")])
+            -> {"Visa": {"count": 136, "sum[Valor total da cobrança]": 2720000}, ...}
+
+        Args:
+            keys: Coluna ou lista de colunas de agrupamento
+            aggregates: Agregados de tests/utils/csv_groupby.py (padrão: [Count()])
+
+        Returns:
+            Dicionário {chave do grupo: {nome do agregado: resultado}}. Com várias
+            colunas de agrupamento, as chaves são tuplas.
+
+        Raises:
+            ValueError: Se alguma coluna não existir no CSV
+        """
+        return self.group_by_many({"group_by": GroupBy(keys, aggregates)})["group_by"]
+
+    def group_by_many(self, breakdowns: Dict[str, GroupBy]) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        """
+        Calcula vários agrupamentos com uma única leitura das linhas.
+
+        Cada agrupamento tem o seu acumulador (chave -> estado dos agregados),
+        atualizado na mesma passada, então a memória é proporcional aos grupos
+        de cada agrupamento. No modo columnar cada agrupamento conta as
+        combinações dos códigos das suas colunas (ver tests/utils/csv_groupby.py).
+
+        Args:
+            breakdowns: Dicionário {nome: GroupBy}
+
+        Returns:
+            Dicionário {nome: resultado do agrupamento, no formato de group_by}
+
+        Raises:
+            ValueError: Se alguma coluna não existir no CSV
+        """
+        for column in required_columns(breakdowns.values()):
+            self._check_column(column)
+
+        if self.mode == self.MODE_COLUMNAR:
+            results = {
+                name: group_counts(breakdown.columns, self._count_combinations(breakdown.columns), breakdown)
+                for name, breakdown in breakdowns.items()
+            }
+        else:
+            accumulators = {name: GroupAccumulator(breakdown) for name, breakdown in breakdowns.items()}
+            adders = [accumulator.add for accumulator in accumulators.values()]
+            for row in self._rows():
+                for add in adders:
+                    add(row)
+            results = {name: accumulator.result() for name, accumulator in accumulators.items()}
+
+        sizes = {name: len(groups) for name, groups in results.items()}
+        logger.info(f"Agrupamentos calculados em uma passada: {sizes}")
+        return results
+
+    def _new_indexes(self, columns: Sequence[str]) -> List[HashIndex]:
+        """Cria índices vazios para as colunas que existem no CSV."""
+        missing = [column for column in columns if column not in (self.headers or [])]
+        if missing:
+            logger.warning(f"Colunas de índice não encontradas no CSV: {missing}")
+        return [HashIndex(column) for column in columns if column not in missing]
+
+    def build_indexes(self, columns: Optional[Sequence[str]] = None) -> Dict[str, HashIndex]:
+        """
+        Monta os índices hash das colunas que ainda não têm índice.
+
+        Todas as colunas pendentes são indexadas em uma única passada. Nos modos
+        memory e columnar, as colunas de index_columns já são indexadas durante
+        a carga.
+
+        Args:
+            columns: Colunas a indexar (padrão: index_columns)
+
+        Returns:
+            Dicionário {coluna: HashIndex}
+
+        Raises:
+            ValueError: Se alguma coluna não existir no CSV
+        """
+        columns = list(dict.fromkeys(self.index_columns if columns is None else columns))
+        for column in columns:
+            self._check_column(column)
+
+        pending = [HashIndex(column) for column in columns if column not in self.indexes]
+        if pending:
+            if self.mode == self.MODE_COLUMNAR:
+                for index in pending:
+                    index.add_column(self.load_table().column(index.column))
+            else:
+                deque(indexed(self._rows(), pending), maxlen=0)
+            self.indexes.update({index.column: index for index in pending})
+            logger.info(f"Índices montados: {pending}")
+
+        return {column: self.indexes[column] for column in columns}
+
+    def get_index(self, column_name: str) -> HashIndex:
+        """
+        Retorna o índice hash da coluna, montando-o se necessário.
+
+        Se o índice ainda não existir, as colunas de index_columns pendentes são
+        indexadas na mesma passada.
+
+        Raises:
+            ValueError: Se a coluna não existir no CSV
+        """
+        if column_name not in self.indexes:
+            self.build_indexes(self.index_columns + [column_name])
+        return self.indexes[column_name]
+
+    def find_row_numbers(self, column_name: str, value: str) -> List[int]:
+        """
+        Retorna os números das linhas com o valor na coluna (busca O(1) pelo índice).
+
+        Args:
+            column_name: Coluna de identificador (ex: "TID")
+            value: Valor procurado
+
+        Returns:
+            Números das linhas (1 = primeira linha após o header); lista vazia se não encontrar
+        """
+        return self.get_index(column_name).find(value)
+
+    def find_rows(self, column_name: str, value: str) -> List[Dict[str, Any]]:
+        """
+        Retorna as linhas com o valor na coluna (ex: find_rows("ID da cobranca", "616709c7-...")).
+
+        As linhas são localizadas pelo índice e lidas com get_rows, sem
+        percorrer o arquivo.
+        """
+        return self.get_rows(self.find_row_numbers(column_name, value))
+
+    def get_duplicates(self, column_name: str) -> Dict[str, List[int]]:
+        """
+        Retorna os valores repetidos da coluna com os números das linhas.
+
+        Args:
+            column_name: Coluna de identificador (ex: "ID da cobranca")
+
+        Returns:
+            Dicionário {valor: [números das linhas]} (vazio se não houver repetição)
+        """
+        duplicates = self.get_index(column_name).duplicates()
+        if duplicates:
+            logger.warning(f"Valores repetidos na coluna '{column_name}': {len(duplicates)}")
+        return duplicates
+
+    def get_rows(self, row_numbers: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Retorna linhas específicas pelo número (1 = primeira linha após o header).
+
+        Se os dados já estiverem em memória (self.data ou self.table) usa eles.
+        Caso contrário usa um índice de linhas sobre o arquivo mapeado (mmap):
+        o índice é montado uma vez e cada linha pedida custa O(1), sem parse do
+        arquivo inteiro. Em arquivos compactados (sem mmap) as linhas pedidas
+        são lidas em uma única passada. Útil para ver as linhas das amostras de um RuleResult:
+            validator.get_rows(row for row, _ in result.samples)
+
+        Args:
+            row_numbers: Números das linhas
+
+        Returns:
+            Lista com os dicionários das linhas, na ordem pedida
+
+        Raises:
+            IndexError: Se alguma linha não existir
+        """
+        if self.table is not None:
+            return [self.table.row(self._check_row_number(n, len(self.table)) - 1) for n in row_numbers]
+
+        if self.data:
+            return [self.data[self._check_row_number(n, len(self.data)) - 1] for n in row_numbers]
+
+        if is_compressed(self.file_path):
+            return self._scan_rows(list(row_numbers))
+
+        if self._mapped is None:
+            self._mapped = MappedCSVReader(self.file_path, self.encoding)
+            self.headers = self.headers or self._mapped.headers
+        return self._mapped.get_rows(row_numbers)
+
+    def _scan_rows(self, row_numbers: List[int]) -> List[Dict[str, Any]]:
+        """Lê as linhas pedidas percorrendo o arquivo uma vez, até a última linha pedida."""
+        wanted = set(row_numbers)
+        found: Dict[int, Dict[str, Any]] = {}
+        row_count = 0
+        with closing(self._iter_all_rows()) as rows:
+            for row_count, row in enumerate(rows, start=1):
+                if row_count in wanted:
+                    found[row_count] = row
+                    if len(found) == len(wanted):
+                        break
+        for row_number in row_numbers:
+            if row_number not in found:
+                self._check_row_number(row_number, row_count)
+        return [found[row_number] for row_number in row_numbers]
+
+    @staticmethod
+    def _check_row_number(row_number: int, row_count: int) -> int:
+        if not 1 <= row_number <= row_count:
+            raise IndexError(f"Linha {row_number} fora do intervalo (1 a {row_count})")
+        return row_number
+
+    def close(self):
+        """Libera o arquivo mapeado usado por get_rows (se houver)."""
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def validate_rules(self, rules: Sequence[Rule], workers: int = None) -> List[RuleResult]:
+        """
+        Executa várias regras de validação em uma única passada pelas linhas.
+
+        Ao contrário de chamar validate_status_values, validate_date_format etc.
+        separadamente, o arquivo é percorrido apenas uma vez, independente da
+        quantidade de regras.
+
+        Com workers > 1 o arquivo é dividido em faixas validadas em paralelo por
+        vários processos (ver tests/utils/csv_parallel.py), lendo direto do
+        arquivo em qualquer modo. O resultado é o mesmo da validação serial.
+        Arquivos compactados não podem ser divididos em faixas e são validados
+        em uma passada só.
+
+        As regras podem usar qualquer coluna, então com columns (projeção) as
+        linhas são lidas do arquivo com todas as colunas.
+
+        Args:
+            rules: Regras de tests/utils/csv_rules.py (ex: [HeadersRule(), StatusEnumRule()])
+            workers: Quantidade de processos para validação paralela (opcional)
+
+        Returns:
+            Lista com um RuleResult por regra, na mesma ordem das regras
+        """
+        if workers and workers > 1 and not is_compressed(self.file_path):
+            if not self.headers:
+                self.headers = read_header(self.file_path, self.encoding)[0]
+            return validate_rules_parallel(self.file_path, rules, workers, self.encoding)
+
+        self._load_headers()
+        rows = self._rows() if self.columns is None else self._iter_all_rows()
+        return run_rules(self.headers, rows, rules)
     
-    def get_summary(self) -> Dict[str, Any]:
+    def validate_schema(self, schema: Schema = TRANSACTION_EXPORT_SCHEMA) -> RuleResult:
+        """
+        Valida todas as colunas contra o schema declarativo (tipo, vazio, enum, regex).
+
+        O schema é compilado uma vez (ver tests/utils/csv_schema.py). No modo
+        columnar cada valor distinto é verificado uma única vez; no modo
+        streaming (e com projeção de colunas, em qualquer modo) as linhas são
+        lidas do arquivo como listas, sem montar dicionários.
+
+        Args:
+            schema: Schema da exportação (padrão: TRANSACTION_EXPORT_SCHEMA)
+
+        Returns:
+            RuleResult com as linhas fora do schema e a contagem de falhas por coluna
+        """
+        rule = SchemaRule(schema)
+        if self.mode == self.MODE_COLUMNAR and self.columns is None:
+            result = rule.validate_table(self.load_table())
+        elif self.mode == self.MODE_STREAMING or self.columns is not None:
+            result = rule.validate_file(self.file_path, self.encoding)
+        else:
+            self._load_headers()
+            return run_rules(self.headers, self._rows(), [rule])[0]
+
+        if result.passed:
+            logger.info(f"Schema validado: {result.message}")
+        else:
+            logger.error(f"Schema inválido: {result.message}. Amostras: {result.samples}")
+        return result
+
+    def validate_cards(self, check_brand: bool = False) -> RuleResult:
+        """
+        Verifica a consistência de "Bandeira", "Numero do cartao" e "Bin".
+
+        Confere a máscara PCI do número, se o número começa pelo Bin e, com
+        check_brand, se o Bin pertence à bandeira (ver tests/utils/csv_cards.py). As combinações das
+        três colunas são contadas em uma única passada e cada combinação
+        distinta é verificada uma vez; as linhas de exemplo só são procuradas
+        (segunda leitura, até encontrar as amostras) quando há falha.
+
+        Args:
+            check_brand: Verifica se o Bin pertence à faixa da bandeira. Desligado
+                         por padrão: os cartões de teste do sandbox têm Bin de
+                         outra bandeira; ligar só para dados de produção
+
+        Returns:
+            RuleResult com as linhas inconsistentes e a contagem por verificação
+
+        Raises:
+            ValueError: Se alguma coluna de cartão não foi carregada (projeção de colunas)
+        """
+        rule = CardConsistencyRule(check_brand)
+        self._load_headers()
+        rule.check_headers(self.headers)
+        if not rule.error:
+            rule.check_counts(self._count_combinations(CARD_COLUMNS), lambda: self._iter_combinations(CARD_COLUMNS))
+        result = rule.result()
+
+        if result.passed:
+            logger.info(f"Cartões validados: {result.message}")
+        else:
+            logger.error(f"Cartões inconsistentes: {result.message}. Amostras: {result.samples}")
+        return result
+
+    def _iter_combinations(self, columns: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+        """Percorre as linhas como tuplas com os valores das colunas (ao menos duas), na ordem do arquivo."""
+        if self.mode == self.MODE_COLUMNAR:
+            table = self.load_table()
+            return zip(*(table.column(name) for name in columns))
+        return map(itemgetter(*columns), self._rows())
+
+    def get_summary(self, include_sketches: bool = False, quantile_k: int = DEFAULT_K,
+                    hll_precision: int = DEFAULT_PRECISION) -> Dict[str, Any]:
         """
         Retorna um resumo dos dados do CSV com estatísticas úteis.
         
+        O resumo é calculado em uma única passada pelas linhas (no modo
+        columnar, direto das contagens da coluna de status). Para outras
+        distribuições use group_by / group_by_many.
+
+        Com include_sketches, a mesma passada alimenta os sketches de
+        tests/utils/csv_sketches.py (memória limitada, independente do tamanho
+        do arquivo): quantis do valor da transação, quantidade aproximada de
+        lojas, clientes e cartões distintos e a menor/maior data da cobrança.
+        Com projeção de colunas, só entram as colunas carregadas.
+
+        Args:
+            include_sketches: Inclui a chave "sketches" no resumo
+            quantile_k: Precisão dos quantis (erro de posto ~1,7/k; padrão 200 -> ~1%)
+            hll_precision: Precisão das contagens de distintos (erro ~1,04/sqrt(2^p); padrão 14 -> ~0,8%)
+
         Returns:
             Dicionário com informações resumidas:
             - total_rows: número de linhas
@@ -310,24 +1054,70 @@ class CSVValidator:
             - columns: lista de nomes das colunas
             - file_size_bytes: tamanho do arquivo em bytes
             - status_distribution: contagem de cada status (se coluna existir)
+            - sketches: resultado de ExportSketches.result() (se include_sketches)
         """
-        if not self.data:
-            self.read_csv()
+        self._load_headers()
+        has_status = "Status da cobranca" in self.headers and (
+            self.columns is None or "Status da cobranca" in self.columns
+        )
+        sketches = None
+        if include_sketches:
+            loaded = self.headers if self.columns is None else [name for name in self.headers if name in self.columns]
+            sketches = ExportSketches(loaded, k=quantile_k, precision=hll_precision)
+
+        if sketches is not None and self.mode != self.MODE_COLUMNAR:
+            status_counts, total_rows = self._summary_pass(has_status, sketches)
+        elif has_status:
+            status_counts = Counter({
+                status: count for (status,), count in self._count_combinations(["Status da cobranca"]).items()
+            })
+            total_rows = sum(status_counts.values())
+        else:
+            total_rows = self.get_row_count()
             
         summary = {
-            "total_rows": len(self.data),
+            "total_rows": total_rows,
             "total_columns": len(self.headers),
             "columns": self.headers,
             "file_size_bytes": os.path.getsize(self.file_path),
         }
         
         # Se tem coluna de status, adiciona distribuição
-        if "Status da cobranca" in self.headers:
-            statuses = self.get_column_values("Status da cobranca")
-            status_counts = {}
-            for status in statuses:
-                status_counts[status] = status_counts.get(status, 0) + 1
-            summary["status_distribution"] = status_counts
+        if has_status:
+            summary["status_distribution"] = dict(status_counts)
         
+        if sketches is not None:
+            if self.mode == self.MODE_COLUMNAR:
+                # Cada valor distinto da coluna é visto uma única vez, com a sua contagem
+                for column in sketches.columns:
+                    sketches.add_value_counts(column, self._iter_value_counts(column))
+            summary["sketches"] = sketches.result()
+
         logger.info(f"Resumo do CSV: {summary}")
-        return summary
\ No newline at end of file
+        return summary
+
+    def _summary_pass(self, has_status: bool, sketches: ExportSketches) -> Tuple[Counter, int]:
+        """
+        Conta os status e alimenta os sketches em uma única passada pelas linhas.
+
+        Returns:
+            Tupla (Counter de status, total de linhas)
+        """
+        columns = (["Status da cobranca"] if has_status else []) + sketches.columns
+        status_counts = Counter()
+        total_rows = 0
+        if not columns:
+            return status_counts, self.get_row_count()
+
+        getter = itemgetter(*columns)
+        single = len(columns) == 1
+        add_row = sketches.add_row
+        for row in self._rows():
+            total_rows += 1
+            values = (getter(row),) if single else getter(row)
+            if has_status:
+                status_counts[values[0]] += 1
+                add_row(values[1:])
+            else:
+                add_row(values)
+        return status_counts, total_rows
@@ -0,0 +1,18 @@
+"""
+Funções auxiliares sobre valores e colunas, compartilhadas pelos módulos de validação.
+
+- is_empty: célula vazia ou só com espaços (ignorada pelas verificações de formato);
+- is_column_view: coluna no formato colunar (ColumnView), com códigos e
+  valores distintos, para que as verificações trabalhem por valor distinto.
+"""
+from typing import Any, Optional
+
+
+def is_empty(value: Optional[str]) -> bool:
+    """Retorna True se o valor for vazio ou só tiver espaços."""
+    return not value or value.strip() == ''
+
+
+def is_column_view(values: Any) -> bool:
+    """True se a coluna é uma ColumnView (códigos + valores distintos)."""
+    return hasattr(values, "codes") and hasattr(values, "categories")
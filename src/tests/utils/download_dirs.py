@@ -0,0 +1,185 @@
+"""
+Diretórios de download isolados por worker e por teste.
+
+Com um único diretório de download (tests/downloads), dois testes de
+exportação rodando em paralelo (pytest-xdist) disputam o "csv mais recente".
+Aqui cada worker tem a sua raiz (tests/downloads/runs/<worker>) e cada teste
+ganha um subdiretório próprio dentro dela. O Chrome passa a baixar nesse
+subdiretório pelo comando CDP Page.setDownloadBehavior, sem reiniciar o
+navegador.
+
+Ao fim do teste o subdiretório é removido ou mantido conforme a política
+(KEEP_FAILED: só os de testes que falharam, para investigação), e a raiz do
+worker guarda no máximo `retention` subdiretórios, apagando os mais antigos.
+
+Uso básico (ver fixture download_dir em conftest.py):
+    root = worker_download_root()
+    path = create_test_download_dir(root, request.node.nodeid)
+    set_download_dir(driver, path)
+    ...
+    finish_test_download_dir(path, failed=False)
+    prune_download_dirs(root, retention=10)
+"""
+import logging
+import os
+import re
+import shutil
+import tempfile
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DOWNLOADS_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "downloads", "runs")
+
+# Políticas de retenção dos diretórios ao fim do teste
+KEEP_ALL = "all"
+KEEP_FAILED = "failed"
+KEEP_NONE = "none"
+KEEP_POLICIES = (KEEP_ALL, KEEP_FAILED, KEEP_NONE)
+
+DEFAULT_WORKER = "main"
+_MAX_NAME_LENGTH = 80
+_UNSAFE_CHARS = re.compile(r"[^\w.-]+")
+
+
+def worker_id() -> str:
+    """Nome do worker do pytest-xdist (gw0, gw1, ...), ou DEFAULT_WORKER sem xdist."""
+    return os.environ.get("PYTEST_XDIST_WORKER", DEFAULT_WORKER)
+
+
+def worker_download_root(root: str = DOWNLOADS_ROOT, worker: Optional[str] = None) -> str:
+    """
+    Raiz de download do worker, criada se não existir.
+
+    Args:
+        root: Diretório com as raízes de todos os workers
+        worker: Nome do worker (padrão: worker_id())
+
+    Returns:
+        Caminho absoluto da raiz do worker
+    """
+    path = os.path.abspath(os.path.join(root, worker or worker_id()))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def dir_name_for(nodeid: str) -> str:
+    """
+    Nome de diretório seguro a partir do nodeid do teste.
+
+    Ex: "tests/test_transactions.py::TestTransactions::test_export[pago]"
+        -> "TestTransactions.test_export-pago"
+    """
+    name = nodeid.split("::", 1)[-1].replace("::", ".")
+    name = _UNSAFE_CHARS.sub("-", name).strip("-.")
+    return name[-_MAX_NAME_LENGTH:] or "test"
+
+
+def create_test_download_dir(worker_root: str, nodeid: str) -> str:
+    """
+    Cria um subdiretório novo e vazio para o teste.
+
+    O nome tem um sufixo aleatório, então reexecuções do mesmo teste (ex:
+    pytest-rerunfailures) nunca reaproveitam arquivos de uma execução anterior.
+
+    Returns:
+        Caminho absoluto do subdiretório
+    """
+    return tempfile.mkdtemp(prefix=f"{dir_name_for(nodeid)}_", dir=worker_root)
+
+
+def set_download_dir(driver: Any, path: str):
+    """
+    Troca o diretório de download do Chrome em tempo de execução (CDP).
+
+    Usa Page.setDownloadBehavior e, se o Chrome não aceitar o comando
+    (versões que só têm a versão do domínio Browser), Browser.setDownloadBehavior.
+
+    Args:
+        driver: WebDriver do Chrome (precisa de execute_cdp_cmd)
+        path: Diretório de download (absoluto)
+
+    Raises:
+        RuntimeError: Se o driver não suportar comandos CDP
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        raise RuntimeError(f"O driver {type(driver).__name__} não suporta CDP para trocar o diretório de download")
+    params = {"behavior": "allow", "downloadPath": os.path.abspath(path)}
+    try:
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+    except Exception as error:
+        logger.info(f"Page.setDownloadBehavior falhou ({error}); usando Browser.setDownloadBehavior")
+        driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
+    logger.info(f"Diretório de download: {path}")
+
+
+def finish_test_download_dir(path: str, failed: bool, keep: str = KEEP_FAILED) -> bool:
+    """
+    Remove o subdiretório do teste, a não ser que a política mande mantê-lo.
+
+    Args:
+        path: Subdiretório do teste
+        failed: Se o teste falhou
+        keep: KEEP_ALL, KEEP_FAILED (padrão) ou KEEP_NONE
+
+    Returns:
+        True se o subdiretório foi mantido
+
+    Raises:
+        ValueError: Se a política não for conhecida
+    """
+    if keep not in KEEP_POLICIES:
+        raise ValueError(f"Política de retenção inválida: {keep!r} (esperado: {', '.join(KEEP_POLICIES)})")
+    if keep == KEEP_ALL or (keep == KEEP_FAILED and failed):
+        logger.info(f"Downloads mantidos em {path}")
+        return True
+    shutil.rmtree(path, ignore_errors=True)
+    return False
+
+
+def prune_download_dirs(worker_root: str, retention: int) -> List[str]:
+    """
+    Mantém apenas os `retention` subdiretórios mais recentes da raiz do worker.
+
+    Args:
+        worker_root: Raiz do worker (worker_download_root)
+        retention: Quantidade de subdiretórios mantidos (0 remove todos)
+
+    Returns:
+        Subdiretórios removidos
+    """
+    entries = []
+    for entry in os.scandir(worker_root):
+        if entry.is_dir(follow_symlinks=False):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue  # Removido durante a verificação
+    entries.sort(reverse=True)
+    removed = [path for _, path in entries[max(retention, 0):]]
+    for path in removed:
+        shutil.rmtree(path, ignore_errors=True)
+    if removed:
+        logger.info(f"{len(removed)} diretórios de download antigos removidos de {worker_root}")
+    return removed
+
+
+def close_test_download_dir(driver: Any, worker_root: str, path: str, failed: bool, settings: Any) -> bool:
+    """
+    Fim da fixture download_dir: devolve o Chrome para a raiz do worker,
+    aplica a política de retenção ao subdiretório do teste e limita a raiz.
+
+    Args:
+        driver: WebDriver do Chrome
+        worker_root: Raiz do worker (worker_download_root)
+        path: Subdiretório do teste
+        failed: Se o teste falhou
+        settings: Classe Config (DOWNLOADS_KEEP e DOWNLOADS_RETENTION)
+
+    Returns:
+        True se o subdiretório foi mantido
+    """
+    set_download_dir(driver, worker_root)
+    kept = finish_test_download_dir(path, failed, keep=settings.DOWNLOADS_KEEP)
+    prune_download_dirs(worker_root, settings.DOWNLOADS_RETENTION)
+    return kept
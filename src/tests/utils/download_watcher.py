@@ -0,0 +1,237 @@
+"""
+Espera de downloads por eventos do sistema de arquivos.
+
+O DownloadWatcher tira um retrato do diretório de download antes do clique
+em "Exportar relatório" e depois espera um arquivo que não estava no retrato
+(ou que foi recriado desde então). Arquivos de execuções anteriores nunca são
+devolvidos, mesmo que sejam os mais recentes do diretório.
+
+- No Linux a espera usa inotify (via ctypes, sem dependências): o processo
+  fica bloqueado até o diretório mudar, sem latência de polling.
+- Nos demais sistemas (ou se o inotify não estiver disponível) o diretório é
+  verificado a cada FALLBACK_POLL_INTERVAL segundos.
+
+O arquivo só é devolvido depois que o tamanho fica estável por stable_for
+segundos e enquanto não existir o temporário correspondente (.crdownload).
+
+Uso básico:
+    watcher = DownloadWatcher(download_dir).start()
+    transactions_page.click_export_report()
+    file_path = watcher.wait(timeout=30)
+    watcher.close()
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import time
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Extensões do arquivo final e dos temporários do navegador
+DOWNLOAD_SUFFIXES = (".csv", ".csv.gz", ".zip")
+TEMP_SUFFIXES = (".crdownload", ".part", ".tmp")
+
+FALLBACK_POLL_INTERVAL = 0.05
+DEFAULT_STABLE_FOR = 0.2
+
+# Eventos do inotify (linux/inotify.h)
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+class _Inotify:
+    """Descritor inotify observando um diretório (Linux)."""
+
+    def __init__(self, directory: str):
+        """
+        Raises:
+            OSError: Se o inotify não estiver disponível
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch falhou em {directory}")
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Bloqueia até o diretório mudar ou o tempo acabar.
+
+        Os eventos não são interpretados: qualquer mudança faz o diretório ser
+        verificado de novo.
+
+        Returns:
+            True se houve algum evento
+        """
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DownloadWatcher:
+    """
+    Espera um download novo em um diretório.
+
+    start() deve ser chamado antes da ação que dispara o download (ex: clique
+    em exportar); wait() devolve o arquivo novo quando ele estiver completo.
+    """
+
+    def __init__(self, download_dir: str, suffixes: Iterable[str] = DOWNLOAD_SUFFIXES,
+                 since: Optional[float] = None, use_inotify: bool = True):
+        """
+        Args:
+            download_dir: Diretório de download
+            suffixes: Extensões aceitas para o arquivo final
+            since: Se informado (time.time()), arquivos do retrato modificados a
+                   partir desse instante também contam como novos
+            use_inotify: Usa inotify quando disponível (False força o polling)
+        """
+        self.download_dir = download_dir
+        self.suffixes = tuple(suffixes)
+        self.since = since
+        self.use_inotify = use_inotify
+        self.snapshot: Dict[str, int] = {}  # {nome: inode} dos arquivos existentes no start()
+        self._inotify: Optional[_Inotify] = None
+
+    def start(self) -> "DownloadWatcher":
+        """
+        Começa a observar o diretório e tira o retrato dos arquivos existentes.
+
+        O inotify é registrado antes do retrato, então nenhum evento entre o
+        retrato e o wait() é perdido.
+
+        Returns:
+            O próprio watcher
+        """
+        if self.use_inotify and self._inotify is None:
+            try:
+                self._inotify = _Inotify(self.download_dir)
+            except (OSError, AttributeError) as error:
+                # AttributeError: libc sem inotify (ex: macOS)
+                logger.info(f"inotify indisponível ({error}); usando polling a cada {FALLBACK_POLL_INTERVAL}s")
+        self.snapshot = {name: inode for name, inode, _ in self._scan()}
+        return self
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def _scan(self):
+        """Arquivos finais do diretório como (nome, inode, mtime)."""
+        try:
+            entries = list(os.scandir(self.download_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(self.suffixes) or name.endswith(TEMP_SUFFIXES):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # Renomeado ou removido durante a verificação
+            yield name, stat.st_ino, stat.st_mtime
+
+    def _is_in_progress(self, name: str) -> bool:
+        path = os.path.join(self.download_dir, name)
+        return any(os.path.exists(path + suffix) for suffix in TEMP_SUFFIXES)
+
+    def find_new(self) -> Optional[str]:
+        """
+        Procura o arquivo novo mais recente (fora do retrato, ou recriado desde ele).
+
+        Arquivos do retrato que só foram modificados (mesmo inode) não contam
+        como novos, a não ser pelo parâmetro since.
+
+        Returns:
+            Caminho do arquivo, ou None se ainda não houver
+        """
+        newest = None
+        for name, inode, mtime in self._scan():
+            is_new = self.snapshot.get(name) != inode or (self.since is not None and mtime >= self.since)
+            if is_new and (newest is None or mtime > newest[1]):
+                newest = (name, mtime)
+        if newest is None or self._is_in_progress(newest[0]):
+            return None
+        return os.path.join(self.download_dir, newest[0])
+
+    def _sleep(self, timeout: float):
+        """Espera uma mudança no diretório (inotify) ou o intervalo de polling."""
+        if self._inotify is not None:
+            self._inotify.wait(timeout)
+        else:
+            time.sleep(min(timeout, FALLBACK_POLL_INTERVAL))
+
+    def wait(self, timeout: float = 30, stable_for: float = DEFAULT_STABLE_FOR) -> str:
+        """
+        Aguarda o arquivo novo ficar completo.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (padrão: 30)
+            stable_for: Tempo em segundos sem mudança de tamanho para considerar
+                        o arquivo completo
+
+        Returns:
+            Caminho do arquivo baixado
+
+        Raises:
+            TimeoutError: Se o download não for concluído no tempo limite
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        candidate: Optional[str] = None
+        size: Optional[int] = None
+        stable_since = 0.0
+
+        while True:
+            now = time.monotonic()
+            path = self.find_new()
+            if path is not None:
+                try:
+                    current_size = os.path.getsize(path)
+                except OSError:
+                    current_size = None
+                if path != candidate or current_size != size:
+                    candidate, size, stable_since = path, current_size, now
+                elif size is not None and now - stable_since >= stable_for:
+                    logger.info(f"Download Concluído: {path} ({size} bytes em {now - started:.2f}s)")
+                    return path
+
+            if now >= deadline:
+                raise TimeoutError(f"Download não foi condluído em {timeout} segundos.")
+            remaining = deadline - now
+            if path is not None:
+                remaining = min(remaining, max(stable_for - (now - stable_since), 0.01))
+            self._sleep(remaining)
+
+    def close(self):
+        """Para de observar o diretório."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "DownloadWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,257 @@
+"""
+Download da exportação de transações direto por HTTP, com a sessão do Selenium.
+
+Exportar pelo navegador passa pelo clique, pelo gerenciador de downloads do
+Chrome e pela espera do arquivo no diretório. Aqui os cookies (e o token, se
+o portal guardar um no localStorage) da sessão logada do WebDriver são
+copiados para um requests.Session com pool de conexões, e o endpoint de
+exportação é chamado diretamente:
+
+- o corpo da resposta é lido em pedaços (stream) e cada pedaço vai para o
+  IncrementalCSVValidator (regras de csv_rules.py) e, opcionalmente, para o
+  arquivo em disco; o resultado das regras fica pronto quando o download termina;
+- o arquivo é gravado com o mesmo nome da exportação pelo navegador
+  (TRANSAÇÕES_<início>_<fim>.csv), então CSVValidator e validate_date_range
+  funcionam sem mudança;
+- vários períodos podem ser baixados em paralelo (download_many), reutilizando
+  as conexões do pool.
+
+Uso básico:
+    client = ExportClient(session_from_driver(driver), base_url=Config.TARGET_URL)
+    download = client.download(date(2025, 11, 20), date(2025, 11, 27), download_dir,
+                               rules=[HeadersRule(), HasRowsRule(), StatusEnumRule()])
+    assert download.passed
+    downloads = client.download_many(split_date_range(start, end, days=7), download_dir,
+                                     rules_factory=lambda: [HeadersRule(), HasRowsRule()])
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from tests.utils.csv_incremental import IncrementalCSVValidator
+from tests.utils.csv_rules import Rule, RuleResult
+
+logger = logging.getLogger(__name__)
+
+# Endpoint de exportação e nomes dos parâmetros do período
+EXPORT_PATH = "/api/transactions/export"  # Ajustar se necessário
+START_PARAM = "startDate"  # Ajustar se necessário
+END_PARAM = "endDate"  # Ajustar se necessário
+PARAM_DATE_FORMAT = "%Y-%m-%d"
+
+# Chave do localStorage com o token de acesso (None se a sessão for só por cookies)
+AUTH_STORAGE_KEY = None  # Ajustar se necessário
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_POOL_SIZE = 8
+DEFAULT_TIMEOUT = 60
+
+# Lê o User-Agent do navegador e o token do localStorage (arguments[0]) em uma chamada
+_BROWSER_INFO_SCRIPT = """
+const key = arguments[0];
+return [navigator.userAgent, key ? window.localStorage.getItem(key) : null];
+"""
+
+
+def session_from_driver(driver: Any, pool_size: int = DEFAULT_POOL_SIZE, headers: Optional[Dict[str, str]] = None,
+                        auth_storage_key: Optional[str] = AUTH_STORAGE_KEY) -> requests.Session:
+    """
+    Cria um requests.Session autenticado com os cookies da sessão do WebDriver.
+
+    Args:
+        driver: WebDriver já logado no portal
+        pool_size: Conexões mantidas abertas por host (downloads em paralelo)
+        headers: Headers extras para todas as requisições
+        auth_storage_key: Chave do localStorage com o token (enviado como Bearer)
+
+    Returns:
+        Sessão com os cookies, o User-Agent do navegador e o pool de conexões
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+            secure=cookie.get("secure", False),
+        )
+
+    user_agent, token = driver.execute_script(_BROWSER_INFO_SCRIPT, auth_storage_key)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    if token:
+        session.headers["Authorization"] = f"Bearer {token}"
+    session.headers.update(headers or {})
+    logger.info(f"Sessão HTTP criada com {len(session.cookies)} cookies do navegador")
+    return session
+
+
+def export_file_name(start: date, end: date) -> str:
+    """Nome do arquivo igual ao da exportação pelo navegador, ex: TRANSAÇÕES_2025-11-20_2025-11-27.csv."""
+    return f"TRANSAÇÕES_{start:%Y-%m-%d}_{end:%Y-%m-%d}.csv"
+
+
+def split_date_range(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """
+    Divide o período (inclusive) em períodos consecutivos de até `days` dias.
+
+    Ex: 20/11 a 27/11 com days=3 -> [(20/11, 22/11), (23/11, 25/11), (26/11, 27/11)]
+    """
+    if days < 1:
+        raise ValueError(f"days deve ser pelo menos 1: {days}")
+    ranges = []
+    while start <= end:
+        last = min(start + timedelta(days=days - 1), end)
+        ranges.append((start, last))
+        start = last + timedelta(days=1)
+    return ranges
+
+
+@dataclass
+class ExportDownload:
+    """
+    Resultado de um download pela API.
+
+    Atributos:
+        start: Início do período
+        end: Fim do período
+        file_path: Arquivo gravado (None se não foi gravado ou se o download parou pelo fail_fast)
+        bytes_received: Bytes recebidos
+        row_count: Linhas de dados validadas
+        seconds: Duração do download com a validação
+        results: Um RuleResult por regra, na ordem das regras
+    """
+    start: date
+    end: date
+    file_path: Optional[str] = None
+    bytes_received: int = 0
+    row_count: int = 0
+    seconds: float = 0.0
+    results: List[RuleResult] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return all(result.passed for result in self.results)
+
+
+class ExportClient:
+    """
+    Chama o endpoint de exportação com uma sessão autenticada.
+
+    A sessão pode ser usada por várias threads (download_many): cada download
+    usa uma conexão do pool do HTTPAdapter.
+    """
+
+    def __init__(self, session: requests.Session, base_url: str, export_path: str = EXPORT_PATH,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            session: Sessão autenticada (ver session_from_driver)
+            base_url: URL base do portal (ex: Config.TARGET_URL)
+            export_path: Caminho do endpoint de exportação
+            timeout: Tempo máximo em segundos para conectar e entre dois pedaços da resposta
+        """
+        self.session = session
+        self.url = base_url.rstrip("/") + "/" + export_path.lstrip("/")
+        self.timeout = timeout
+
+    def download(self, start: date, end: date, directory: Optional[str] = None, rules: Sequence[Rule] = (),
+                 params: Optional[Dict[str, Any]] = None, fail_fast: bool = True,
+                 chunk_size: int = CHUNK_SIZE) -> ExportDownload:
+        """
+        Baixa a exportação do período validando o CSV conforme os bytes chegam.
+
+        O arquivo é gravado primeiro como .part e renomeado no final, então um
+        arquivo com o nome final está sempre completo; se o download for
+        interrompido (ex: conexão encerrada), o .part é removido.
+
+        Args:
+            start: Início do período
+            end: Fim do período (inclusive)
+            directory: Diretório onde gravar o arquivo (None: só valida, sem gravar)
+            rules: Regras de tests/utils/csv_rules.py (instâncias novas a cada download)
+            params: Parâmetros extras do endpoint (ex: filtro de status)
+            fail_fast: Se True, interrompe o download assim que o header falhar
+            chunk_size: Tamanho dos pedaços lidos da resposta
+
+        Returns:
+            ExportDownload com o arquivo e os resultados das regras
+
+        Raises:
+            requests.HTTPError: Se o endpoint responder com erro (ex: sessão expirada)
+            requests.RequestException: Se a conexão cair ou o tempo acabar durante o download
+        """
+        query = {START_PARAM: start.strftime(PARAM_DATE_FORMAT), END_PARAM: end.strftime(PARAM_DATE_FORMAT)}
+        query.update(params or {})
+        validator = IncrementalCSVValidator(rules)
+        file_path = os.path.join(directory, export_file_name(start, end)) if directory else None
+        temp_path = f"{file_path}.part" if file_path else None
+        stopped = False
+        completed = False
+        began = time.monotonic()
+
+        with self.session.get(self.url, params=query, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            file = open(temp_path, "wb") if temp_path else None
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    if file is not None:
+                        file.write(chunk)
+                    validator.feed(chunk)
+                    if fail_fast and validator.header_failed:
+                        stopped = True
+                        logger.error(f"Header inválido após {validator.bytes_received} bytes: {self.url} {query}")
+                        break
+                completed = not stopped
+            finally:
+                if file is not None:
+                    file.close()
+                    if not completed:
+                        # Header inválido ou conexão interrompida: não deixa o .part no diretório
+                        os.remove(temp_path)
+
+        if temp_path:
+            if stopped:
+                file_path = None
+            else:
+                os.replace(temp_path, file_path)
+
+        results = validator.finish()
+        download = ExportDownload(start, end, file_path, validator.bytes_received, validator.row_count,
+                                  time.monotonic() - began, results)
+        logger.info(f"Exportação {start} a {end} baixada: {download.bytes_received} bytes, "
+                    f"{download.row_count} linhas em {download.seconds:.2f}s")
+        return download
+
+    def download_many(self, ranges: Sequence[Tuple[date, date]], directory: Optional[str] = None,
+                      rules_factory: Optional[Callable[[], Sequence[Rule]]] = None, workers: int = 4,
+                      params: Optional[Dict[str, Any]] = None) -> List[ExportDownload]:
+        """
+        Baixa vários períodos em paralelo (ver split_date_range).
+
+        Args:
+            ranges: Períodos como (início, fim)
+            directory: Diretório onde gravar os arquivos (None: só valida)
+            rules_factory: Função que cria as regras de cada download (regras guardam estado)
+            workers: Downloads simultâneos (limitados também pelo pool da sessão)
+            params: Parâmetros extras do endpoint, iguais para todos os períodos
+
+        Returns:
+            Um ExportDownload por período, na ordem de ranges
+        """
+        def download(period):
+            rules = rules_factory() if rules_factory else ()
+            return self.download(period[0], period[1], directory, rules, params)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ranges)))) as executor:
+            return list(executor.map(download, ranges))
@@ -0,0 +1,223 @@
+"""
+Conciliação entre a tabela de transações da tela e a exportação CSV.
+
+As duas fontes são ligadas pelo ID da cobrança com um hash join:
+- lado de construção: os registros da tela (uma ou poucas páginas) viram um
+  dicionário {chave: registros na ordem da tela};
+- lado de varredura: as linhas do CSV são percorridas uma única vez (gerador,
+  ex: CSVValidator.iter_rows), sem guardar a exportação em memória.
+
+O relatório traz os registros da tela que não estão no CSV, as linhas do CSV
+que não estão na tela (contagem e amostras), as ocorrências repetidas de
+chaves já conciliadas e as diferenças campo a campo dos registros presentes
+nos dois lados. Uma chave pode aparecer em várias linhas (ex: boleto com
+várias linhas para a mesma cobrança): cada linha do CSV é conciliada com a
+próxima ocorrência da chave na tela, na ordem.
+
+Os valores são comparados após remover espaços. Quando os dois lados são
+valores em reais (ex: "R$ 200,00" na tela e "200,00" no CSV), a comparação é
+feita em centavos (ver tests/utils/csv_money.py).
+
+Uso básico:
+    ui_records = transactions_page.get_table_records()
+    report = reconcile(ui_records, CSVValidator(path).iter_rows())
+    assert report.passed, report.summary()
+"""
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+from tests.utils.csv_money import parse_cents
+
+logger = logging.getLogger(__name__)
+
+CSV_KEY_COLUMN = "ID da cobranca"
+
+# Coluna da tabela (atributo data-title) com o ID da cobrança
+UI_KEY_COLUMN = "ID da cobrança"  # Ajustar se necessário
+
+# Colunas da tabela (data-title) -> colunas da exportação comparadas na conciliação
+UI_FIELD_MAP = {  # Ajustar se necessário
+    "Status": "Status da cobranca",
+    "Valor": "Valor total da cobrança",
+    "Bandeira": "Bandeira",
+    "Loja": "Nome da loja",
+}
+
+Comparator = Callable[[Optional[str], Optional[str]], bool]
+
+
+def _clean(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def values_match(ui_value: Any, csv_value: Any) -> bool:
+    """
+    Compara um valor da tela com um valor do CSV.
+
+    Espaços nas pontas são ignorados e valores em reais são comparados em centavos.
+    """
+    ui_value, csv_value = _clean(ui_value), _clean(csv_value)
+    if ui_value == csv_value:
+        return True
+    ui_cents, csv_cents = parse_cents(ui_value), parse_cents(csv_value)
+    return ui_cents is not None and ui_cents == csv_cents
+
+
+@dataclass
+class FieldDiff:
+    """
+    Diferença em um campo de um registro presente nos dois lados.
+
+    Atributos:
+        key: ID da cobrança
+        field: Coluna da tabela (data-title)
+        column: Coluna do CSV
+        ui_value: Valor exibido na tela
+        csv_value: Valor no CSV
+        row_number: Linha do CSV (1 = primeira linha de dados)
+    """
+    key: str
+    field: str
+    column: str
+    ui_value: Any
+    csv_value: Any
+    row_number: int
+
+
+@dataclass
+class ReconciliationReport:
+    """
+    Resultado da conciliação.
+
+    Atributos:
+        ui_rows: Registros lidos da tela
+        csv_rows: Linhas lidas do CSV
+        matched: Registros presentes nos dois lados
+        missing_in_csv: Chaves da tela que não estão no CSV
+        missing_in_ui_count: Linhas do CSV que não estão na tela
+        missing_in_ui_samples: Primeiras linhas do CSV fora da tela como (linha, chave)
+        duplicates_in_csv_count: Ocorrências do CSV de chaves já conciliadas, além das exibidas na tela
+        duplicates_in_csv: Primeiras dessas ocorrências como (linha, chave)
+        mismatched_rows: Registros com pelo menos um campo diferente
+        mismatches: Diferenças campo a campo (até o limite de amostras)
+        ui_is_subset: Se True, linhas do CSV fora da tela (inclusive ocorrências repetidas)
+                      não são falha (tela paginada ou filtrada)
+    """
+    ui_rows: int = 0
+    csv_rows: int = 0
+    matched: int = 0
+    missing_in_csv: List[str] = field(default_factory=list)
+    missing_in_ui_count: int = 0
+    missing_in_ui_samples: List[Tuple[int, str]] = field(default_factory=list)
+    duplicates_in_csv_count: int = 0
+    duplicates_in_csv: List[Tuple[int, str]] = field(default_factory=list)
+    mismatched_rows: int = 0
+    mismatches: List[FieldDiff] = field(default_factory=list)
+    ui_is_subset: bool = True
+
+    @property
+    def passed(self) -> bool:
+        return not (
+            self.missing_in_csv
+            or self.mismatched_rows
+            or (not self.ui_is_subset and (self.missing_in_ui_count or self.duplicates_in_csv_count))
+        )
+
+    def summary(self) -> str:
+        """Descrição curta do resultado (para mensagens de assert e log)."""
+        parts = [
+            f"{self.matched} conciliados",
+            f"{len(self.missing_in_csv)} da tela ausentes no CSV",
+            f"{self.missing_in_ui_count} do CSV ausentes na tela",
+            f"{self.duplicates_in_csv_count} repetidos no CSV",
+            f"{self.mismatched_rows} com diferenças",
+        ]
+        text = ", ".join(parts)
+        if self.missing_in_csv:
+            text += f". Ausentes no CSV: {self.missing_in_csv[:5]}"
+        if self.mismatches:
+            first = self.mismatches[0]
+            text += (f". Ex: {first.key} campo '{first.field}': tela={first.ui_value!r}, "
+                     f"CSV={first.csv_value!r} (linha {first.row_number})")
+        return text
+
+
+def reconcile(ui_records: Iterable[Mapping[str, Any]], csv_rows: Iterable[Mapping[str, Any]],
+              fields: Optional[Mapping[str, str]] = None, ui_key: str = UI_KEY_COLUMN,
+              csv_key: str = CSV_KEY_COLUMN, ui_is_subset: bool = True,
+              comparators: Optional[Mapping[str, Comparator]] = None, limit: int = 20) -> ReconciliationReport:
+    """
+    Concilia os registros da tela com as linhas do CSV pelo ID da cobrança.
+
+    Args:
+        ui_records: Registros da tela (ex: TransactionsPage.get_table_records())
+        csv_rows: Linhas do CSV (de preferência um gerador, ex: CSVValidator.iter_rows())
+        fields: Mapeamento {coluna da tela: coluna do CSV} (padrão: UI_FIELD_MAP)
+        ui_key: Coluna da tela com a chave
+        csv_key: Coluna do CSV com a chave
+        ui_is_subset: Se True, linhas do CSV fora da tela não são falha
+        comparators: Comparação específica por coluna da tela (padrão: values_match)
+        limit: Quantidade máxima de amostras de cada tipo
+
+    Returns:
+        ReconciliationReport
+
+    Raises:
+        ValueError: Se algum registro da tela não tiver a chave
+    """
+    fields = dict(UI_FIELD_MAP if fields is None else fields)
+    comparators = comparators or {}
+    report = ReconciliationReport(ui_is_subset=ui_is_subset)
+
+    # Lado de construção: registros da tela por chave, na ordem em que aparecem
+    pending: Dict[str, Deque[Mapping[str, Any]]] = {}
+    for record in ui_records:
+        report.ui_rows += 1
+        key = _clean(record.get(ui_key))
+        if not key:
+            raise ValueError(f"Registro da tela sem a chave '{ui_key}': {dict(record)}")
+        pending.setdefault(key, deque()).append(record)
+
+    compared = [(name, column, comparators.get(name, values_match)) for name, column in fields.items()]
+    matched_keys = set()
+
+    # Lado de varredura: cada linha do CSV é vista uma única vez
+    for row_number, row in enumerate(csv_rows, start=1):
+        report.csv_rows += 1
+        key = _clean(row.get(csv_key))
+        records = pending.get(key)
+        record = records.popleft() if records else None
+        if records is not None and not records:
+            del pending[key]
+
+        if record is None:
+            if key in matched_keys:
+                report.duplicates_in_csv_count += 1
+                if len(report.duplicates_in_csv) < limit:
+                    report.duplicates_in_csv.append((row_number, key))
+            else:
+                report.missing_in_ui_count += 1
+                if len(report.missing_in_ui_samples) < limit:
+                    report.missing_in_ui_samples.append((row_number, key))
+            continue
+
+        matched_keys.add(key)
+        report.matched += 1
+        row_differs = False
+        for name, column, matches in compared:
+            if name not in record:
+                continue  # Coluna não exibida na tela
+            if not matches(record.get(name), row.get(column)):
+                row_differs = True
+                if len(report.mismatches) < limit:
+                    report.mismatches.append(FieldDiff(key, name, column, record.get(name), row.get(column), row_number))
+        report.mismatched_rows += row_differs
+
+    report.missing_in_csv = [key for key, records in pending.items() for _ in records]
+
+    if report.passed:
+        logger.info(f"Conciliação OK: {report.summary()}")
+    else:
+        logger.error(f"Conciliação com divergências: {report.summary()}")
+    return report
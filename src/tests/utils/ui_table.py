@@ -0,0 +1,297 @@
+"""
+Leitura da tabela de transações da tela em uma única chamada ao WebDriver.
+
+Ler a tabela célula a célula (find_element + .text) custa duas requisições
+HTTP ao WebDriver por célula. read_table executa um script no navegador que
+percorre todas as linhas e devolve as células de uma vez, já como
+dicionários {data-title: texto}, com uma única requisição.
+
+type_records converte os textos para tipos (centavos, timestamps, inteiros),
+de acordo com o tipo de cada coluna da tela (UI_COLUMN_TYPES).
+
+Para a paginação, read_page lê na mesma chamada o texto da paginação
+("Página 1 / 47") e as linhas, então esperar a troca de página e ler a nova
+página é um único polling. pick_page_link escolhe o número de página visível
+que leva mais perto da página desejada (ir direto para a página N, sem passar
+por todas as anteriores). crawl_parallel divide as páginas em faixas
+contíguas, uma por sessão do navegador, e devolve os registros na ordem das
+páginas conforme são lidos.
+
+Uso básico:
+    records = read_table(driver, "table.adt_table", "table.adt_table tbody tr", "td[data-title]")
+    typed = type_records(records)  # [{"Status": "Pendente", "Valor": 20000, ...}]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar
+from tests.utils.csv_dates import parse_timestamp
+from tests.utils.csv_money import parse_cents
+from tests.utils.csv_schema import DATE, INTEGER, MONEY, TEXT
+
+# Tipos das colunas da tabela (data-title); colunas fora do mapa ficam como texto
+UI_COLUMN_TYPES = {  # Ajustar se necessário
+    "Valor": MONEY,
+    "Data": DATE,
+    "Data da cobrança": DATE,
+    "Parcelas": INTEGER,
+}
+
+# Função JS que recebe os seletores CSS da tabela, das linhas e das células. Devolve
+# null se a tabela ainda não existir; innerText é o texto exibido, como o .text do Selenium.
+_READ_TABLE_FUNCTION = """
+function readTable(tableSelector, rowSelector, cellSelector) {
+    if (!document.querySelector(tableSelector)) {
+        return null;
+    }
+    const records = [];
+    for (const row of document.querySelectorAll(rowSelector)) {
+        const record = {};
+        for (const cell of row.querySelectorAll(cellSelector)) {
+            record[cell.getAttribute('data-title')] = cell.innerText.trim();
+        }
+        records.push(record);
+    }
+    return records;
+}
+"""
+
+READ_TABLE_SCRIPT = _READ_TABLE_FUNCTION + """
+return readTable(arguments[0], arguments[1], arguments[2]);
+"""
+
+# Mesmos argumentos e o seletor da paginação (arguments[3])
+READ_PAGE_SCRIPT = _READ_TABLE_FUNCTION + """
+const info = document.querySelector(arguments[3]);
+return [info ? info.innerText.trim() : null, readTable(arguments[0], arguments[1], arguments[2])];
+"""
+
+# Texto da paginação, ex: "Página 1 / 47"
+_PAGE_INFO_PATTERN = re.compile(r"P[áa]gina\s+(\d+)\s*(?:/|de)\s*(\d+)", re.IGNORECASE)
+
+T = TypeVar("T")
+
+
+def read_table(driver: Any, table_selector: str, row_selector: str,
+               cell_selector: str = "td[data-title]") -> Optional[List[Dict[str, str]]]:
+    """
+    Lê todas as linhas da tabela com uma única chamada execute_script.
+
+    Args:
+        driver: WebDriver
+        table_selector: Seletor CSS da tabela
+        row_selector: Seletor CSS das linhas (a partir do documento)
+        cell_selector: Seletor CSS das células dentro da linha
+
+    Returns:
+        Lista de dicionários {data-title: texto exibido}, na ordem da tela,
+        ou None se a tabela não estiver na página
+    """
+    return driver.execute_script(READ_TABLE_SCRIPT, table_selector, row_selector, cell_selector)
+
+
+def read_page(driver: Any, table_selector: str, row_selector: str, cell_selector: str,
+              info_selector: str) -> Tuple[Optional[str], Optional[List[Dict[str, str]]]]:
+    """
+    Lê o texto da paginação e todas as linhas da tabela com uma única chamada execute_script.
+
+    Args:
+        driver: WebDriver
+        table_selector: Seletor CSS da tabela
+        row_selector: Seletor CSS das linhas (a partir do documento)
+        cell_selector: Seletor CSS das células dentro da linha
+        info_selector: Seletor CSS do texto da paginação
+
+    Returns:
+        Tupla (texto da paginação ou None, registros como em read_table ou None)
+    """
+    info, records = driver.execute_script(READ_PAGE_SCRIPT, table_selector, row_selector,
+                                          cell_selector, info_selector)
+    return info, records
+
+
+def parse_page_info(text: str) -> Tuple[int, int]:
+    """
+    Lê a página atual e o total de páginas do texto da paginação.
+
+    Args:
+        text: Ex: "Página 1 / 47"
+
+    Returns:
+        Tupla (página atual, total de páginas)
+
+    Raises:
+        ValueError: Se o texto não estiver no formato esperado
+    """
+    match = _PAGE_INFO_PATTERN.search(text or "")
+    if match is None:
+        raise ValueError(f"Texto de paginação fora do formato 'Página N / M': {text!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def pick_page_link(visible_pages: Iterable[int], current: int, target: int) -> Optional[int]:
+    """
+    Escolhe o número de página visível na paginação que mais se aproxima da página desejada.
+
+    Args:
+        visible_pages: Números de página exibidos como links (ex: 1, 2, 3, 4, 5, 47)
+        current: Página atual
+        target: Página desejada
+
+    Returns:
+        target se estiver visível; senão o número visível entre a página atual
+        e target mais próximo de target; None se nenhum número aproxima
+    """
+    if target > current:
+        return max((page for page in visible_pages if current < page <= target), default=None)
+    if target < current:
+        return min((page for page in visible_pages if target <= page < current), default=None)
+    return None
+
+
+def split_pages(total_pages: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Divide as páginas 1..total_pages em faixas contíguas de tamanho parecido.
+
+    Returns:
+        Lista de (primeira página, última página), no máximo uma faixa por página
+    """
+    parts = max(1, min(parts, total_pages))
+    size, extra = divmod(total_pages, parts)
+    ranges = []
+    start = 1
+    for index in range(parts):
+        end = start + size - 1 + (index < extra)
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+
+class _CrawlError:
+    """Exceção de uma faixa, repassada pela fila para ser levantada na ordem das páginas."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_RANGE_DONE = object()
+_PUT_INTERVAL = 0.1
+
+
+def crawl_parallel(crawl_range: Callable[[int, int], Iterable[T]], total_pages: int,
+                   workers: int = 2, max_buffered: int = 0) -> Iterator[T]:
+    """
+    Percorre as páginas em paralelo, uma faixa de páginas por worker.
+
+    Cada faixa é percorrida em uma thread (o tempo é gasto esperando o
+    navegador) por crawl_range(primeira, última), que deve usar a sua própria
+    sessão do navegador. Os registros são devolvidos na ordem das páginas, em
+    stream: os da primeira faixa assim que são lidos, e os das faixas seguintes
+    ficam em uma fila por faixa até chegar a vez delas.
+
+    Se o gerador for fechado antes do fim, as threads param no próximo
+    registro e o gerador de cada faixa é fechado (encerrando a sua sessão).
+
+    Args:
+        crawl_range: Função (ou gerador) que devolve os registros das páginas da faixa (inclusive)
+        total_pages: Total de páginas
+        workers: Quantidade de sessões em paralelo
+        max_buffered: Registros guardados por faixa enquanto ela espera a sua vez
+                      (0 = sem limite; com limite, a faixa pausa quando a fila enche)
+
+    Returns:
+        Gerador com os registros de todas as páginas
+    """
+    ranges = split_pages(total_pages, workers)
+    queues = [queue.Queue(maxsize=max_buffered) for _ in ranges]
+    stop = threading.Event()
+
+    def put(records: queue.Queue, item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                records.put(item, timeout=_PUT_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(records: queue.Queue, pages: Tuple[int, int]):
+        crawled = None
+        try:
+            crawled = crawl_range(*pages)
+            for record in crawled:
+                if not put(records, record):
+                    return  # Consumidor parou de ler
+        except BaseException as error:
+            put(records, _CrawlError(error))
+            return
+        finally:
+            close = getattr(crawled, "close", None)
+            if close is not None:
+                close()
+        put(records, _RANGE_DONE)
+
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        for records, pages in zip(queues, ranges):
+            executor.submit(run, records, pages)
+        try:
+            for records in queues:
+                while True:
+                    item = records.get()
+                    if item is _RANGE_DONE:
+                        break
+                    if isinstance(item, _CrawlError):
+                        raise item.error
+                    yield item
+        finally:
+            stop.set()
+
+
+def _to_integer(value: str) -> Optional[int]:
+    return int(value) if value.isdigit() else None
+
+
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    MONEY: parse_cents,
+    DATE: parse_timestamp,
+    INTEGER: _to_integer,
+}
+
+
+def convert_value(value: Optional[str], kind: str = TEXT) -> Any:
+    """
+    Converte o texto de uma célula de acordo com o tipo da coluna.
+
+    Args:
+        value: Texto exibido na célula
+        kind: MONEY (centavos), DATE (timestamp em segundos), INTEGER ou TEXT
+
+    Returns:
+        Valor convertido; None para células vazias ou fora do formato do tipo
+        (colunas TEXT mantêm o texto)
+    """
+    converter = _CONVERTERS.get(kind)
+    if converter is None:
+        return value
+    value = (value or "").strip()
+    return converter(value) if value else None
+
+
+def type_records(records: Sequence[Mapping[str, Optional[str]]],
+                 column_types: Optional[Mapping[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Converte os registros lidos da tela para tipos.
+
+    Args:
+        records: Registros de read_table
+        column_types: {data-title: tipo} (padrão: UI_COLUMN_TYPES)
+
+    Returns:
+        Registros com os valores convertidos por convert_value
+    """
+    column_types = UI_COLUMN_TYPES if column_types is None else column_types
+    return [
+        {title: convert_value(value, column_types.get(title, TEXT)) for title, value in record.items()}
+        for record in records
+    ]